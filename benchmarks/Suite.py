@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Times parse, serialize, manifest and round-trip on synthetic configs of several sizes and compares them against the
+stored baseline.
+
+    python -m benchmarks.Suite                    # compare against benchmarks/baseline.json
+    python -m benchmarks.Suite --update-baseline  # store the current results as the new baseline
+
+Timings are stored relative to a calibration workload (a JSON round-trip of the same configs), which makes the
+baseline portable between machines of different speeds.
+
+This is the regression gate; the unit tests only run it when CICD_BENCHMARKS=1, and never under a tracer such as
+coverage. Run it without one.
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from typing import Callable, Dict, List
+
+from benchmarks.Synthetic import make_fleet
+from cicd.GitOpsDataClasses import GitOps, Manifest, gitops_from_dict, gitops_to_dict
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 2.5
+
+SIZES: Dict[str, dict] = {
+    "small": dict(services=50, environments=3, regions=1, phases=3, path_groups=2, paths_per_group=3,
+                  slack_channels=1),
+    "wide": dict(services=10, environments=20, regions=4, phases=20, path_groups=20, paths_per_group=10,
+                 slack_channels=5),
+    "deep": dict(services=2, environments=100, regions=8, phases=100, path_groups=100, paths_per_group=20,
+                 slack_channels=10),
+}
+
+
+def operations(fleet: List[dict]) -> Dict[str, Callable[[], object]]:
+    parsed = [gitops_from_dict(config) for config in fleet]
+    return {
+        "parse": lambda: [GitOps.from_dict(config) for config in fleet],
+        "serialize": lambda: [gitops_to_dict(gitops) for gitops in parsed],
+        "manifest": lambda: [Manifest.all_from_gitops(gitops) for gitops in parsed],
+        "round_trip": lambda: [GitOps.from_dict(gitops_to_dict(GitOps.from_dict(config))) for config in fleet],
+    }
+
+
+def best_of(function: Callable[[], object], repeat: int) -> float:
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def run_suite(sizes: Dict[str, dict] = None, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    :param sizes: The sizes to run, keyed by name. Defaults to SIZES.
+    :param repeat: Repetitions of every timing; the fastest one is kept.
+    :return: The time of every operation divided by the calibration time, keyed by size and operation.
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    for name, size in (sizes or SIZES).items():
+        dimensions = dict(size)
+        fleet = make_fleet(dimensions.pop("services"), **dimensions)
+        calibration = best_of(lambda fleet=fleet: [json.loads(json.dumps(config)) for config in fleet], repeat)
+        results[name] = {operation: round(best_of(function, repeat) / calibration, 3)
+                         for operation, function in operations(fleet).items()}
+    return results
+
+
+def load_baseline(path: str = BASELINE) -> Dict[str, Dict[str, float]]:
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    :param results: The output of run_suite.
+    :param baseline: The stored baseline, in the same format.
+    :param tolerance: How many times slower than the baseline an operation may be.
+    :return: A description of every regression; empty when all operations are within the tolerance.
+    """
+    regressions = []
+    for size, timings in results.items():
+        for operation, ratio in timings.items():
+            expected = baseline.get(size, {}).get(operation)
+            if expected is not None and ratio > expected * tolerance:
+                regressions.append(f"{size}/{operation}: {ratio:.3f} vs baseline {expected:.3f} "
+                                   f"({ratio / expected:.1f}x slower, tolerance {tolerance}x)")
+    return regressions
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args(argv)
+
+    results = run_suite(repeat=args.repeat)
+    print(json.dumps(results, indent=2, sort_keys=True))
+    if args.update_baseline:
+        with open(BASELINE, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+        return
+    regressions = compare(results, load_baseline(), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import zlib
+from typing import List
+
+REGIONS = ("us-east-1", "us-east-2", "us-west-1", "us-west-2", "eu-west-1", "eu-central-1", "ap-southeast-1")
+
+
+def environment_names(count: int) -> List[str]:
+    base = ["dev", "demo", "prod"]
+    return base[:count] + [f"env{index:03d}" for index in range(len(base), count)]
+
+
+def make_gitops_dict(index: int = 0, environments: int = 3, regions: int = 1, phases: int = None,
+                     path_groups: int = 2, paths_per_group: int = 3, slack_channels: int = 1) -> dict:
+    """
+    Builds a synthetic gitops config that can be scaled in every dimension.
+
+    :param index: Service number, used to make names and ids unique across a fleet.
+    :param environments: Number of environments, chained through next_environment.
+    :param regions: Regions per environment: the primary aws_region plus regions - 1 additional_aws_regions.
+    :param phases: Number of environment promotion phases. Defaults to one per environment.
+    :param path_groups: Number of path monitor groups.
+    :param paths_per_group: Number of path patterns in each path monitor group.
+    :param slack_channels: Channels per kind (cd/ci) in the default entry and in each environment's entry.
+    :return: A dictionary accepted by GitOps.from_dict.
+    """
+    service = f"service-{index:05d}"
+    names = environment_names(environments)
+    phases = environments if phases is None else phases
+    phase_names = environment_names(phases)
+
+    def channels(scope: str, kind: str) -> list:
+        return [{"id": f"C{index:05d}{zlib.crc32(f'{scope}/{kind}/{number}'.encode()) % 10 ** 6:06d}",
+                 "name": f"#{scope}-{kind}-{number}"}
+                for number in range(slack_channels)]
+
+    return {
+        "app_of_apps": "app-of-apps",
+        "app_of_apps_service_name": service,
+        "app_repo": f"org/{service}",
+        "dockerfile": "Dockerfile",
+        "ecr_repository_name": service,
+        "enable_tests": index % 2 == 0,
+        "helm_chart_repo": "helm-charts",
+        "helm_chart_service_name": service,
+        "is_mono_repo": index % 3 == 0,
+        "name": service,
+        "service": service,
+        "environment_promotion_phases": {
+            f"{number + 1:02d}-{name}": {
+                "aws_account_id": 100000000000 + number,
+                "description": f"{name} workload",
+                "environment": name,
+                "enabled": number % 2 == 0,
+            }
+            for number, name in enumerate(phase_names)
+        },
+        "environments": {
+            name: {
+                "aws_region": REGIONS[number % len(REGIONS)],
+                "cluster": f"{name}-eks",
+                "environment": name,
+                "next_environment": names[number + 1] if number + 1 < len(names) else "",
+                "additional_aws_regions": [REGIONS[(number + offset) % len(REGIONS)] for offset in range(1, regions)],
+                "approval_for_promotion": number > 0,
+                "enabled": True,
+                "with_gate": number % 2 == 1,
+            }
+            for number, name in enumerate(names)
+        },
+        "path_monitor": {
+            f"group{group:03d}": {
+                "hasModifications": False,
+                "paths": [f"{service}/group{group:03d}/dir{path:03d}/.*" for path in range(paths_per_group)],
+            }
+            for group in range(path_groups)
+        },
+        "slack": {
+            "url": "https://example.slack.com",
+            "channels": {
+                scope: {"cd": channels(scope, "cd"), "ci": channels(scope, "ci")}
+                for scope in ["default"] + names
+            },
+        },
+    }
+
+
+def make_fleet(count: int, **dimensions) -> List[dict]:
+    """
+    :param count: Number of services.
+    :param dimensions: Keyword arguments forwarded to make_gitops_dict.
+    :return: A list of synthetic gitops configs with unique service names.
+    """
+    return [make_gitops_dict(index, **dimensions) for index in range(count)]
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compares the compiled codecs with the hand-written GitOps.from_dict/to_dict paths.
+
+    python -m benchmarks.bench_codecs --services 200 --environments 20 --path-groups 50
+"""
+
+import argparse
+import timeit
+
+from benchmarks.Synthetic import make_fleet
+from cicd.Codecs import codec_for
+from cicd.GitOpsDataClasses import GitOps
+
+
+def best_of(function, repeat: int) -> float:
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--services', type=int, default=200)
+    parser.add_argument('--environments', type=int, default=10)
+    parser.add_argument('--regions', type=int, default=3)
+    parser.add_argument('--path-groups', type=int, default=20)
+    parser.add_argument('--paths-per-group', type=int, default=5)
+    parser.add_argument('--slack-channels', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    fleet = make_fleet(args.services, environments=args.environments, regions=args.regions,
+                       path_groups=args.path_groups, paths_per_group=args.paths_per_group,
+                       slack_channels=args.slack_channels)
+    codec = codec_for(GitOps)
+    parsed = [GitOps.from_dict(config) for config in fleet]
+    assert [codec.from_dict(config) for config in fleet] == parsed
+    assert [codec.to_dict(gitops) for gitops in parsed] == fleet
+
+    rows = [
+        ("from_dict", best_of(lambda: [GitOps.from_dict(config) for config in fleet], args.repeat),
+         best_of(lambda: [codec.from_dict(config) for config in fleet], args.repeat)),
+        ("to_dict", best_of(lambda: [gitops.to_dict() for gitops in parsed], args.repeat),
+         best_of(lambda: [codec.to_dict(gitops) for gitops in parsed], args.repeat)),
+    ]
+    print(f"{args.services} services x {args.environments} environments, best of {args.repeat}")
+    print(f"{'operation':<12}{'hand-written':>15}{'codec':>12}{'speedup':>10}")
+    for name, hand_written, compiled in rows:
+        print(f"{name:<12}{hand_written * 1000:>13.1f}ms{compiled * 1000:>10.1f}ms{hand_written / compiled:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
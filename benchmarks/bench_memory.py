@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Measures the memory held by a parsed fleet of GitOps objects.
+
+    python -m benchmarks.bench_memory --services 2000
+    python -m benchmarks.bench_memory --services 2000 --columnar
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.Synthetic import make_fleet
+from cicd.GitOpsDataClasses import GitOps
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--services', type=int, default=2000)
+    parser.add_argument('--environments', type=int, default=3)
+    parser.add_argument('--path-groups', type=int, default=2)
+    parser.add_argument('--slack-channels', type=int, default=2)
+    parser.add_argument('--columnar', action='store_true', help="Measure a ColumnarFleet of the same configs")
+    args = parser.parse_args(argv)
+
+    fleet = make_fleet(args.services, environments=args.environments, path_groups=args.path_groups,
+                       slack_channels=args.slack_channels)
+    gc.collect()
+    tracemalloc.start()
+    if args.columnar:
+        from cicd.ColumnarFleet import ColumnarFleet
+
+        parsed = ColumnarFleet.from_configs(GitOps.from_dict(config) for config in fleet)
+    else:
+        parsed = [GitOps.from_dict(config) for config in fleet]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{len(parsed)} services: {current / 1024 / 1024:.2f} MiB, {current / len(parsed):.0f} bytes per service")
+
+
+if __name__ == '__main__':
+    main()
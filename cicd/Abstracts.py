@@ -1,29 +1,57 @@
 from abc import ABC
-from dataclasses import dataclass
+from collections.abc import Mapping
+from typing import Any, Iterator
 
 
-@dataclass
-class Abstract(ABC):
+class Abstract(Mapping, ABC):
+    """
+    Read-only mapping of names to model objects, such as environments or path monitor groups.
+
+    Subclasses set value_type to the class of their values. Entries are also reachable as attributes
+    (environments.dev) for backwards compatibility, but item access is the supported lookup.
+    """
+
+    __slots__ = ("_items",)
+    value_type: type = object
+
     def __init__(self, properties_dict=None):
         """
         Constructs a new instance of the class.
 
-        :param properties_dict: A dictionary containing properties to be set on the object. If provided, the properties will be set using the __set_properties method.
+        :param properties_dict: A dictionary containing the entries of the mapping. It is copied, so later changes to
+        it do not affect the instance.
         """
-        if properties_dict and isinstance(properties_dict, dict):
-            for key, value in properties_dict.items():
-                setattr(self, key, value)
+        self._items: dict = dict(properties_dict) if properties_dict and isinstance(properties_dict, dict) else {}
+
+    def __getitem__(self, key: str) -> Any:
+        return self._items[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._items
 
     def __getattr__(self, attr):
-        try:
-            return self._properties[attr]
-        except KeyError:
-            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{attr}'")
+        # Only reached when normal lookup fails. Private names are never entries, which also keeps pickle and copy
+        # from recursing while they probe the instance before _items is restored.
+        if not attr.startswith("_"):
+            try:
+                return self._items[attr]
+            except KeyError:
+                pass
+        raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{attr}'")
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._items!r})"
 
     def to_dict(self):
         """
         Returns a dictionary representation of the object.
 
-        :return: Dictionary containing the keys and values of the object's attributes.
+        :return: A new dictionary containing the entries of the mapping.
         """
-        return self.__dict__
+        return dict(self._items)
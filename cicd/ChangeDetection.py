@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple, Union
+
+from cicd.GitOpsDataClasses import GitOps, PathMonitor
+from cicd.PathMatcher import PathMatcher
+from cicd.Profiling import current
+
+
+class GitError(Exception):
+    """
+    A git command failed, or a revision does not name a commit.
+    """
+
+
+@dataclass(frozen=True, slots=True)
+class CommitRange:
+    """
+    The changes between two commits, as `git diff base head` reports them.
+    """
+
+    base: str
+    head: str
+
+    @staticmethod
+    def parse(text: str) -> 'CommitRange':
+        """
+        :param text: "base..head", or a single revision for the changes of that commit against its first parent, or
+        against the empty tree for a root commit.
+        :return: The range.
+        """
+        base, separator, head = text.partition("..")
+        if not separator:
+            return CommitRange(f"{text}^", text)
+        if head.startswith(".") or not base or not head:
+            raise ValueError(f"Expected BASE..HEAD or a single revision but got '{text}'")
+        return CommitRange(base, head)
+
+    @property
+    def single_commit(self) -> bool:
+        """
+        True for the range of a single revision, as parsed from "REV": its base is the first parent of the head.
+        """
+        return self.base == f"{self.head}^"
+
+
+class ChangeDetector:
+    """
+    Reads the changed paths of any number of commit ranges from a local git repository with two processes in total:
+    `git cat-file --batch-check` resolves every revision, then one `git diff-tree --stdin` diffs every distinct pair
+    of commits. The changed paths are then routed to the PathMonitor groups of each service.
+
+        detector = ChangeDetector("/work/monorepo")
+        monitors = detector.detect({"billing": (billing_gitops, CommitRange.parse("main..HEAD")), ...})
+    """
+
+    def __init__(self, repository: str = ".", git: str = "git"):
+        self.repository = repository
+        self.git = git
+        self.processes = 0
+
+    def _run(self, arguments: Sequence[str], stdin: bytes) -> bytes:
+        self.processes += 1
+        try:
+            completed = subprocess.run([self.git, "-C", self.repository, *arguments], input=stdin,
+                                       capture_output=True, check=False)
+        except FileNotFoundError:
+            raise GitError(f"{self.git} is not installed") from None
+        if completed.returncode != 0:
+            message = completed.stderr.decode(errors="replace").strip()
+            raise GitError(f"git {arguments[0]} failed in {os.path.abspath(self.repository)}: {message}")
+        return completed.stdout
+
+    def resolve(self, revisions: Iterable[str], optional: Iterable[str] = ()) -> Dict[str, str]:
+        """
+        :param revisions: Revisions, e.g. "main", "HEAD~3" or commit ids.
+        :param optional: Revisions that may not exist, e.g. the parent of a root commit; they are left out of the
+        result.
+        :return: The commit id of each revision.
+        :raises GitError: When a revision that is not optional does not name a commit.
+        """
+        optional = set(optional)
+        unique = list(dict.fromkeys(revisions))
+        if not unique:
+            return {}
+        if any("\n" in revision for revision in unique):
+            raise GitError("Revisions cannot contain line breaks")
+        output = self._run(["cat-file", "--batch-check=%(objectname) %(objecttype)"],
+                           "".join(f"{revision}^{{commit}}\n" for revision in unique).encode())
+        resolved = {}
+        for revision, line in zip(unique, output.decode().splitlines()):
+            object_id, _, object_type = line.rpartition(" ")
+            if object_type != "commit":
+                if revision in optional:
+                    continue
+                raise GitError(f"Unknown revision '{revision}'")
+            resolved[revision] = object_id
+        return resolved
+
+    def changed_paths(self, ranges: Iterable[CommitRange]) -> Dict[CommitRange, Tuple[str, ...]]:
+        """
+        :param ranges: The commit ranges.
+        :return: The paths changed in each range, in git's order. Renames are reported as a deletion and an
+        addition, so both the old and the new path are included. The single revision range of a root commit lists
+        every path of that commit.
+        """
+        ranges = list(dict.fromkeys(ranges))
+        profiler = current()
+        with profiler.span("changes.resolve"):
+            commits = self.resolve((revision for commit_range in ranges for revision in (commit_range.base,
+                                                                                        commit_range.head)),
+                                   optional=[commit_range.base for commit_range in ranges
+                                             if commit_range.single_commit])
+        # A base of "" stands for the missing parent of a root commit.
+        pairs = list(dict.fromkeys(self._pair(commit_range, commits) for commit_range in ranges))
+        diffs: Dict[Tuple[str, str], Tuple[str, ...]] = {pair: () for pair in pairs if pair[0] == pair[1]}
+        # A line with two commits makes git take the second as the parent of the first for the rest of the input, so
+        # the lines with a single commit, diffed against its parents or with --root against the empty tree, go first.
+        pending = sorted((pair for pair in pairs if pair[0] != pair[1]), key=lambda pair: bool(pair[0]))
+        if pending:
+            with profiler.span("changes.diff_tree"):
+                output = self._run(["diff-tree", "--stdin", "--root", "-r", "--name-only", "-z", "--always"],
+                                   "".join(f"{base} {head}\n" if base else f"{head}\n"
+                                           for base, head in pending).encode())
+            diffs.update(self._split(output, pending))
+        profiler.count("changes.ranges", len(ranges))
+        return {commit_range: diffs[self._pair(commit_range, commits)] for commit_range in ranges}
+
+    @staticmethod
+    def _pair(commit_range: CommitRange, commits: Dict[str, str]) -> Tuple[str, str]:
+        return commits.get(commit_range.base, ""), commits[commit_range.head]
+
+    @staticmethod
+    def _split(output: bytes, pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Tuple[str, ...]]:
+        # With --always every input line produces its first commit id as a header (the base, or the head of a root
+        # commit), followed by its changed paths, all NUL-terminated. Paths are bytes in the repository; they are
+        # decoded as file names are by os.fsdecode.
+        tokens = output.split(b"\0")
+        if tokens and tokens[-1] == b"":
+            tokens.pop()
+        result: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        index = 0
+        headers = [(base or head).encode() for base, head in pairs]
+        for position, pair in enumerate(pairs):
+            if index >= len(tokens) or tokens[index] != headers[position]:
+                raise GitError(f"Unexpected git diff-tree output for {pair[0]}..{pair[1]}")
+            index += 1
+            following = headers[position + 1] if position + 1 < len(pairs) else None
+            start = index
+            while index < len(tokens) and tokens[index] != following:
+                index += 1
+            result[pair] = tuple(os.fsdecode(token) for token in tokens[start:index])
+        return result
+
+    def detect(self, services: Mapping[str, Tuple[Union[GitOps, PathMonitor], CommitRange]]) -> Dict[str, PathMonitor]:
+        """
+        :param services: For each service name, its GitOps config or PathMonitor and the commit range to check.
+        :return: For each service, a copy of its PathMonitor with has_modifications set on every group.
+        """
+        changes = self.changed_paths(commit_range for _, commit_range in services.values())
+        matchers: Dict[int, PathMatcher] = {}
+        result: Dict[str, PathMonitor] = {}
+        with current().span("changes.match"):
+            for name, (source, commit_range) in services.items():
+                path_monitor = source.path_monitor if isinstance(source, GitOps) else source
+                matcher = matchers.get(id(path_monitor))
+                if matcher is None:
+                    matcher = matchers[id(path_monitor)] = PathMatcher(path_monitor)
+                result[name] = matcher.apply(changes[commit_range])
+        return result
+
+
+def detect_changes(repository: str, services: Mapping[str, Tuple[Union[GitOps, PathMonitor], CommitRange]]
+                   ) -> Dict[str, PathMonitor]:
+    """
+    :param repository: A directory of the git repository.
+    :param services: For each service name, its GitOps config or PathMonitor and the commit range to check.
+    :return: For each service, a copy of its PathMonitor with has_modifications set on every group.
+    """
+    return ChangeDetector(repository).detect(services)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import typing
+from dataclasses import MISSING, fields, is_dataclass
+from typing import Any, Callable, NamedTuple
+
+from cicd.Abstracts import Abstract
+
+# Field metadata keys understood by the codec engine.
+ALIAS = "alias"  # the key used in the serialized dictionary, when it differs from the field name
+DEFAULT = "default"  # the value parsed when the key is missing from the dictionary
+
+SCALAR_TYPES = (str, int, bool)
+
+
+class Codec(NamedTuple):
+    from_dict: Callable[[Any], Any]
+    to_dict: Callable[[Any], dict]
+
+
+_codecs: dict[type, Codec] = {}
+_lock = threading.RLock()
+
+
+def codec_for(cls: type) -> Codec:
+    """
+    Returns the compiled codec of a model class, compiling it (and the codecs of its nested models) on first use.
+
+    Dataclasses are compiled from their fields and type hints; Abstract mapping containers from their value_type.
+    The generated functions inline every scalar type check and call the nested codecs directly, instead of going
+    through from_str/from_bool/to_class for each field.
+
+    :param cls: A dataclass or Abstract container class.
+    :return: The codec with the specialized from_dict and to_dict functions.
+    """
+    codec = _codecs.get(cls)
+    if codec is None:
+        with _lock:
+            codec = _codecs.get(cls)
+            if codec is None:
+                codec = _compile(cls)
+                _codecs[cls] = codec
+    return codec
+
+
+def serialized_key(model_field) -> str:
+    return model_field.metadata.get(ALIAS, model_field.name)
+
+
+def _fail(location: str, expected: str, value: Any):
+    raise TypeError(f"{location}: expected {expected} but got {type(value).__name__}")
+
+
+class _Compiler:
+    def __init__(self, cls: type):
+        self.cls = cls
+        self.namespace: dict = {"_fail": _fail, "_cls": cls}
+
+    def bind(self, value: Any) -> str:
+        name = f"_ref{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def nested(self, cls: type) -> tuple[str, str]:
+        codec = codec_for(cls)
+        return self.bind(codec.from_dict), self.bind(codec.to_dict)
+
+    def parse_statements(self, annotation: Any, source: str, target: str, location: str) -> list[str]:
+        if annotation is Any:
+            return [f"{target} = {source}"]
+        if annotation in SCALAR_TYPES:
+            return [f"if {source}.__class__ is not {annotation.__name__}: _fail({location!r}, "
+                    f"{annotation.__name__!r}, {source})",
+                    f"{target} = {source}"]
+        if typing.get_origin(annotation) is list:
+            (item,) = typing.get_args(annotation) or (Any,)
+            statements = [f"if {source}.__class__ is not list: _fail({location!r}, 'list', {source})"]
+            if item is Any:
+                return statements + [f"{target} = list({source})"]
+            if item in SCALAR_TYPES:
+                return statements + [f"for _item in {source}:",
+                                     f"    if _item.__class__ is not {item.__name__}: _fail({location + '[]'!r}, "
+                                     f"{item.__name__!r}, _item)",
+                                     f"{target} = list({source})"]
+            parse, _ = self.nested(item)
+            return statements + [f"{target} = [{parse}(_item) for _item in {source}]"]
+        parse, _ = self.nested(annotation)
+        return [f"{target} = {parse}({source})"]
+
+    def serialize_expression(self, annotation: Any, source: str) -> str:
+        if annotation is Any or annotation in SCALAR_TYPES:
+            return source
+        if typing.get_origin(annotation) is list:
+            (item,) = typing.get_args(annotation) or (Any,)
+            if item is Any or item in SCALAR_TYPES:
+                return f"list({source})"
+            _, serialize = self.nested(item)
+            return f"[{serialize}(_item) for _item in {source}]"
+        _, serialize = self.nested(annotation)
+        return f"{serialize}({source})"
+
+    def compile_dataclass(self) -> Codec:
+        cls = self.cls
+        hints = typing.get_type_hints(cls)
+        parse_lines = ["def from_dict(obj):",
+                       "    if not isinstance(obj, dict):",
+                       f"        _fail({cls.__name__!r}, 'dict', obj)",
+                       "    get = obj.get"]
+        arguments = []
+        items = []
+        for index, model_field in enumerate(fields(cls)):
+            key = serialized_key(model_field)
+            default = model_field.metadata.get(DEFAULT, MISSING)
+            if default is MISSING:
+                parse_lines.append(f"    _value = get({key!r})")
+            else:
+                parse_lines.append(f"    _value = get({key!r}, {self.bind(default)})")
+            location = f"{cls.__name__}.{model_field.name}"
+            target = f"_f{index}"
+            parse_lines.extend("    " + line
+                               for line in self.parse_statements(hints[model_field.name], "_value", target, location))
+            arguments.append(target)
+            items.append(f"{key!r}: {self.serialize_expression(hints[model_field.name], 'obj.' + model_field.name)}")
+        parse_lines.append(f"    return _cls({', '.join(arguments)})")
+        serialize_lines = ["def to_dict(obj):", f"    return {{{', '.join(items)}}}"]
+        return self.build(parse_lines, serialize_lines)
+
+    def compile_container(self) -> Codec:
+        cls = self.cls
+        value_type = cls.value_type
+        parse_lines = ["def from_dict(obj):",
+                       "    if not isinstance(obj, dict):",
+                       f"        _fail({cls.__name__!r}, 'dict', obj)",
+                       "    result = {}",
+                       "    for _key, _value in obj.items():"]
+        parse_lines.extend("        " + line
+                           for line in self.parse_statements(value_type, "_value", "result[_key]", cls.__name__))
+        parse_lines.append("    return _cls(result)")
+        serialize_lines = ["def to_dict(obj):",
+                           f"    return {{_key: {self.serialize_expression(value_type, '_value')} "
+                           f"for _key, _value in obj.items()}}"]
+        return self.build(parse_lines, serialize_lines)
+
+    def build(self, parse_lines: list[str], serialize_lines: list[str]) -> Codec:
+        source = "\n".join(parse_lines + serialize_lines) + "\n"
+        exec(compile(source, f"<codec {self.cls.__qualname__}>", "exec"), self.namespace)
+        return Codec(self.namespace["from_dict"], self.namespace["to_dict"])
+
+
+def _compile(cls: type) -> Codec:
+    if isinstance(cls, type) and issubclass(cls, Abstract):
+        return _Compiler(cls).compile_container()
+    if is_dataclass(cls):
+        return _Compiler(cls).compile_dataclass()
+    raise TypeError(f"Cannot compile a codec for {cls!r}")
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import typing
+from array import array
+from collections import Counter
+from dataclasses import fields
+from itertools import compress
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from cicd.GitOpsDataClasses import (ApplicationConfig, AwsAccount, EnvironmentPromotionPhases, Environments,
+                                    EnvironmentWithRegion, GitOps, SlackChannel, SlackChannelPool, SlackChannels,
+                                    SlackEnvironmentChannels, SLACK_CHANNEL_KINDS)
+
+# Array type codes by field type. Strings are stored as codes into the StringTable of the store.
+_TYPECODES = {str: 'I', bool: 'B', int: 'q'}
+_SCALAR, _STRING, _STRING_LIST = range(3)
+
+Rows = Sequence[int]
+
+
+class StringTable:
+    """
+    Interned strings: each distinct string is stored once and referred to by its code, its position in `strings`.
+    """
+
+    __slots__ = ("strings", "codes")
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def __getitem__(self, code: int) -> str:
+        return self.strings[code]
+
+    def intern(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def get(self, value: str) -> Optional[int]:
+        return self.codes.get(value)
+
+
+class ColumnTable:
+    """
+    The rows of one model, e.g. every EnvironmentWithRegion of a fleet, stored column by column in typed arrays:
+    strings as codes of a StringTable, booleans as bytes, integers as 64-bit values, and lists of strings as one
+    array of codes with an array of row offsets into it.
+
+    Every table has a "config" column with the number of the config a row belongs to, and the key columns given to
+    it, e.g. "name" for the key of an environment in its config. Rows are appended config by config, so the rows of a
+    config are contiguous; see rows_of.
+    """
+
+    def __init__(self, model: type, strings: StringTable, keys: Tuple[str, ...] = ()):
+        """
+        :param model: The dataclass of the rows.
+        :param strings: The string table shared by the tables of a store.
+        :param keys: Names of extra string columns identifying a row within its config.
+        """
+        self.model = model
+        self.strings = strings
+        self.keys = keys
+        self.fields = tuple(model_field.name for model_field in fields(model))
+        self.columns: Dict[str, array] = {"config": array('I')}
+        self.offsets: Dict[str, array] = {}
+        self.config_offsets = array('I', [0])
+        self._kinds: Dict[str, int] = {"config": _SCALAR}
+        for name in keys:
+            self.columns[name] = array('I')
+            self._kinds[name] = _STRING
+        hints = typing.get_type_hints(model)
+        for name in self.fields:
+            hint = hints[name]
+            if typing.get_origin(hint) is list:
+                self.columns[name] = array('I')
+                self.offsets[name] = array('I', [0])
+                self._kinds[name] = _STRING_LIST
+            else:
+                self.columns[name] = array(_TYPECODES[hint])
+                self._kinds[name] = _STRING if hint is str else _SCALAR
+
+    def __len__(self) -> int:
+        return len(self.columns["config"])
+
+    def append(self, config: int, keys: Tuple[str, ...], obj: Any) -> None:
+        """
+        :param config: The number of the config of the row.
+        :param keys: The values of the key columns.
+        :param obj: The model object.
+        """
+        columns = self.columns
+        intern = self.strings.intern
+        columns["config"].append(config)
+        for name, value in zip(self.keys, keys):
+            columns[name].append(intern(value))
+        for name in self.fields:
+            value = getattr(obj, name)
+            kind = self._kinds[name]
+            if kind == _STRING:
+                columns[name].append(intern(value))
+            elif kind == _SCALAR:
+                columns[name].append(value)
+            else:
+                columns[name].extend(intern(item) for item in value)
+                self.offsets[name].append(len(columns[name]))
+
+    def end_config(self) -> None:
+        self.config_offsets.append(len(self))
+
+    def rows_of(self, config: int) -> range:
+        """
+        :param config: The number of a config.
+        :return: Its rows.
+        """
+        return range(self.config_offsets[config], self.config_offsets[config + 1])
+
+    def _column(self, name: str) -> Tuple[array, int]:
+        try:
+            return self.columns[name], self._kinds[name]
+        except KeyError:
+            raise ValueError(f"Unknown column '{name}' of {self.model.__name__}, expected one of "
+                             f"{', '.join(self.columns)}") from None
+
+    def _value(self, kind: int, column: array, row: int, name: str) -> Any:
+        if kind == _STRING:
+            return self.strings[column[row]]
+        if kind == _SCALAR:
+            return bool(column[row]) if column.typecode == 'B' else column[row]
+        offsets = self.offsets[name]
+        return [self.strings[code] for code in column[offsets[row]:offsets[row + 1]]]
+
+    def values(self, name: str, rows: Optional[Rows] = None) -> List[Any]:
+        """
+        :param name: A column.
+        :param rows: The rows to read. Defaults to every row.
+        :return: The decoded values of the column.
+        """
+        column, kind = self._column(name)
+        rows = range(len(self)) if rows is None else rows
+        if kind == _STRING:
+            strings = self.strings.strings
+            return [strings[column[row]] for row in rows]
+        return [self._value(kind, column, row, name) for row in rows]
+
+    def where(self, rows: Optional[Rows] = None, **criteria: Any) -> array:
+        """
+        Selects the rows whose columns equal the given values. Values are translated to codes once, then compared to
+        whole columns as integers; a string no row has matches nothing without reading the column.
+
+            prod = fleet.environments.where(environment="prod", enabled=True)
+
+        :param rows: Only consider these rows, e.g. the result of another where. Defaults to every row.
+        :param criteria: Column values; lists of strings cannot be filtered on.
+        :return: The numbers of the matching rows, in order.
+        """
+        selected = None if rows is None else array('I', rows)
+        for name, value in criteria.items():
+            column, kind = self._column(name)
+            if kind == _STRING_LIST:
+                raise ValueError(f"Cannot filter on the list column '{name}'")
+            code = self.strings.get(value) if kind == _STRING else int(value)
+            if code is None:
+                return array('I')
+            if selected is None:
+                selected = array('I', compress(range(len(column)), map(code.__eq__, column)))
+            else:
+                selected = array('I', [row for row in selected if column[row] == code])
+        return array('I', range(len(self))) if selected is None else selected
+
+    def count_by(self, *names: str, rows: Optional[Rows] = None) -> Dict[Any, int]:
+        """
+        Counts rows by the values of one or more columns, e.g. enabled prod environments by region:
+
+            fleet.environments.count_by("aws_region", rows=fleet.environments.where(environment="prod", enabled=True))
+
+        :param names: The columns to group by; lists of strings count every item.
+        :param rows: Only count these rows. Defaults to every row.
+        :return: The number of rows per value (per tuple of values for several columns), most frequent first.
+        """
+        if not names:
+            raise ValueError("count_by needs at least one column")
+        if len(names) == 1 and self._column(names[0])[1] == _STRING_LIST:
+            column, _ = self._column(names[0])
+            offsets = self.offsets[names[0]]
+            if rows is None:
+                counts = Counter(column)
+            else:
+                counts = Counter(code for row in rows for code in column[offsets[row]:offsets[row + 1]])
+            return {self.strings[code]: count for code, count in counts.most_common()}
+        columns = [self._column(name) for name in names]
+        if any(kind == _STRING_LIST for _, kind in columns):
+            raise ValueError("Lists of strings can only be counted on their own")
+        if len(columns) == 1:
+            column, kind = columns[0]
+            counts = Counter(column) if rows is None else Counter(map(column.__getitem__, rows))
+        else:
+            selected = range(len(self)) if rows is None else rows
+            counts = Counter(zip(*(map(column.__getitem__, selected) for column, _ in columns)))
+        decoders = [self._decoder(column, kind) for column, kind in columns]
+        if len(decoders) == 1:
+            decode = decoders[0]
+            return {decode(key): count for key, count in counts.most_common()}
+        return {tuple(decode(item) for decode, item in zip(decoders, key)): count
+                for key, count in counts.most_common()}
+
+    def _decoder(self, column: array, kind: int):
+        if kind == _STRING:
+            return self.strings.strings.__getitem__
+        return bool if column.typecode == 'B' else int
+
+    def model_at(self, row: int) -> Any:
+        """
+        :param row: A row number.
+        :return: The model object of the row.
+        """
+        columns = self.columns
+        return self.model(**{name: self._value(self._kinds[name], columns[name], row, name) for name in self.fields})
+
+    def key_at(self, row: int) -> Tuple[str, ...]:
+        """
+        :param row: A row number.
+        :return: The values of the key columns of the row.
+        """
+        return tuple(self.strings[self.columns[name][row]] for name in self.keys)
+
+    def nbytes(self) -> int:
+        """
+        :return: The size of the column arrays, in bytes.
+        """
+        arrays = (*self.columns.values(), *self.offsets.values(), self.config_offsets)
+        return sum(column.itemsize * len(column) for column in arrays)
+
+
+class ColumnarFleet:
+    """
+    Column store of the application fields, environments, promotion phase accounts and Slack channels of a fleet of
+    configs, for reports over thousands of services. Strings are interned in one table shared by every column, so
+    region, environment, cluster and channel names are stored once however many configs repeat them.
+
+        fleet = ColumnarFleet.from_configs(configs)
+        environments = fleet.environments
+        environments.count_by("aws_region", rows=environments.where(environment="prod", enabled=True))
+
+    Configs are numbered in the order they are added; path_monitor and the Slack URL are not stored.
+    """
+
+    def __init__(self):
+        self.strings = StringTable()
+        self.applications = ColumnTable(ApplicationConfig, self.strings)
+        self.environments = ColumnTable(EnvironmentWithRegion, self.strings, keys=("name",))
+        self.accounts = ColumnTable(AwsAccount, self.strings, keys=("name",))
+        self.channels = ColumnTable(SlackChannel, self.strings, keys=("name", "kind"))
+        # Keys of the Slack channel entries of each config, so entries without any channel survive a round trip.
+        self.slack_names = array('I')
+        self.slack_offsets = array('I', [0])
+
+    def __len__(self) -> int:
+        return len(self.applications)
+
+    def add(self, gitops: GitOps) -> int:
+        """
+        :param gitops: The parsed GitOps config.
+        :return: The number of the config.
+        """
+        number = len(self)
+        intern = self.strings.intern
+        self.applications.append(number, (), gitops)
+        for name, environment in gitops.environments.items():
+            self.environments.append(number, (name,), environment)
+        for name, account in gitops.environment_promotion_phases.items():
+            self.accounts.append(number, (name,), account)
+        for name, entry in gitops.slack.channels.items():
+            self.slack_names.append(intern(name))
+            for kind in SLACK_CHANNEL_KINDS:
+                for channel in getattr(entry, kind):
+                    self.channels.append(number, (name, kind), channel)
+        self.slack_offsets.append(len(self.slack_names))
+        for table in (self.applications, self.environments, self.accounts, self.channels):
+            table.end_config()
+        return number
+
+    @classmethod
+    def from_configs(cls, configs: Iterable[GitOps]) -> 'ColumnarFleet':
+        """
+        :param configs: The configs, consumed lazily, so only one needs to be held as objects at a time.
+        :return: The column store of the configs.
+        """
+        fleet = cls()
+        for gitops in configs:
+            fleet.add(gitops)
+        return fleet
+
+    def application(self, config: int) -> ApplicationConfig:
+        return self.applications.model_at(config)
+
+    def environments_of(self, config: int) -> Environments:
+        table = self.environments
+        return Environments({table.key_at(row)[0]: table.model_at(row) for row in table.rows_of(config)})
+
+    def environment_promotion_phases_of(self, config: int) -> EnvironmentPromotionPhases:
+        table = self.accounts
+        return EnvironmentPromotionPhases({table.key_at(row)[0]: table.model_at(row) for row in table.rows_of(config)})
+
+    def slack_channels_of(self, config: int, pool: Optional[SlackChannelPool] = None) -> SlackChannels:
+        """
+        :param config: The number of a config.
+        :param pool: Optional pool to intern the channels into.
+        :return: The Slack channels of the config, equal to gitops.slack.channels.
+        """
+        entries: Dict[str, Dict[str, List[SlackChannel]]] = {
+            self.strings[code]: {kind: [] for kind in SLACK_CHANNEL_KINDS}
+            for code in self.slack_names[self.slack_offsets[config]:self.slack_offsets[config + 1]]}
+        table = self.channels
+        for row in table.rows_of(config):
+            name, kind = table.key_at(row)
+            channel = table.model_at(row)
+            entries[name][kind].append(channel if pool is None else pool.intern(channel.channel_id,
+                                                                                 channel.channel_name))
+        return SlackChannels({name: SlackEnvironmentChannels(**kinds) for name, kinds in entries.items()})
+
+    def nbytes(self) -> int:
+        """
+        :return: The size of the column arrays and of the interned strings, in bytes.
+        """
+        tables = (self.applications, self.environments, self.accounts, self.channels)
+        strings = sum(len(string.encode()) for string in self.strings.strings)
+        slack = (len(self.slack_names) + len(self.slack_offsets)) * 4
+        return sum(table.nbytes() for table in tables) + strings + slack
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+# The client side of this module is imported by short-lived `cli.py client` processes, so the models and PyYAML are
+# only imported where configs are parsed.
+
+OPERATIONS = ("ping", "parse", "manifest", "get", "stats", "shutdown")
+# The operations on a config, which the client can answer in process when no daemon is running. The others are about
+# the daemon itself, so answering them in process would report a daemon that does not exist.
+CONFIG_OPERATIONS = ("parse", "manifest", "get")
+
+
+class DaemonError(Exception):
+    """
+    Error reported by the daemon for a request, e.g. an unknown environment or an invalid config.
+    """
+
+
+class DaemonUnavailable(DaemonError):
+    """
+    No daemon is listening on the socket.
+    """
+
+
+def default_socket_path() -> str:
+    """
+    :return: $CICD_DAEMON_SOCKET, or cicd-daemon.sock in $XDG_RUNTIME_DIR, or a per-user socket in the temp directory.
+    """
+    if os.environ.get("CICD_DAEMON_SOCKET"):
+        return os.environ["CICD_DAEMON_SOCKET"]
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], "cicd-daemon.sock")
+    return os.path.join(tempfile.gettempdir(), f"cicd-daemon-{os.getuid()}.sock")
+
+
+class ConfigStore:
+    """
+    Parsed GitOps configs keyed by absolute path, each with the stat signature (inode, size, mtime) of the file it was
+    parsed from. A config is parsed again only when its signature changed; the new revision is built with
+    GitOps.rebuild, so its unchanged sections and environments are the objects of the previous parse.
+    """
+
+    def __init__(self):
+        self.configs: Dict[str, Tuple[Tuple[int, int, int], Any]] = {}
+        self.loads = 0
+        self.hits = 0
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def signature(path: str) -> Tuple[int, int, int]:
+        stat = os.stat(path)
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def get(self, path: str) -> Any:
+        """
+        :param path: Path of a gitops.yaml or gitops.json file.
+        :return: Its parsed GitOps config, parsed again only if the file changed since the last call.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            signature = self.signature(path)
+            entry = self.configs.get(path)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+            gitops = self._load(path, entry[1] if entry else None)
+            self.configs[path] = (signature, gitops)
+            self.loads += 1
+            return gitops
+
+    @staticmethod
+    def _load(path: str, previous: Any) -> Any:
+        import yaml
+
+        from cicd.GitOpsDataClasses import GitOps
+        from cicd.YamlIO import load_document
+
+        with open(path, 'rb') as file:
+            content = file.read()
+        try:
+            data = load_document(content, path)
+        except yaml.YAMLError as e:
+            # A ValueError, like every other invalid config, so it is reported to the request rather than ending the
+            # connection, and does not stop the watcher.
+            raise ValueError(f"{path}: not valid YAML or JSON: {' '.join(str(e).split())}") from e
+        return previous.rebuild(data) if previous is not None else GitOps.from_dict(data)
+
+    def refresh(self) -> int:
+        """
+        Parses again every known config whose file changed, and forgets the configs whose file was removed.
+
+        :return: The number of configs parsed again.
+        """
+        reloaded = 0
+        for path, (signature, _) in list(self.configs.items()):
+            try:
+                if self.signature(path) == signature:
+                    continue
+                self.get(path)
+                reloaded += 1
+            except OSError:
+                with self._lock:
+                    self.configs.pop(path, None)
+            except (TypeError, ValueError):
+                pass  # reported to the next request for this config
+        return reloaded
+
+
+def answer(store: ConfigStore, request: dict) -> Any:
+    """
+    Computes the result of a request, shared by the daemon and the in-process fallback of the client.
+
+    :param store: The configs.
+    :param request: {"op": ..., "path": ..., "environment": ..., "all": ..., "key": ...}; see OPERATIONS.
+    :return: The JSON-serializable result.
+    :raises DaemonError: For unknown operations, environments or keys.
+    """
+    operation = request.get("op")
+    if operation == "ping":
+        return {"pid": os.getpid(), "configs": len(store.configs)}
+    if operation == "stats":
+        return {"configs": len(store.configs), "loads": store.loads, "hits": store.hits}
+    if operation not in OPERATIONS:
+        raise DaemonError(f"unknown operation '{operation}', expected one of {', '.join(OPERATIONS)}")
+    if operation not in CONFIG_OPERATIONS:
+        raise DaemonError(f"'{operation}' is handled by the daemon server only")
+    if "path" not in request:
+        raise DaemonError(f"'{operation}' needs the path of a config")
+    gitops = store.get(request["path"])
+    if operation == "parse":
+        return gitops.to_dict()
+    if operation == "get":
+        try:
+            return gitops.lookup(request["key"])
+        except KeyError:
+            raise DaemonError(f"no value at '{request['key']}'") from None
+
+    from cicd.GitOpsDataClasses import Manifest
+
+    if request.get("all"):
+        return {name: manifest.to_dict() for name, manifest in Manifest.all_from_gitops(gitops).items()}
+    environment = request.get("environment", "dev")
+    if environment not in gitops.environments:
+        raise DaemonError(f"unknown environment '{environment}', expected one of {', '.join(gitops.environments)}")
+    return Manifest.from_gitops(gitops, environment).to_dict()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        # One JSON object per line in both directions; a connection may carry any number of requests.
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if request.get("op") == "shutdown":
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    response = {"ok": True, "result": None}
+                else:
+                    response = {"ok": True, "result": answer(self.server.store, request)}
+            except DaemonError as e:
+                response = {"ok": False, "error": str(e)}
+            except (KeyError, OSError, TypeError, ValueError) as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response, separators=(',', ':')).encode() + b"\n")
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves the configs of a ConfigStore over a Unix socket with a JSON-lines protocol, and polls the files of the
+    configs it has served so changed configs are parsed again before they are next requested.
+
+        server = DaemonServer(default_socket_path())
+        server.serve_forever()
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, store: Optional[ConfigStore] = None, poll_interval: float = 1.0):
+        self.socket_path = socket_path
+        self.store = store or ConfigStore()
+        self.poll_interval = poll_interval
+        self._stopped = threading.Event()
+        if os.path.exists(socket_path):
+            if ping(socket_path) is not None:
+                raise DaemonError(f"a daemon is already listening on {socket_path}")
+            os.unlink(socket_path)  # left behind by a daemon that did not exit cleanly
+        super().__init__(socket_path, _RequestHandler)
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        watcher = threading.Thread(target=self._watch, name="cicd-daemon-watcher", daemon=True)
+        watcher.start()
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            self._stopped.set()
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.poll_interval):
+            self.store.refresh()
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class DaemonClient:
+    """
+    Client of a DaemonServer, keeping one connection open for any number of requests.
+
+        with DaemonClient(default_socket_path()) as client:
+            manifest = client.request(op="manifest", path="gitops.yaml", environment="prod")
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._reader = None
+
+    def connect(self) -> 'DaemonClient':
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.settimeout(self.timeout)
+        try:
+            client.connect(self.socket_path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            client.close()
+            raise DaemonUnavailable(f"no daemon running on {self.socket_path}: {e}") from None
+        self._socket = client
+        self._reader = client.makefile('rb')
+        return self
+
+    def request(self, **request) -> Any:
+        """
+        :param request: The request fields, e.g. op="get", path="gitops.yaml", key="service". Relative paths are
+        resolved against the working directory of the client.
+        :return: The result.
+        :raises DaemonUnavailable: When no daemon is listening.
+        :raises DaemonError: When the daemon reports an error for the request, or closes the connection.
+        """
+        if self._socket is None:
+            self.connect()
+        if "path" in request:
+            request["path"] = os.path.abspath(request["path"])
+        self._socket.sendall(json.dumps(request, separators=(',', ':')).encode() + b"\n")
+        line = self._reader.readline()
+        if not line:
+            # The daemon is running, so this is not DaemonUnavailable: answering in process instead could only hide
+            # whatever made the daemon drop the request.
+            raise DaemonError(f"the daemon on {self.socket_path} closed the connection")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise DaemonError(response["error"])
+        return response["result"]
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._reader.close()
+            self._socket.close()
+            self._socket = self._reader = None
+
+    def __enter__(self) -> 'DaemonClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def ping(socket_path: str) -> Optional[dict]:
+    """
+    :param socket_path: The socket of the daemon.
+    :return: The daemon's pid and number of configs, or None when no daemon is listening.
+    """
+    try:
+        with DaemonClient(socket_path, timeout=1.0) as client:
+            return client.request(op="ping")
+    except (DaemonError, OSError):
+        return None
+
+
+def query(socket_path: str, fallback: bool = True, **request) -> Any:
+    """
+    Answers a request from the daemon, or in process when no daemon is running.
+
+    :param socket_path: The socket of the daemon.
+    :param fallback: When True (the default) and no daemon is listening, the config operations (CONFIG_OPERATIONS)
+    are answered in this process. Errors reported by a running daemon are raised, not retried in process.
+    :param request: The request fields; see DaemonClient.request.
+    :return: The result.
+    :raises DaemonUnavailable: When no daemon is listening, and fallback is False or the operation is not a config
+    operation, e.g. ping, stats or shutdown.
+    :raises DaemonError: When the request fails.
+    """
+    try:
+        with DaemonClient(socket_path) as client:
+            return client.request(**request)
+    except DaemonUnavailable:
+        if not fallback or request.get("op") not in CONFIG_OPERATIONS:
+            raise
+    return answer(ConfigStore(), request)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import typing
+from dataclasses import MISSING, dataclass, fields, is_dataclass
+from functools import lru_cache
+from typing import Any, List, Tuple
+
+from cicd.Abstracts import Abstract
+from cicd.Codecs import DEFAULT, codec_for, serialized_key
+from cicd.GitOpsDataClasses import ApplicationConfig, GitOps, Manifest
+from cicd.Validation import ensure_valid
+
+APPLICATION_KEYS = frozenset(model_field.name for model_field in fields(ApplicationConfig))
+MANIFEST_KEYS = frozenset(Manifest.__dataclass_fields__)
+
+
+@dataclass(frozen=True)
+class GitOpsDiff:
+    changes: Tuple[str, ...]
+    affected_environments: Tuple[str, ...]
+
+    @property
+    def unchanged(self) -> bool:
+        return not self.changes
+
+    @property
+    def sections(self) -> Tuple[str, ...]:
+        """
+        :return: The top-level keys that changed, e.g. ('environments', 'slack').
+        """
+        return tuple(dict.fromkeys(change.split(".", 1)[0] for change in self.changes))
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and (issubclass(annotation, Abstract) or is_dataclass(annotation))
+
+
+@lru_cache(maxsize=None)
+def _plan(cls: type) -> tuple:
+    hints = typing.get_type_hints(cls)
+    plan = []
+    for model_field in fields(cls):
+        annotation = hints[model_field.name]
+        item = (typing.get_args(annotation) or (Any,))[0] if typing.get_origin(annotation) is list else None
+        plan.append((model_field.name, serialized_key(model_field), model_field.metadata.get(DEFAULT, MISSING),
+                     annotation, item if _is_model(item) else None))
+    return tuple(plan)
+
+
+def _diff(old: Any, new: Any, path: str, changes: List[str]) -> None:
+    if old is new:
+        return
+    if isinstance(old, Abstract) and isinstance(new, Abstract):
+        for key in dict.fromkeys([*old, *new]):
+            if key not in old or key not in new:
+                changes.append(f"{path}.{key}")
+            else:
+                _diff(old[key], new[key], f"{path}.{key}", changes)
+    elif is_dataclass(old) and (isinstance(new, type(old)) or isinstance(old, type(new))):
+        for name, key, _, _, _ in _plan(type(old)):
+            _diff(getattr(old, name), getattr(new, name), f"{path}.{key}" if path else key, changes)
+    elif old != new:
+        changes.append(path)
+
+
+def diff(old: GitOps, new: GitOps) -> GitOpsDiff:
+    """
+    Compares two GitOps configs and lists the changed paths and the environments whose Manifest changed.
+
+    Subtrees shared by both configs, as produced by rebuild, are skipped without being compared.
+
+    :param old: The previous config.
+    :param new: The new config.
+    :return: The differences between both configs.
+    """
+    changes: List[str] = []
+    _diff(old, new, "", changes)
+
+    environments = list(dict.fromkeys([*new.environments, *old.environments]))
+    if any(change in APPLICATION_KEYS for change in changes):
+        affected = environments
+    else:
+        touched = set()
+        for change in changes:
+            parts = change.split(".")
+            if parts[0] == "environments" and (len(parts) == 2 or parts[2] in MANIFEST_KEYS):
+                touched.add(parts[1])
+        affected = [environment for environment in environments if environment in touched]
+    return GitOpsDiff(tuple(changes), tuple(affected))
+
+
+def _rebuild(annotation: type, previous: Any, raw: Any) -> Any:
+    if previous is None or not isinstance(previous, annotation):
+        return codec_for(annotation).from_dict(raw)
+
+    if issubclass(annotation, Abstract):
+        entries = {}
+        reused = len(raw) == len(previous)
+        for key, value in raw.items():
+            old = previous.get(key)
+            entry = _rebuild(annotation.value_type, old, value)
+            reused = reused and entry is old
+            entries[key] = entry
+        return previous if reused else annotation(entries)
+
+    values = {}
+    reused = True
+    for name, key, default, field_annotation, item_model in _plan(annotation):
+        value = raw.get(key) if default is MISSING else raw.get(key, default)
+        old = getattr(previous, name)
+        if _is_model(field_annotation):
+            new = _rebuild(field_annotation, old, value)
+        elif item_model is not None:
+            new = [_rebuild(item_model, old[index] if index < len(old) else None, item)
+                   for index, item in enumerate(value)]
+            if len(new) == len(old) and all(item is old_item for item, old_item in zip(new, old)):
+                new = old
+        elif old == value:
+            new = old
+        else:
+            new = list(value) if isinstance(value, list) else value
+        reused = reused and new is old
+        values[name] = new
+    return previous if reused else annotation(**values)
+
+
+def rebuild(previous: GitOps, obj: Any) -> GitOps:
+    """
+    Parses a new revision of a config, reusing every unchanged subtree of the previous parse.
+
+    The raw data is validated in a single pass first; then only the changed entries are built, and containers,
+    sections or the whole config whose entries are all unchanged are returned as the previous objects. diff can then
+    skip them by identity.
+
+    :param previous: The GitOps config parsed from the previous revision.
+    :param obj: The raw dictionary of the new revision.
+    :return: The new GitOps config.
+    """
+    ensure_valid(obj)
+    return _rebuild(GitOps, previous, obj)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import mmap
+import os
+from dataclasses import dataclass
+from typing import IO, Any, Callable, Iterator, Optional, Tuple, Union
+
+import yaml
+
+from cicd.GitOpsDataClasses import GitOps, SlackChannelPool
+from cicd.Profiling import current
+from cicd.YamlIO import load_yaml
+
+YAML = "yaml"
+JSONL = "jsonl"
+STREAM_FORMATS = (YAML, JSONL)
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+Source = Union[str, IO[bytes]]
+# (index of the document in the stream, byte offset of its first line, line number of its first line, content)
+_Chunk = Tuple[int, int, int, bytes]
+
+
+@dataclass(frozen=True, slots=True)
+class MalformedDocument:
+    """
+    A document of a stream that could not be parsed, or is not a valid GitOps config.
+    """
+
+    index: int  # position of the document in the stream, from 0
+    offset: int  # byte offset of its first line
+    line: int  # line number of its first line, from 1
+    error: str
+
+    def __str__(self) -> str:
+        return f"document {self.index} at byte {self.offset} (line {self.line}): {self.error}"
+
+
+class StreamError(ValueError):
+    def __init__(self, malformed: MalformedDocument):
+        self.malformed = malformed
+        super().__init__(str(malformed))
+
+
+def stream_format(source: Source) -> str:
+    """
+    The format is only detected from the file name, not the content, so a stream without one, like stdin, is read
+    as YAML unless its format is given explicitly.
+
+    :param source: A file path or an open binary file.
+    :return: "jsonl" for .jsonl and .ndjson files, otherwise "yaml".
+    """
+    name = source if isinstance(source, str) else getattr(source, "name", "")
+    return JSONL if isinstance(name, str) and name.endswith(JSONL_SUFFIXES) else YAML
+
+
+def _is_marker(line: bytes, marker: bytes) -> bool:
+    return line.startswith(marker) and line[3:4] in (b"", b" ", b"\t", b"\r", b"\n")
+
+
+def _yaml_chunks(file: IO[bytes]) -> Iterator[_Chunk]:
+    # A "---" or "..." line at column 0 always ends the current document, even inside a block scalar, so documents
+    # can be split on lines without tokenizing them. Only one document is held at a time.
+    index = 0
+    offset = start = 0
+    line_number = first_line = 1
+    lines: list = []
+    for line in file:
+        starts = _is_marker(line, b"---")
+        if starts or _is_marker(line, b"..."):
+            if lines:
+                yield index, start, first_line, b"".join(lines)
+                index += 1
+                lines = []
+            if starts:
+                lines.append(line)
+                start, first_line = offset, line_number
+        else:
+            if not lines:
+                start, first_line = offset, line_number
+            lines.append(line)
+        offset += len(line)
+        line_number += 1
+    if lines:
+        yield index, start, first_line, b"".join(lines)
+
+
+def _jsonl_chunks(buffer: Union[bytes, mmap.mmap]) -> Iterator[_Chunk]:
+    index = 0
+    offset = 0
+    line_number = 1
+    size = len(buffer)
+    while offset < size:
+        end = buffer.find(b"\n", offset)
+        end = size if end < 0 else end
+        line = buffer[offset:end]
+        if line.strip():
+            yield index, offset, line_number, line
+            index += 1
+        offset = end + 1
+        line_number += 1
+
+
+def _jsonl_stream_chunks(file: IO[bytes]) -> Iterator[_Chunk]:
+    index = 0
+    offset = 0
+    for line_number, line in enumerate(file, 1):
+        if line.strip():
+            yield index, offset, line_number, line
+            index += 1
+        offset += len(line)
+
+
+def _chunks(source: Source, output_format: str) -> Iterator[_Chunk]:
+    if not isinstance(source, str):
+        yield from _yaml_chunks(source) if output_format == YAML else _jsonl_stream_chunks(source)
+        return
+    with open(source, 'rb') as file:
+        if output_format == YAML:
+            yield from _yaml_chunks(file)
+        elif os.fstat(file.fileno()).st_size:
+            # JSON Lines are read through a memory map: each line is copied out only while it is parsed, and the
+            # pages of lines already parsed can be dropped by the kernel.
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield from _jsonl_chunks(mapped)
+
+
+def _iter_parsed(source: Source, parse: Callable[[Any], Any], stream_format_name: Optional[str],
+                 skip_invalid: bool, on_error: Optional[Callable[[MalformedDocument], None]]) -> Iterator[Any]:
+    output_format = stream_format_name or stream_format(source)
+    if output_format not in STREAM_FORMATS:
+        raise ValueError(f"Unknown stream format '{output_format}', expected one of {STREAM_FORMATS}")
+    load = json.loads if output_format == JSONL else load_yaml
+    profiler = current()
+    for index, offset, line, content in _chunks(source, output_format):
+        try:
+            data = load(content)
+            if data is None:
+                continue  # an empty document, e.g. after a trailing "---"
+            result = parse(data)
+        except (yaml.YAMLError, TypeError, ValueError) as e:
+            malformed = MalformedDocument(index, offset, line, f"{type(e).__name__}: {e}".replace("\n", " "))
+            if not skip_invalid:
+                raise StreamError(malformed) from e
+            profiler.count("stream.skipped")
+            if on_error is not None:
+                on_error(malformed)
+            continue
+        profiler.count("stream.documents")
+        yield result
+
+
+def iter_documents(source: Source, stream_format_name: Optional[str] = None, skip_invalid: bool = False,
+                   on_error: Optional[Callable[[MalformedDocument], None]] = None) -> Iterator[Any]:
+    """
+    Parses the documents of a multi-document YAML stream or of a JSON Lines file one at a time.
+
+    :param source: A file path, or an open binary file such as sys.stdin.buffer.
+    :param stream_format_name: "yaml" or "jsonl". Defaults to "jsonl" for .jsonl and .ndjson files, else "yaml";
+    see stream_format. Give it for JSON Lines read from stdin.
+    :param skip_invalid: When True, documents that cannot be parsed are skipped and reported to on_error instead of
+    raising StreamError.
+    :param on_error: Called with the MalformedDocument of every skipped document.
+    :return: The parsed documents, lazily.
+    """
+    return _iter_parsed(source, lambda data: data, stream_format_name, skip_invalid, on_error)
+
+
+def iter_gitops(source: Source, stream_format_name: Optional[str] = None, skip_invalid: bool = False,
+                on_error: Optional[Callable[[MalformedDocument], None]] = None, lazy: bool = False,
+                slack_channel_pool: SlackChannelPool = None) -> Iterator[GitOps]:
+    """
+    Parses the GitOps configs of a fleet export, e.g. a multi-GB multi-document YAML or JSON Lines file, one document
+    at a time, so memory stays bounded by the largest document rather than the file.
+
+        for gitops in iter_gitops("fleet.jsonl", skip_invalid=True, on_error=print):
+            ...
+
+    :param source: A file path, or an open binary file such as sys.stdin.buffer.
+    :param stream_format_name: "yaml" or "jsonl"; see iter_documents.
+    :param skip_invalid: When True, documents that are not valid YAML or JSON, or not valid GitOps configs, are
+    skipped and reported to on_error instead of raising StreamError.
+    :param on_error: Called with the MalformedDocument of every skipped document.
+    :param lazy: Parse the sections of each config on first access; see GitOps.from_dict. Errors in a section are
+    then raised on access rather than reported here, so keep the default when skipping invalid documents.
+    :param slack_channel_pool: Optional pool shared by every config, to intern their Slack channels fleet-wide.
+    :return: The GitOps configs, lazily.
+    """
+    return _iter_parsed(source, lambda data: GitOps.from_dict(data, slack_channel_pool, lazy), stream_format_name,
+                        skip_invalid, on_error)
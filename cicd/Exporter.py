@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import re
+import secrets
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Output formats: the $GITHUB_OUTPUT and $GITHUB_ENV files of GitHub Actions share one syntax, dotenv files another.
+GITHUB = "github"
+DOTENV = "dotenv"
+EXPORT_FORMATS = (GITHUB, DOTENV)
+GITHUB_FILES = {"github-output": "GITHUB_OUTPUT", "github-env": "GITHUB_ENV"}
+
+_KEY_CHARACTERS = re.compile(r'[^A-Za-z0-9_]+')
+_DOTENV_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r"})
+
+
+def _json(value: Any) -> str:
+    # Same representation as Utils.format_value gives lists and dictionaries.
+    return json.dumps(value, separators=(',', ':'), sort_keys=True)
+
+
+def _quoted(text: str) -> str:
+    return f'"{text.translate(_DOTENV_ESCAPES)}"'
+
+
+# Formatters by exact value type, looked up once per value instead of running a chain of isinstance checks.
+# Booleans render as true/false and containers as compact JSON, as in Utils.format_value.
+_FORMATTERS: Dict[str, Dict[type, Callable[[Any], str]]] = {
+    GITHUB: {
+        str: str,
+        bool: lambda value: "true" if value else "false",
+        int: str,
+        float: repr,
+        type(None): lambda value: "",
+        list: _json,
+        dict: _json,
+    },
+    DOTENV: {
+        str: _quoted,
+        bool: lambda value: "true" if value else "false",
+        int: str,
+        float: repr,
+        type(None): lambda value: '""',
+        list: lambda value: _quoted(_json(value)),
+        dict: lambda value: _quoted(_json(value)),
+    },
+}
+
+
+@lru_cache(maxsize=65536)
+def export_key(*parts: str) -> str:
+    """
+    :param parts: The path of a value, e.g. ("environments", "prod-eu", "cluster").
+    :return: The variable name: the parts joined by "_", upper-cased, other characters replaced by "_",
+    e.g. ENVIRONMENTS_PROD_EU_CLUSTER.
+    """
+    return _KEY_CHARACTERS.sub("_", "_".join(part for part in parts if part)).strip("_").upper()
+
+
+def flatten(obj: Any, prefix: str = "") -> List[Tuple[str, Any]]:
+    """
+    Flattens a Manifest, a GitOps config or any serialized dictionary into (key, value) pairs. Nested dictionaries
+    become key paths; lists are kept whole and exported as JSON.
+
+    :param obj: A model with to_dict, or a dictionary.
+    :param prefix: Optional prefix of every key, e.g. the service name when exporting a fleet.
+    :return: The pairs, in the order of the serialized dictionary.
+    """
+    pairs: List[Tuple[str, Any]] = []
+    _flatten((prefix,), obj.to_dict() if hasattr(obj, "to_dict") else obj, pairs)
+    return pairs
+
+
+def _flatten(path: Tuple[str, ...], data: dict, pairs: List[Tuple[str, Any]]) -> None:
+    for name, value in data.items():
+        if isinstance(value, dict) and value:
+            _flatten(path + (name,), value, pairs)
+        else:
+            pairs.append((export_key(*path, name), value))
+
+
+def format_exports(pairs: Iterable[Tuple[str, Any]], output_format: str = GITHUB) -> str:
+    """
+    :param pairs: (key, value) pairs, e.g. from flatten.
+    :param output_format: "github" for $GITHUB_OUTPUT/$GITHUB_ENV, or "dotenv".
+    :return: The KEY=value lines. In the github format, values spanning several lines are written as
+    KEY<<DELIMITER blocks with a random delimiter that does not occur in any value; in dotenv they are quoted with
+    escaped newlines.
+    """
+    if output_format not in _FORMATTERS:
+        raise ValueError(f"Unknown export format '{output_format}', expected one of {EXPORT_FORMATS}")
+    formatters = _FORMATTERS[output_format]
+    lines = []
+    multiline = []
+    for key, value in pairs:
+        formatter = formatters.get(type(value))
+        text = formatter(value) if formatter is not None else formatters[str](str(value))
+        if output_format == GITHUB and ("\n" in text or "\r" in text):
+            multiline.append(len(lines))
+            lines.append((key, text))
+        else:
+            lines.append(f"{key}={text}\n")
+    if multiline:
+        delimiter = _delimiter([lines[index][1] for index in multiline])
+        for index in multiline:
+            key, text = lines[index]
+            lines[index] = f"{key}<<{delimiter}\n{text}\n{delimiter}\n"
+    return "".join(lines)
+
+
+def _delimiter(values: List[str]) -> str:
+    while True:
+        delimiter = f"EOF_{secrets.token_hex(8)}"
+        if not any(delimiter in value for value in values):
+            return delimiter
+
+
+def export_path(target: str) -> Optional[str]:
+    """
+    :param target: "github-output", "github-env", or a file path.
+    :return: The file to append to: $GITHUB_OUTPUT or $GITHUB_ENV for the first two, when set, else None.
+    """
+    if target in GITHUB_FILES:
+        return os.environ.get(GITHUB_FILES[target]) or None
+    return target
+
+
+def write_exports(pairs: Iterable[Tuple[str, Any]], path: str, output_format: str = GITHUB) -> int:
+    """
+    Formats every pair first and appends them to the file in a single write, so a failure cannot leave a partial
+    set of outputs behind and tens of thousands of keys cost one system call.
+
+    :param pairs: (key, value) pairs, e.g. from flatten.
+    :param path: The file to append to, e.g. $GITHUB_OUTPUT.
+    :param output_format: "github" or "dotenv".
+    :return: The number of bytes written.
+    """
+    data = format_exports(pairs, output_format).encode()
+    with open(path, 'ab') as file:
+        file.write(data)
+    return len(data)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import io
+import json
+import os
+from dataclasses import fields
+from typing import IO, Any, Callable, Dict, Optional
+
+from cicd import __version__
+
+DIGEST_SIZE = 16
+RENDER_STATE = ".cicd-render-state.json"
+# Part of every RenderCache key. Bump it whenever the same data renders to different output, e.g. when dump options,
+# the YAML formatting or the serialization of a model change, so outputs cached by the previous renderer are redone.
+RENDER_VERSION = 1
+_CANONICAL = json.JSONEncoder(sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def canonical_bytes(data: Any) -> bytes:
+    """
+    :param data: Serialized data, e.g. the result of to_dict.
+    :return: Its canonical JSON: keys sorted at every level and no whitespace, so dictionaries that differ only in
+    key order have the same bytes. Lists keep their order, as it is meaningful (regions, channels, paths).
+    """
+    return _CANONICAL.encode(data).encode()
+
+
+def fingerprint(obj: Any) -> str:
+    """
+    :param obj: A model with to_dict, e.g. a Manifest or a section of a GitOps config, or serialized data.
+    :return: The hex BLAKE2b digest of its canonical JSON.
+    """
+    data = obj.to_dict() if hasattr(obj, "to_dict") else obj
+    return hashlib.blake2b(canonical_bytes(data), digest_size=DIGEST_SIZE).hexdigest()
+
+
+def section_fingerprints(gitops: Any) -> Dict[str, str]:
+    """
+    :param gitops: A GitOps config.
+    :return: The fingerprint of each section (environment_promotion_phases, environments, path_monitor, slack) and
+    of the application fields together, as "application".
+    """
+    from cicd.GitOpsDataClasses import ApplicationConfig
+
+    application = {attr.name for attr in fields(ApplicationConfig)}
+    result = {"application": fingerprint(ApplicationConfig.to_dict(gitops))}
+    for attr in fields(gitops):
+        if attr.name not in application:
+            result[attr.name] = fingerprint(getattr(gitops, attr.name))
+    return result
+
+
+def combine(fingerprints: Dict[str, str]) -> str:
+    """
+    :param fingerprints: Named fingerprints, e.g. from section_fingerprints.
+    :return: One fingerprint of all of them, independent of their order.
+    """
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for name in sorted(fingerprints):
+        digest.update(f"{name}={fingerprints[name]}\n".encode())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    Remembers, for each output file, the key of the content last rendered into it, so a render whose key did not
+    change is skipped: no rendering and no write, which leaves the file and its modification time alone.
+
+    The key is derived from the fingerprint of the rendered data, the output format, RENDER_VERSION and the library
+    version. An output file is trusted without being read when its size and modification time are the recorded ones;
+    otherwise, e.g. after a fresh checkout, it is read and compared with the digest of the recorded content. Output
+    paths are recorded relative to the state file, so the state stays valid when the workspace moves.
+
+        with RenderCache("outputs/.cicd-render-state.json") as cache:
+            cache.write("outputs/manifest.yaml", cache.key(manifest.fingerprint, "yaml"),
+                        lambda stream: dump_yaml(manifest.to_dict(), stream))
+    """
+
+    def __init__(self, state_path: str):
+        self.state_path = os.path.abspath(state_path)
+        self.written = 0
+        self.skipped = 0
+        self._changed = False
+        try:
+            with open(self.state_path, 'r') as file:
+                self._entries: Dict[str, list] = json.load(file)
+        except FileNotFoundError:
+            self._entries = {}
+        except ValueError:
+            self._entries = {}  # unreadable state: every output is rendered again
+        if not isinstance(self._entries, dict):
+            self._entries = {}
+
+    @classmethod
+    def for_output(cls, output_path: str) -> 'RenderCache':
+        """
+        :param output_path: An output file.
+        :return: The cache whose state file is RENDER_STATE in the directory of the output.
+        """
+        return cls(os.path.join(os.path.dirname(os.path.abspath(output_path)), RENDER_STATE))
+
+    @staticmethod
+    def key(data_fingerprint: str, *variant: str) -> str:
+        """
+        :param data_fingerprint: The fingerprint of the data to render.
+        :param variant: Anything else the output depends on, e.g. the output format.
+        :return: The cache key of the output.
+        """
+        return combine({"data": data_fingerprint, "variant": "/".join(variant), "renderer": str(RENDER_VERSION),
+                        "version": __version__})
+
+    @staticmethod
+    def _digest(content: bytes) -> str:
+        return hashlib.blake2b(content, digest_size=DIGEST_SIZE).hexdigest()
+
+    def _name(self, path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), os.path.dirname(self.state_path))
+
+    def is_current(self, path: str, key: str) -> bool:
+        """
+        :param path: An output file.
+        :param key: The key of the content it should have.
+        :return: True when the file holds the content last rendered for this key.
+        """
+        entry = self._entries.get(self._name(path))
+        if not isinstance(entry, list) or len(entry) != 4 or entry[0] != key:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_size != entry[1]:
+            return False
+        if stat.st_mtime_ns == entry[2]:
+            return True
+        with open(path, 'rb') as file:
+            if self._digest(file.read()) != entry[3]:
+                return False
+        entry[2] = stat.st_mtime_ns
+        self._changed = True
+        return True
+
+    def write(self, path: str, key: str, render: Callable[[IO[str]], None]) -> bool:
+        """
+        Renders an output file unless it already holds the content of this key. The file is replaced atomically.
+
+        :param path: The output file.
+        :param key: The key of the content, see key.
+        :param render: Writes the content to the given text stream; it is buffered, so a failing render leaves the
+        file as it was.
+        :return: True when the file was written, False when it was current.
+        """
+        if self.is_current(path, key):
+            self.skipped += 1
+            return False
+        buffer = io.StringIO()
+        render(buffer)
+        content = buffer.getvalue().encode()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'wb') as file:
+            file.write(content)
+        os.replace(temporary_path, path)
+        stat = os.stat(path)
+        self._entries[self._name(path)] = [key, stat.st_size, stat.st_mtime_ns, self._digest(content)]
+        self._changed = True
+        self.written += 1
+        return True
+
+    def save(self) -> None:
+        """
+        Writes the state file, when anything changed.
+        """
+        if not self._changed:
+            return
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        temporary_path = f"{self.state_path}.tmp"
+        with open(temporary_path, 'w') as file:
+            json.dump(self._entries, file, separators=(',', ':'), sort_keys=True)
+        os.replace(temporary_path, self.state_path)
+        self._changed = False
+
+    def __enter__(self) -> 'RenderCache':
+        return self
+
+    def __exit__(self, *exc_info: Optional[Any]) -> None:
+        self.save()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+GITOPS_FILE_NAMES = ("gitops.yaml", "gitops.yml")
+# The GitOpsCache of each cache directory, one per process: a worker reuses it for every config it loads.
+_caches: Dict[str, object] = {}
+
+
+@dataclass
+class FleetResult:
+    path: str
+    service: Optional[str] = None
+    manifest: Optional[dict] = None
+    error: Optional[str] = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict:
+        result: dict = {
+            "path": self.path,
+            "service": self.service,
+            "ok": self.ok,
+            "duration_ms": round(self.duration * 1000, 3),
+        }
+        if self.manifest is not None:
+            result["manifest"] = self.manifest
+        if self.error is not None:
+            result["error"] = self.error
+        return result
+
+
+@dataclass
+class FleetSummary:
+    workers: int
+    total: int = 0
+    failures: List[FleetResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def add(self, result: FleetResult) -> None:
+        self.total += 1
+        if not result.ok:
+            self.failures.append(result)
+
+    @property
+    def succeeded(self) -> int:
+        return self.total - len(self.failures)
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "workers": self.workers,
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": len(self.failures),
+            "elapsed_s": round(self.elapsed, 3),
+            "files_per_s": round(self.throughput, 1),
+            "failures": [{"path": failure.path, "error": failure.error} for failure in self.failures],
+        }
+
+
+def discover_gitops_files(target: str) -> List[str]:
+    """
+    Resolves a directory or glob pattern into a sorted list of gitops config files.
+
+    :param target: A directory to search recursively for gitops.yaml/gitops.yml files, or a glob pattern.
+    :return: The sorted list of matching file paths.
+    """
+    if os.path.isdir(target):
+        matches = []
+        for root, _, files in os.walk(target):
+            matches.extend(os.path.join(root, name) for name in files if name in GITOPS_FILE_NAMES)
+        return sorted(matches)
+    return sorted(path for path in glob.glob(target, recursive=True) if os.path.isfile(path))
+
+
+def load_service(path: str, environment_name: str = 'dev', cache_directory: Optional[str] = None) -> FleetResult:
+    """
+    Loads one gitops config and builds its manifest. Runs inside the worker processes, so it never raises:
+    any failure is reported on the returned result.
+
+    :param path: Path of the gitops.yaml file.
+    :param environment_name: The environment the manifest is built for.
+    :param cache_directory: Optional GitOpsCache directory used to skip parsing unchanged configs.
+    :return: The per-service result.
+    """
+    from cicd.GitOpsDataClasses import Manifest, gitops_from_dict
+    from cicd.YamlIO import load_yaml
+
+    started = time.perf_counter()
+    result = FleetResult(path)
+    try:
+        if cache_directory:
+            gitops = _cache(cache_directory).load(path)
+        else:
+            with open(path, 'rb') as file:
+                gitops = gitops_from_dict(load_yaml(file))
+        result.service = gitops.service
+        result.manifest = Manifest.from_gitops(gitops, environment_name).to_dict()
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.duration = time.perf_counter() - started
+    return result
+
+
+def _cache(directory: str):
+    cache = _caches.get(directory)
+    if cache is None:
+        from cicd.GitOpsCache import GitOpsCache
+
+        cache = _caches[directory] = GitOpsCache(directory)
+    return cache
+
+
+def run_fleet(paths: List[str], workers: Optional[int] = None, environment_name: str = 'dev',
+              summary: Optional[FleetSummary] = None, cache_directory: Optional[str] = None) -> Iterator[FleetResult]:
+    """
+    Parses many gitops configs in a process pool, yielding each result as soon as it is available.
+
+    :param paths: The gitops.yaml files to process.
+    :param workers: Number of worker processes. Defaults to the CPU count; 1 processes everything in-process.
+    :param environment_name: The environment the manifests are built for.
+    :param summary: Optional summary that is updated with every result and the total elapsed time.
+    :param cache_directory: Optional GitOpsCache directory shared by the workers.
+    :return: An iterator over the per-service results, in input order.
+    """
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    try:
+        if workers == 1 or len(paths) <= 1:
+            results = map(load_service, paths, [environment_name] * len(paths), [cache_directory] * len(paths))
+            yield from _tally(results, summary)
+            return
+
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(load_service, paths, [environment_name] * len(paths), [cache_directory] * len(paths),
+                                   chunksize=chunksize)
+            yield from _tally(results, summary)
+    finally:
+        if summary is not None:
+            summary.elapsed = time.perf_counter() - started
+
+
+def _tally(results: Iterator[FleetResult], summary: Optional[FleetSummary]) -> Iterator[FleetResult]:
+    for result in results:
+        if summary is not None:
+            summary.add(result)
+        yield result
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import marshal
+import os
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from cicd.GitOpsDataClasses import GitOps
+
+INDEXED_FIELDS = ("cluster", "aws_region", "aws_account_id", "ecr_repository_name", "helm_chart_repo",
+                  "app_of_apps", "slack_channel_id")
+# Index file: header (magic, format version, payload length) + marshal payload.
+INDEX_MAGIC = b"GOPI"
+INDEX_HEADER = struct.Struct("<4sHQ")
+FORMAT_VERSION = 1
+MARSHAL_VERSION = 4
+
+
+class FleetIndexError(ValueError):
+    pass
+
+
+def index_terms(gitops: GitOps) -> Iterator[Tuple[str, str]]:
+    """
+    :param gitops: The parsed GitOps config.
+    :return: The (field, value) pairs it is indexed under, values as strings. aws_region covers the
+    additional_aws_regions and slack_channel_id every channel of every environment.
+    """
+    yield "ecr_repository_name", gitops.ecr_repository_name
+    yield "helm_chart_repo", gitops.helm_chart_repo
+    yield "app_of_apps", gitops.app_of_apps
+    for environment in gitops.environments.values():
+        yield "cluster", environment.cluster
+        yield "aws_region", environment.aws_region
+        for region in environment.additional_aws_regions:
+            yield "aws_region", region
+    for account in gitops.environment_promotion_phases.values():
+        yield "aws_account_id", str(account.aws_account_id)
+    for channels in gitops.slack.channels.values():
+        for channel in (*channels.cd, *channels.ci):
+            yield "slack_channel_id", channel.channel_id
+
+
+class FleetIndex:
+    """
+    Inverted index over a fleet of GitOps configs: for each of INDEXED_FIELDS, a dictionary from value to the sorted
+    numbers of the configs having it. A lookup is one dictionary access; a query with several criteria intersects
+    their lists, starting with the shortest.
+
+        index = FleetIndex.from_paths(discover_gitops_files("services/"))
+        index.query(cluster="prod-eks", aws_account_id=838106405942)
+        index.save("fleet.index")
+    """
+
+    def __init__(self):
+        self.services: List[str] = []
+        self.sources: List[str] = []
+        self._postings: Dict[str, Dict[str, List[int]]] = {name: {} for name in INDEXED_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.services)
+
+    def add(self, gitops: GitOps, source: str = "") -> int:
+        """
+        :param gitops: The parsed GitOps config.
+        :param source: Where the config was read from, e.g. its path.
+        :return: The number of the config in the index.
+        """
+        number = len(self.services)
+        self.services.append(gitops.service)
+        self.sources.append(source)
+        postings = self._postings
+        for name, value in index_terms(gitops):
+            numbers = postings[name].setdefault(value, [])
+            # Numbers only grow, so a config listing a value twice is recorded once and every list stays sorted.
+            if not numbers or numbers[-1] != number:
+                numbers.append(number)
+        return number
+
+    @classmethod
+    def from_configs(cls, configs: Iterable[Tuple[str, GitOps]]) -> 'FleetIndex':
+        """
+        :param configs: (source, config) pairs, consumed lazily.
+        :return: The index of the configs.
+        """
+        index = cls()
+        for source, gitops in configs:
+            index.add(gitops, source)
+        return index
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[str]) -> 'FleetIndex':
+        """
+        :param paths: gitops.yaml or gitops.json files. path_monitor is not indexed, so it is never parsed.
+        :return: The index of the configs.
+        """
+        from cicd.YamlIO import load_document
+
+        def configs() -> Iterator[Tuple[str, GitOps]]:
+            for path in paths:
+                with open(path, 'rb') as file:
+                    yield path, GitOps.from_dict(load_document(file.read(), path), lazy=True)
+
+        return cls.from_configs(configs())
+
+    def values(self, name: str) -> List[str]:
+        """
+        :param name: One of INDEXED_FIELDS.
+        :return: Every value of the field across the fleet, sorted.
+        """
+        return sorted(self._field(name))
+
+    def lookup(self, name: str, value: Any) -> Tuple[int, ...]:
+        """
+        :param name: One of INDEXED_FIELDS.
+        :param value: The value, e.g. a cluster name or an AWS account ID as int or str.
+        :return: The sorted numbers of the configs having the value.
+        """
+        return tuple(self._field(name).get(str(value), ()))
+
+    def match(self, **criteria: Any) -> Tuple[int, ...]:
+        """
+        :param criteria: Field values the configs must all have, e.g. cluster="prod-eks", aws_region="eu-west-1".
+        :return: The sorted numbers of the matching configs; every config when there are no criteria.
+        """
+        if not criteria:
+            return tuple(range(len(self.services)))
+        postings = sorted((self._field(name).get(str(value), ()) for name, value in criteria.items()), key=len)
+        matches = postings[0]
+        for numbers in postings[1:]:
+            if not matches:
+                break
+            matches = sorted(set(matches).intersection(numbers))
+        return tuple(matches)
+
+    def query(self, **criteria: Any) -> List[str]:
+        """
+        :param criteria: See match.
+        :return: The service names of the matching configs, in index order.
+        """
+        return [self.services[number] for number in self.match(**criteria)]
+
+    def source(self, number: int) -> Optional[str]:
+        """
+        :param number: The number of a config.
+        :return: Where the config was read from, or None when it was added without a source.
+        """
+        return self.sources[number] or None
+
+    def _field(self, name: str) -> Dict[str, List[int]]:
+        try:
+            return self._postings[name]
+        except KeyError:
+            raise FleetIndexError(f"Unknown index field '{name}', expected one of "
+                                  f"{', '.join(INDEXED_FIELDS)}") from None
+
+    def save(self, path: str) -> int:
+        """
+        Writes the index to a file, replacing it atomically.
+
+        :param path: The index file.
+        :return: The number of bytes written.
+        """
+        payload = marshal.dumps((self.services, self.sources, self._postings), MARSHAL_VERSION)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'wb') as file:
+            file.write(INDEX_HEADER.pack(INDEX_MAGIC, FORMAT_VERSION, len(payload)))
+            file.write(payload)
+        os.replace(temporary_path, path)
+        return INDEX_HEADER.size + len(payload)
+
+    @classmethod
+    def load(cls, path: str) -> 'FleetIndex':
+        """
+        :param path: A file written by save.
+        :return: The index, ready for lookups without any config being parsed.
+        :raises FleetIndexError: When the file is not an index of this format version.
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+        if len(data) < INDEX_HEADER.size:
+            raise FleetIndexError(f"{path}: truncated fleet index")
+        magic, version, length = INDEX_HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC or version != FORMAT_VERSION:
+            raise FleetIndexError(f"{path}: not a fleet index of format version {FORMAT_VERSION}")
+        if len(data) != INDEX_HEADER.size + length:
+            raise FleetIndexError(f"{path}: truncated fleet index")
+        index = cls()
+        index.services, index.sources, postings = marshal.loads(memoryview(data)[INDEX_HEADER.size:])
+        index._postings.update(postings)
+        return index
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Optional
+
+from cicd import __version__
+from cicd.GitOpsDataClasses import GitOps, gitops_from_dict
+from cicd.Snapshot import schema_hash
+from cicd.YamlIO import load_yaml
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Eviction removes entries until they fit in this fraction of max_bytes, so a full cache is not scanned on every write.
+EVICT_TO = 0.9
+CACHE_SUFFIX = ".gitops.pickle"
+
+
+def default_cache_directory() -> str:
+    """
+    :return: $CICD_CACHE_DIR when set, otherwise cicd-python inside $XDG_CACHE_HOME (default ~/.cache).
+    """
+    if os.environ.get("CICD_CACHE_DIR"):
+        return os.environ["CICD_CACHE_DIR"]
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "cicd-python")
+
+
+class GitOpsCache:
+    """
+    On-disk cache of parsed GitOps configs keyed by the SHA-256 of the file content, the library version and the
+    schema hash of the models, so entries pickled from another layout of the models are never loaded.
+
+    Entries are pickles of already validated GitOps objects, so a hit skips both the YAML parse and from_dict. The
+    cache directory must only be writable by trusted users, as loading an entry unpickles it. When the entries
+    exceed max_bytes the least recently used ones are evicted; a hit refreshes the entry's modification time.
+
+    The directory is scanned on the first write, then the size of the entries is tracked, so it is only scanned again
+    when the entries exceed max_bytes. Reuse one cache for many configs rather than one per file.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_directory()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(content: bytes) -> str:
+        digest = hashlib.sha256(__version__.encode())
+        digest.update(b"\0")
+        digest.update(schema_hash())
+        digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def load(self, path: str) -> GitOps:
+        """
+        Returns the parsed GitOps config of a YAML or JSON file, from the cache when its content was seen before.
+
+        :param path: Path of the gitops config file.
+        :return: The parsed GitOps config.
+        """
+        with open(path, 'rb') as file:
+            content = file.read()
+        return self.loads(content)
+
+    def loads(self, content: bytes) -> GitOps:
+        key = self.key(content)
+        gitops = self._read(key)
+        if gitops is not None:
+            self.hits += 1
+            return gitops
+
+        self.misses += 1
+        gitops = gitops_from_dict(load_yaml(content))
+        self._write(key, gitops)
+        return gitops
+
+    def clear(self) -> None:
+        for entry in self._entries():
+            self._remove(entry.path)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def _read(self, key: str) -> Optional[GitOps]:
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as file:
+                gitops = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated, of an unsupported pickle protocol or of incompatible models: drop it and parse again.
+            self._remove(entry_path)
+            return None
+        if not isinstance(gitops, GitOps):
+            self._remove(entry_path)
+            return None
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return gitops
+
+    def _write(self, key: str, gitops: GitOps) -> None:
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                pickle.dump(gitops, file, protocol=pickle.HIGHEST_PROTOCOL)
+                size = file.tell()
+            os.replace(temporary_path, self._entry_path(key))
+        except BaseException:
+            self._remove(temporary_path)
+            raise
+        if self._size is not None:
+            self._size += size
+        if self._size is None or self._size > self.max_bytes:
+            self._evict()
+
+    def _entries(self) -> list:
+        with os.scandir(self.directory) as entries:
+            return [entry for entry in entries if entry.name.endswith(CACHE_SUFFIX)]
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            total += stat.st_size
+        if total > self.max_bytes:
+            for _, size, entry_path in sorted(entries):
+                self._remove(entry_path)
+                total -= size
+                if total <= self.max_bytes * EVICT_TO:
+                    break
+        self._size = total
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -1,14 +1,20 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from dataclasses import dataclass, fields
-from typing import Any, List
+from dataclasses import dataclass, field, fields
+from functools import cached_property, lru_cache
+from typing import Any, Dict, Iterable, List, Tuple, TYPE_CHECKING
 
 from cicd.Abstracts import Abstract
-from cicd.Utils import from_str, to_class, from_bool, from_list, from_int, parse_dict_to_obj
+from cicd.Utils import from_str, to_class, from_bool, from_list, from_int, parse_dict_to_obj, expect_dict
 
+if TYPE_CHECKING:
+    from cicd.Diff import GitOpsDiff
+    from cicd.PromotionGraph import PromotionGraph
+    from cicd.TargetMatrix import TargetMatrix
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class AwsAccount:
     aws_account_id: int
     description: str
@@ -17,8 +23,7 @@ class AwsAccount:
 
     @staticmethod
     def from_dict(obj: Any) -> 'AwsAccount':
-        if not isinstance(obj, dict):
-            raise TypeError(f"Expected dictionary but got {type(obj).__name__}")
+        expect_dict(obj)
         try:
             aws_account_id = from_int(obj.get("aws_account_id"))
             description = from_str(obj.get("description"))
@@ -37,14 +42,13 @@ class AwsAccount:
         }
 
 
-@dataclass
 class EnvironmentPromotionPhases(Abstract):
-    def __init__(self, accounts: dict[str, AwsAccount]):
-        super().__init__(accounts)
+    __slots__ = ()
+    value_type = AwsAccount
 
     @staticmethod
     def from_dict(obj: Any) -> 'EnvironmentPromotionPhases':
-        assert isinstance(obj, dict)
+        expect_dict(obj)
         accounts_dict = {
             env_name: AwsAccount.from_dict(aws_account_config_data)
             for env_name, aws_account_config_data in obj.items()
@@ -55,12 +59,12 @@ class EnvironmentPromotionPhases(Abstract):
     def to_dict(self) -> dict:
         result: dict = {env_name: to_class(AwsAccount, aws_account_config_data)
                         for env_name, aws_account_config_data
-                        in self.__dict__.items()}
+                        in self.items()}
         return result
 
 
-@dataclass
-class Environment(Abstract):
+@dataclass(frozen=True, slots=True)
+class Environment:
     aws_region: str
     cluster: str
     environment: str
@@ -71,7 +75,7 @@ class Environment(Abstract):
 
     @staticmethod
     def from_dict(obj: Any) -> 'Environment':
-        assert isinstance(obj, dict)
+        expect_dict(obj)
         environment_config = {env_name: Environment.from_dict(environment_config_data)
                               for env_name, environment_config_data in obj.items()}
         result = Environments(environment_config)
@@ -90,9 +94,9 @@ class Environment(Abstract):
         return result
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EnvironmentWithRegion(Environment):
-    additional_aws_regions: List[Any]
+    additional_aws_regions: List[str]
 
     @staticmethod
     def from_dict(obj: Any) -> 'EnvironmentWithRegion':
@@ -101,7 +105,7 @@ class EnvironmentWithRegion(Environment):
             "cluster": from_str,
             "environment": from_str,
             "next_environment": from_str,
-            "additional_aws_regions": lambda x: from_list(lambda y: y, x),
+            "additional_aws_regions": lambda x: from_list(from_str, x),
             "approval_for_promotion": from_bool,
             "enabled": from_bool,
             "with_gate": from_bool
@@ -115,7 +119,7 @@ class EnvironmentWithRegion(Environment):
             "cluster": from_str(self.cluster),
             "environment": from_str(self.environment),
             "next_environment": from_str(self.next_environment),
-            "additional_aws_regions": from_list(lambda x: x, self.additional_aws_regions),
+            "additional_aws_regions": from_list(from_str, self.additional_aws_regions),
             "approval_for_promotion": from_bool(self.approval_for_promotion),
             "enabled": from_bool(self.enabled),
             "with_gate": from_bool(self.with_gate)
@@ -123,14 +127,13 @@ class EnvironmentWithRegion(Environment):
         return result
 
 
-@dataclass
 class Environments(Abstract):
-    def __init__(self, environment: dict[str, EnvironmentWithRegion]):
-        super().__init__(environment)
+    __slots__ = ()
+    value_type = EnvironmentWithRegion
 
     @staticmethod
     def from_dict(obj: Any) -> 'Environments':
-        assert isinstance(obj, dict)
+        expect_dict(obj)
         environment_config = {env_name: EnvironmentWithRegion.from_dict(environment_config_data)
                               for env_name, environment_config_data in obj.items()}
         result = Environments(environment_config)
@@ -140,19 +143,19 @@ class Environments(Abstract):
         result: dict = {
             env_name: to_class(EnvironmentWithRegion, environment_config_data)
             for env_name, environment_config_data
-            in self.__dict__.items()
+            in self.items()
         }
         return result
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PathConfiguration:
-    has_modifications: bool
+    has_modifications: bool = field(metadata={"alias": "hasModifications", "default": False})
     paths: List[str]
 
     @staticmethod
     def from_dict(obj: Any) -> 'PathConfiguration':
-        assert isinstance(obj, dict)
+        expect_dict(obj)
         has_modifications = from_bool(obj.get("hasModifications", False))
         paths = from_list(from_str, obj.get("paths"))
         return PathConfiguration(has_modifications, paths)
@@ -162,14 +165,21 @@ class PathConfiguration:
         return result
 
 
-@dataclass
 class PathMonitor(Abstract):
-    def __init__(self, paths: dict[str, PathConfiguration]):
-        super().__init__(paths)
+    __slots__ = ()
+    value_type = PathConfiguration
+
+    def with_changes(self, paths: Iterable[str]) -> 'PathMonitor':
+        """
+        :param paths: Changed file paths, e.g. the output of `git diff --name-only`.
+        :return: A copy with has_modifications set on every group, True where a path matches one of its patterns.
+        """
+        from cicd.PathMatcher import PathMatcher
+        return PathMatcher(self).apply(paths)
 
     @staticmethod
     def from_dict(obj: Any) -> 'PathMonitor':
-        assert isinstance(obj, dict)
+        expect_dict(obj)
         path_config = {path: PathConfiguration.from_dict(path_monitor_config_data)
                        for path, path_monitor_config_data in obj.items()}
         result = PathMonitor(path_config)
@@ -179,21 +189,23 @@ class PathMonitor(Abstract):
         result: dict = {
             path: to_class(PathConfiguration, path_config_data)
             for path, path_config_data
-            in self.__dict__.items()
+            in self.items()
         }
         return result
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SlackChannel:
-    channel_id: str
-    channel_name: str
+    channel_id: str = field(metadata={"alias": "id"})
+    channel_name: str = field(metadata={"alias": "name"})
 
     @staticmethod
-    def from_dict(obj: Any) -> 'SlackChannel':
-        assert isinstance(obj, dict)
+    def from_dict(obj: Any, pool: 'SlackChannelPool' = None) -> 'SlackChannel':
+        expect_dict(obj)
         channel_id = from_str(obj.get("id"))
         channel_name = from_str(obj.get("name"))
+        if pool is not None:
+            return pool.intern(channel_id, channel_name)
         return SlackChannel(channel_id, channel_name)
 
     def to_dict(self) -> dict:
@@ -201,16 +213,43 @@ class SlackChannel:
         return result
 
 
-@dataclass
+class SlackChannelPool:
+    """
+    Shares one SlackChannel instance per (id, name). The same channels are repeated in every environment of a config
+    (through YAML anchors) and across the services of a fleet; pass one pool to every GitOps.from_dict call to
+    intern them fleet-wide.
+    """
+
+    __slots__ = ("_channels",)
+
+    def __init__(self):
+        self._channels: dict[Tuple[str, str], SlackChannel] = {}
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def intern(self, channel_id: str, channel_name: str) -> SlackChannel:
+        key = (channel_id, channel_name)
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = self._channels.setdefault(key, SlackChannel(channel_id, channel_name))
+        return channel
+
+
+DEFAULT_SLACK_CHANNELS = "default"
+SLACK_CHANNEL_KINDS = ("cd", "ci")
+
+
+@dataclass(frozen=True, slots=True)
 class SlackEnvironmentChannels:
     cd: List[SlackChannel]
     ci: List[SlackChannel]
 
     @staticmethod
-    def from_dict(obj: Any) -> 'SlackEnvironmentChannels':
-        assert isinstance(obj, dict)
-        cd = from_list(SlackChannel.from_dict, obj.get("cd"))
-        ci = from_list(SlackChannel.from_dict, obj.get("ci"))
+    def from_dict(obj: Any, pool: SlackChannelPool = None) -> 'SlackEnvironmentChannels':
+        expect_dict(obj)
+        cd = from_list(lambda x: SlackChannel.from_dict(x, pool), obj.get("cd"))
+        ci = from_list(lambda x: SlackChannel.from_dict(x, pool), obj.get("ci"))
         return SlackEnvironmentChannels(cd, ci)
 
     def to_dict(self) -> dict:
@@ -221,22 +260,49 @@ class SlackEnvironmentChannels:
         return result
 
 
-@dataclass
 class SlackChannels(Abstract):
-    def __init__(self, slack_channels: dict[str, SlackChannel]) -> None:
+    __slots__ = ("_resolved",)
+    value_type = SlackEnvironmentChannels
+
+    def __init__(self, slack_channels: dict[str, SlackEnvironmentChannels] = None):
         super().__init__(slack_channels)
+        self._resolved: dict[Tuple[str, str], Tuple[SlackChannel, ...]] | None = None
+
+    def resolve(self, environment: str, kind: str) -> Tuple[SlackChannel, ...]:
+        """
+        Returns the recipients of an environment: the default channels followed by the environment's own, without
+        duplicates. Results are memoized per instance.
+
+        :param environment: The environment name. Environments without their own entry only get the default channels.
+        :param kind: Either "cd" or "ci".
+        :return: The merged channels, in order.
+        """
+        key = (environment, kind)
+        if self._resolved is None:
+            self._resolved = {}
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            if kind not in SLACK_CHANNEL_KINDS:
+                raise ValueError(f"Unknown Slack channel kind '{kind}', expected one of {SLACK_CHANNEL_KINDS}")
+            channels = []
+            for scope in (DEFAULT_SLACK_CHANNELS, environment):
+                if scope in self:
+                    channels.extend(getattr(self[scope], kind))
+            resolved = self._resolved.setdefault(key, tuple(dict.fromkeys(channels)))
+        return resolved
 
     @staticmethod
-    def from_dict(obj: Any) -> 'SlackEnvironmentChannels':
-        assert isinstance(obj, dict)
-        channel_configs = {channel: SlackEnvironmentChannels.from_dict(channel_data)
+    def from_dict(obj: Any, pool: SlackChannelPool = None) -> 'SlackChannels':
+        expect_dict(obj)
+        pool = SlackChannelPool() if pool is None else pool
+        channel_configs = {channel: SlackEnvironmentChannels.from_dict(channel_data, pool)
                            for channel, channel_data in obj.items()}
         result = SlackChannels(channel_configs)
         return result
 
     def to_dict(self) -> dict:
         result: dict = {}
-        for channel, channel_data in self.__dict__.items():
+        for channel, channel_data in self.items():
             channel_class = to_class(SlackEnvironmentChannels, channel_data)
             result.update({channel: channel_class})
         return result
@@ -248,19 +314,22 @@ class SlackConfig:
     channels: SlackChannels
 
     @staticmethod
-    def from_dict(obj: Any) -> 'SlackConfig':
-        assert isinstance(obj, dict)
+    def from_dict(obj: Any, pool: SlackChannelPool = None) -> 'SlackConfig':
+        expect_dict(obj)
         url = from_str(obj.get("url"))
-        channels = SlackChannels.from_dict(obj.get("channels"))
+        channels = SlackChannels.from_dict(obj.get("channels"), pool)
         return SlackConfig(url, channels)
 
     def to_dict(self) -> dict:
         result: dict = {"url": from_str(self.url), "channels": to_class(SlackChannels, self.channels)}
         return result
 
+    def resolve(self, environment: str, kind: str) -> Tuple[SlackChannel, ...]:
+        return self.channels.resolve(environment, kind)
 
-@dataclass
-class ApplicationConfig(Abstract):
+
+@dataclass(frozen=True)
+class ApplicationConfig:
     app_of_apps: str
     app_of_apps_service_name: str
     app_repo: str
@@ -273,8 +342,24 @@ class ApplicationConfig(Abstract):
     name: str
     service: str
 
+    def to_dict(self) -> dict:
+        result: dict = {
+            "app_of_apps": from_str(self.app_of_apps),
+            "app_of_apps_service_name": from_str(self.app_of_apps_service_name),
+            "app_repo": from_str(self.app_repo),
+            "dockerfile": from_str(self.dockerfile),
+            "ecr_repository_name": from_str(self.ecr_repository_name),
+            "enable_tests": from_bool(self.enable_tests),
+            "helm_chart_repo": from_str(self.helm_chart_repo),
+            "helm_chart_service_name": from_str(self.helm_chart_service_name),
+            "is_mono_repo": from_bool(self.is_mono_repo),
+            "name": from_str(self.name),
+            "service": from_str(self.service)
+        }
+        return result
 
-@dataclass
+
+@dataclass(frozen=True)
 class GitOps(ApplicationConfig):
     environment_promotion_phases: EnvironmentPromotionPhases
     environments: Environments
@@ -282,8 +367,15 @@ class GitOps(ApplicationConfig):
     slack: SlackConfig
 
     @staticmethod
-    def from_dict(obj: Any) -> 'GitOps':
-        assert isinstance(obj, dict)
+    def from_dict(obj: Any, slack_channel_pool: SlackChannelPool = None, lazy: bool = False) -> 'GitOps':
+        """
+        :param obj: The raw dictionary, e.g. loaded from gitops.yaml.
+        :param slack_channel_pool: Optional pool to intern the Slack channels into, shared by many configs.
+        :param lazy: When True, only the application fields are parsed now; each section is parsed and checked on
+        first access instead, and the LazyGitOps takes ownership of the section dictionaries of obj.
+        :return: The GitOps config.
+        """
+        expect_dict(obj)
         app_of_apps = from_str(obj.get("app_of_apps"))
         app_of_apps_service_name = from_str(obj.get("app_of_apps_service_name"))
         app_repo = from_str(obj.get("app_repo"))
@@ -295,10 +387,15 @@ class GitOps(ApplicationConfig):
         is_mono_repo = from_bool(obj.get("is_mono_repo"))
         name = from_str(obj.get("name"))
         service = from_str(obj.get("service"))
+        if lazy:
+            return LazyGitOps.from_sections((app_of_apps, app_of_apps_service_name, app_repo, dockerfile,
+                                             ecr_repository_name, enable_tests, helm_chart_repo,
+                                             helm_chart_service_name, is_mono_repo, name, service),
+                                            obj, slack_channel_pool)
         environment_promotion_phases = EnvironmentPromotionPhases.from_dict(obj.get("environment_promotion_phases"))
         environments = Environments.from_dict(obj.get("environments"))
         path_monitor = PathMonitor.from_dict(obj.get("path_monitor"))
-        slack = SlackConfig.from_dict(obj.get("slack"))
+        slack = SlackConfig.from_dict(obj.get("slack"), slack_channel_pool)
         return GitOps(app_of_apps, app_of_apps_service_name, app_repo, dockerfile, ecr_repository_name, enable_tests,
                       helm_chart_repo, helm_chart_service_name, is_mono_repo, name, service,
                       environment_promotion_phases, environments, path_monitor, slack)
@@ -323,31 +420,211 @@ class GitOps(ApplicationConfig):
         }
         return result
 
+    @cached_property
+    def promotion_graph(self) -> 'PromotionGraph':
+        """
+        The promotion order of the environments joined with their AWS accounts, built on first access.
+
+        :raises PromotionGraphError: When a next_environment or promotion phase is dangling, or there is a cycle.
+        """
+        from cicd.PromotionGraph import PromotionGraph
+        return PromotionGraph.from_gitops(self)
+
+    @cached_property
+    def section_fingerprints(self) -> Dict[str, str]:
+        """
+        Content fingerprints of the application fields and of each section, independent of key order; see
+        cicd.Fingerprint.
+        """
+        from cicd.Fingerprint import section_fingerprints
+        return section_fingerprints(self)
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """
+        Content fingerprint of the whole config, combined from section_fingerprints.
+        """
+        from cicd.Fingerprint import combine
+        return combine(self.section_fingerprints)
+
+    @cached_property
+    def target_matrix(self) -> 'TargetMatrix':
+        """
+        The deployment targets of the enabled environments, one per region, built on first access.
+        """
+        from cicd.TargetMatrix import TargetMatrix
+        return TargetMatrix(self)
 
-@dataclass
+    @staticmethod
+    def diff(old: 'GitOps', new: 'GitOps') -> 'GitOpsDiff':
+        from cicd.Diff import diff
+        return diff(old, new)
+
+    def rebuild(self, obj: Any) -> 'GitOps':
+        """
+        Parses a new revision of this config, reusing the subtrees that did not change.
+
+        :param obj: The raw dictionary of the new revision.
+        :return: The new GitOps config.
+        """
+        from cicd.Diff import rebuild
+        return rebuild(self, obj)
+
+    def lookup(self, key: str) -> Any:
+        """
+        :param key: A dotted path in the serialized config, e.g. environments.prod.cluster or
+        slack.channels.dev.cd[0].id.
+        :return: The serialized value at the path. Only the section the path starts with is serialized, so on a lazy
+        config only that section is parsed.
+        :raises KeyError: When there is no value at the path.
+        """
+        first, *rest = key.replace("[", ".").replace("]", "").split(".")
+        if first not in self.__dataclass_fields__:
+            raise KeyError(key)
+        value = getattr(self, first)
+        if hasattr(value, "to_dict"):
+            value = value.to_dict()
+        for part in rest:
+            try:
+                value = value[int(part)] if isinstance(value, list) else value[part]
+            except (KeyError, IndexError, TypeError, ValueError):
+                raise KeyError(key) from None
+        return value
+
+    def to_bytes(self) -> bytes:
+        """
+        :return: A compact, versioned binary snapshot of this config (see cicd.Snapshot).
+        """
+        from cicd.Snapshot import to_bytes
+        return to_bytes(self)
+
+    @staticmethod
+    def from_bytes(buffer: Any, slack_channel_pool: SlackChannelPool = None) -> 'GitOps':
+        """
+        Loads a snapshot written by to_bytes without validating it again.
+
+        :param buffer: bytes, or a memoryview over a memory-mapped file.
+        :param slack_channel_pool: Optional pool to intern the Slack channels into.
+        :return: The GitOps config.
+        :raises SnapshotError: When the snapshot has another format version or model layout.
+        """
+        from cicd.Snapshot import from_bytes
+        return from_bytes(buffer, slack_channel_pool)
+
+
+class LazyGitOps(GitOps):
+    """
+    GitOps config whose sections are parsed on first access, created by GitOps.from_dict(obj, lazy=True).
+
+    The application fields are parsed up front. environment_promotion_phases, environments, path_monitor and slack
+    keep their raw dictionaries until they are read; each is then parsed and checked with the same from_dict as in
+    eager mode, so a malformed section raises its TypeError on first access rather than from from_dict. Parsed
+    sections are cached on the instance. A LazyGitOps compares equal to the eager GitOps of the same data.
+
+    The section dictionaries are not copied: from_dict passes their ownership to the LazyGitOps, and the caller must
+    not modify them afterwards, as changes would show in the sections not parsed yet. Replacing a top-level key of
+    the dictionary given to from_dict does not affect it.
+    """
+
+    @classmethod
+    def from_sections(cls, application_values: Tuple, obj: dict,
+                      slack_channel_pool: SlackChannelPool = None) -> 'LazyGitOps':
+        result = object.__new__(cls)
+        result.__dict__.update(zip(_APPLICATION_FIELDS, application_values))
+        result.__dict__["_raw_sections"] = {name: obj.get(name) for name in _SECTION_FIELDS}
+        result.__dict__["_slack_channel_pool"] = slack_channel_pool
+        return result
+
+    @cached_property
+    def environment_promotion_phases(self) -> EnvironmentPromotionPhases:
+        return EnvironmentPromotionPhases.from_dict(self._raw_sections.get("environment_promotion_phases"))
+
+    @cached_property
+    def environments(self) -> Environments:
+        return Environments.from_dict(self._raw_sections.get("environments"))
+
+    @cached_property
+    def path_monitor(self) -> PathMonitor:
+        return PathMonitor.from_dict(self._raw_sections.get("path_monitor"))
+
+    @cached_property
+    def slack(self) -> SlackConfig:
+        return SlackConfig.from_dict(self._raw_sections.get("slack"), self._slack_channel_pool)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, GitOps):
+            return NotImplemented
+        return all(getattr(self, attr.name) == getattr(other, attr.name) for attr in fields(GitOps))
+
+    # Unhashable, like GitOps itself: its sections are mappings.
+    __hash__ = None
+
+
+_APPLICATION_FIELDS = tuple(attr.name for attr in fields(ApplicationConfig))
+_SECTION_FIELDS = tuple(attr.name for attr in fields(GitOps) if attr.name not in _APPLICATION_FIELDS)
+
+
+@dataclass(frozen=True)
 class Manifest(ApplicationConfig, Environment):
     @classmethod
     def from_gitops(cls, gitops: GitOps, environment_name: str = 'dev') -> 'Manifest':
-        manifest_fields: list[str] = sorted(list(cls.__dataclass_fields__.keys()))
-        environment_with_region: EnvironmentWithRegion = getattr(gitops.environments, environment_name)
-        temp_environment_fields: list[str] = sorted([attr.name for attr in fields(environment_with_region)])
-        environment_fields: list[str] = sorted(list(set(temp_environment_fields).intersection(manifest_fields)))
+        environment_with_region: EnvironmentWithRegion = gitops.environments[environment_name]
+        environment_fields, application_fields = cls._split_fields(type(environment_with_region))
+        return cls._build(cls._values(gitops, application_fields), environment_with_region, environment_fields)
 
-        processed_fields: list[str] = []
-        for attr in environment_fields:
-            setattr(cls, attr, getattr(environment_with_region, attr))
-            processed_fields.append(attr)
+    @classmethod
+    def all_from_gitops(cls, gitops: GitOps, enabled_only: bool = True) -> dict[str, 'Manifest']:
+        """
+        Builds the manifest of every environment of a GitOps config in one pass.
+
+        :param gitops: The parsed GitOps config.
+        :param enabled_only: When True (the default), environments that are not enabled are skipped.
+        :return: A dictionary of manifests keyed by environment name, in the order of gitops.environments.
+        """
+        result: dict[str, Manifest] = {}
+        application_values: dict | None = None
+        for environment_name, environment_with_region in gitops.environments.items():
+            if enabled_only and not environment_with_region.enabled:
+                continue
+            environment_fields, application_fields = cls._split_fields(type(environment_with_region))
+            if application_values is None:
+                application_values = cls._values(gitops, application_fields)
+            result[environment_name] = cls._build(application_values, environment_with_region, environment_fields)
+        return result
 
-        application_fields = sorted(list(set(manifest_fields).difference(processed_fields)))
-        manifest_fields = sorted(list(set(manifest_fields).intersection(application_fields)))
-        for attr in manifest_fields:
-            setattr(cls, attr, getattr(gitops, attr))
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _split_fields(cls, environment_class: type) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        manifest_fields: list[str] = sorted(cls.__dataclass_fields__.keys())
+        environment_fields = sorted(set(attr.name for attr in fields(environment_class)).intersection(manifest_fields))
+        application_fields = sorted(set(manifest_fields).difference(environment_fields))
+        return tuple(environment_fields), tuple(application_fields)
+
+    @staticmethod
+    def _values(obj: Any, names: Tuple[str, ...]) -> dict:
+        return {attr: getattr(obj, attr) for attr in names}
+
+    @classmethod
+    def _build(cls, application_values: dict, environment_with_region: EnvironmentWithRegion,
+               environment_fields: Tuple[str, ...]) -> 'Manifest':
+        return cls(**application_values, **cls._values(environment_with_region, environment_fields))
+
+    def to_dict(self) -> dict:
+        result: dict = ApplicationConfig.to_dict(self)
+        result.update(Environment.to_dict(self))
+        return result
 
-        return cls
+    @cached_property
+    def fingerprint(self) -> str:
+        """
+        Content fingerprint of the manifest, independent of key order; see cicd.Fingerprint.
+        """
+        from cicd.Fingerprint import fingerprint
+        return fingerprint(self)
 
 
-def gitops_from_dict(s: Any) -> GitOps:
-    return GitOps.from_dict(s)
+def gitops_from_dict(s: Any, slack_channel_pool: SlackChannelPool = None, lazy: bool = False) -> GitOps:
+    return GitOps.from_dict(s, slack_channel_pool, lazy)
 
 
 def gitops_to_dict(x: GitOps) -> Any:
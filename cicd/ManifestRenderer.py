@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+from typing import IO, Iterable, Iterator, Optional, Sequence
+
+from cicd.GitOpsDataClasses import GitOps, Manifest
+from cicd.Profiling import current
+from cicd.YamlIO import dump_yaml_all
+
+RENDER_FORMATS = ("yaml", "jsonl")
+
+
+def iter_manifests(configs: Iterable[GitOps], environments: Optional[Sequence[str]] = None,
+                   enabled_only: bool = True) -> Iterator[Manifest]:
+    """
+    :param configs: The GitOps configs, consumed lazily.
+    :param environments: Only render these environments. Defaults to every environment of each config; configs
+    without one of the given environments are skipped for it.
+    :param enabled_only: When True (the default), environments that are not enabled are skipped.
+    :return: One Manifest per service and environment, in the order of the configs and their environments.
+    """
+    for gitops in configs:
+        if environments is None:
+            yield from Manifest.all_from_gitops(gitops, enabled_only).values()
+            continue
+        for name in environments:
+            environment = gitops.environments.get(name)
+            if environment is not None and (environment.enabled or not enabled_only):
+                yield Manifest.from_gitops(gitops, name)
+
+
+def render_manifests(configs: Iterable[GitOps], stream: IO, output_format: str = "yaml",
+                     environments: Optional[Sequence[str]] = None, enabled_only: bool = True) -> int:
+    """
+    Streams the manifests of many configs as a multi-document YAML stream ("---" before every document) or as JSON
+    Lines. Each manifest is written as soon as it is built, so memory stays bounded by a single config no matter how
+    many configs are rendered, and the output can be piped to kubectl or Argo CD tooling directly.
+
+    :param configs: The GitOps configs, e.g. a generator parsing files one at a time.
+    :param stream: The open text file to write to.
+    :param output_format: "yaml" or "jsonl".
+    :param environments: Only render these environments; see iter_manifests.
+    :param enabled_only: When True (the default), environments that are not enabled are skipped.
+    :return: The number of manifests written.
+    """
+    if output_format not in RENDER_FORMATS:
+        raise ValueError(f"Unknown render format '{output_format}', expected one of {RENDER_FORMATS}")
+    written = 0
+    documents = (manifest.to_dict() for manifest in iter_manifests(configs, environments, enabled_only))
+    with current().span("render.manifests"):
+        if output_format == "yaml":
+            def counted(items):
+                nonlocal written
+                for item in items:
+                    written += 1
+                    yield item
+
+            dump_yaml_all(counted(documents), stream, explicit_start=True)
+        else:
+            encode = json.JSONEncoder(separators=(",", ":")).encode
+            for document in documents:
+                stream.write(encode(document) + "\n")
+                written += 1
+    current().count("render.manifests", written)
+    return written
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from cicd.GitOpsDataClasses import PathMonitor
+
+# A path matches a pattern when the pattern matches at its start (re.match), like `grep -E "^pattern"`.
+
+_ANY = object()  # trie edge for an unescaped "." in a literal prefix
+_METACHARACTERS = set(".^$*+?{}[]|()\\")
+_QUANTIFIERS = set("*+?{")
+
+
+def literal_prefix(pattern: str) -> Tuple[list, str]:
+    """
+    Splits a regex into the prefix made of literal characters and bare "." wildcards, and the remaining regex.
+
+    :param pattern: The path pattern, e.g. "roicalc/.*".
+    :return: The prefix atoms (characters, or _ANY for ".") and the rest of the pattern, e.g. (["r", ..., "/"], ".*").
+    """
+    if "|" in pattern:
+        return [], pattern
+    atoms: list = []
+    index = 1 if pattern.startswith("^") else 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\" and index + 1 < len(pattern) and not pattern[index + 1].isalnum():
+            atom, width = pattern[index + 1], 2
+        elif char == ".":
+            atom, width = _ANY, 1
+        elif char in _METACHARACTERS:
+            break
+        else:
+            atom, width = char, 1
+        if index + width < len(pattern) and pattern[index + width] in _QUANTIFIERS:
+            break
+        atoms.append(atom)
+        index += width
+    return atoms, pattern[index:]
+
+
+class _Node:
+    __slots__ = ("children", "any", "groups", "checks")
+
+    def __init__(self):
+        self.children: Dict[str, _Node] = {}
+        self.any: Optional[_Node] = None
+        self.groups: set = set()  # groups matched by any path reaching this node
+        self.checks: List[Tuple[str, re.Pattern]] = []  # groups whose remaining regex must be evaluated
+
+
+class PathMatcher:
+    """
+    Matches changed paths against every pattern of a PathMonitor in one pass.
+
+    The literal prefixes of all patterns are compiled into a single trie, with "." as a wildcard edge. Patterns such
+    as "roicalc/.*" or ".github/workflows/cicd.yaml" are decided by the trie walk alone; the full regex is only run
+    for patterns with more complex suffixes, and only on paths that already matched their prefix. Matching stops
+    once every group has matched, so large change lists are usually not consumed in full.
+    """
+
+    def __init__(self, path_monitor: PathMonitor):
+        self.path_monitor = path_monitor
+        self.root = _Node()
+        for group, configuration in path_monitor.items():
+            for pattern in configuration.paths:
+                self.add(group, pattern)
+
+    def add(self, group: str, pattern: str) -> None:
+        atoms, rest = literal_prefix(pattern)
+        node = self.root
+        for atom in atoms:
+            if atom is _ANY:
+                node.any = node.any or _Node()
+                node = node.any
+            else:
+                node = node.children.setdefault(atom, _Node())
+        if rest in ("", ".*"):
+            node.groups.add(group)
+        else:
+            node.checks.append((group, re.compile(pattern)))
+
+    def groups_for(self, path: str) -> set:
+        """
+        :param path: A changed file path.
+        :return: The names of the groups with at least one pattern matching the path.
+        """
+        matched = set()
+        nodes = [self.root]
+        position = 0
+        while nodes:
+            following = []
+            for node in nodes:
+                matched.update(node.groups)
+                for group, regex in node.checks:
+                    if group not in matched and regex.match(path):
+                        matched.add(group)
+                if position < len(path):
+                    child = node.children.get(path[position])
+                    if child is not None:
+                        following.append(child)
+                    if node.any is not None and path[position] != "\n":
+                        following.append(node.any)
+            nodes = following
+            position += 1
+        return matched
+
+    def matched_groups(self, paths: Iterable[str]) -> set:
+        """
+        :param paths: Changed file paths, e.g. the lines of `git diff --name-only`. Consumed lazily.
+        :return: The names of the groups with at least one matching path.
+        """
+        pending = len(self.path_monitor)
+        matched = set()
+        for path in paths:
+            path = path.rstrip("\r\n")
+            if not path:
+                continue
+            new = self.groups_for(path) - matched
+            if new:
+                matched |= new
+                if len(matched) == pending:
+                    break
+        return matched
+
+    def apply(self, paths: Iterable[str]) -> PathMonitor:
+        """
+        :param paths: Changed file paths, consumed lazily.
+        :return: A new PathMonitor with has_modifications set on every group: True when one of its patterns matched.
+        """
+        return self.with_modifications(self.matched_groups(paths))
+
+    def with_modifications(self, matched: set) -> PathMonitor:
+        return type(self.path_monitor)({
+            group: configuration if configuration.has_modifications == (group in matched)
+            else replace(configuration, has_modifications=group in matched)
+            for group, configuration in self.path_monitor.items()
+        })
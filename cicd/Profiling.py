@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import contextlib
+import contextvars
+import functools
+import json
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+
+class SpanStats:
+    """
+    Aggregated timings of one span name. peak_bytes is the highest tracemalloc traced memory seen while a span of
+    that name was open.
+    """
+
+    __slots__ = ("count", "total_ns", "min_ns", "max_ns", "peak_bytes")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns = 0
+        self.peak_bytes: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        result: dict = {
+            "count": self.count,
+            "total_ms": round(self.total_ns / 1e6, 3),
+            "mean_ms": round(self.total_ns / self.count / 1e6, 3) if self.count else 0.0,
+            "min_ms": round((self.min_ns or 0) / 1e6, 3),
+            "max_ms": round(self.max_ns / 1e6, 3),
+        }
+        if self.peak_bytes is not None:
+            result["peak_memory_bytes"] = self.peak_bytes
+        return result
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "started", "child_peak")
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.child_peak = 0
+
+    def __enter__(self) -> '_Span':
+        if self.profiler.trace_memory:
+            stack = self.profiler._stack
+            if stack:
+                # The peak is reset for this span, so the enclosing span keeps its own peak so far.
+                stack[-1].child_peak = max(stack[-1].child_peak, tracemalloc.get_traced_memory()[1])
+            stack.append(self)
+            tracemalloc.reset_peak()
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter_ns() - self.started
+        peak = None
+        if self.profiler.trace_memory:
+            # reset_peak is shared by nested spans, so children report their peaks to the enclosing span.
+            peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            stack = self.profiler._stack
+            stack.pop()
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+        self.profiler._record(self.name, elapsed, peak)
+
+
+class Profiler:
+    """
+    Collects timing spans, counters and, optionally, tracemalloc peak memory per span.
+
+        profiler = Profiler(trace_memory=True)
+        with activate(profiler):
+            with current().span("yaml.load"):
+                ...
+        profiler.write("profile.json")
+
+    Instrumented code calls current(), which returns NULL_PROFILER when no profiler is active, so disabled
+    profiling costs one context variable lookup and an empty context manager per span.
+    """
+
+    enabled = True
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.spans: Dict[str, SpanStats] = {}
+        self.counters: Dict[str, int] = {}
+        self._stack: List[_Span] = []
+        self._started = time.perf_counter_ns()
+        self._started_tracemalloc = False
+
+    def span(self, name: str) -> _Span:
+        return _Span(self, name)
+
+    def count(self, name: str, increment: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + increment
+
+    def start(self) -> None:
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop(self) -> None:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _record(self, name: str, elapsed: int, peak: Optional[int]) -> None:
+        stats = self.spans.get(name)
+        if stats is None:
+            stats = self.spans[name] = SpanStats()
+        stats.count += 1
+        stats.total_ns += elapsed
+        stats.min_ns = elapsed if stats.min_ns is None else min(stats.min_ns, elapsed)
+        stats.max_ns = max(stats.max_ns, elapsed)
+        if peak is not None:
+            stats.peak_bytes = max(stats.peak_bytes or 0, peak)
+
+    def report(self) -> dict:
+        return {
+            "wall_ms": round((time.perf_counter_ns() - self._started) / 1e6, 3),
+            "trace_memory": self.trace_memory,
+            "spans": {name: stats.to_dict() for name, stats in self.spans.items()},
+            "counters": dict(self.counters),
+        }
+
+    def write(self, path: str) -> None:
+        with open(path, 'w') as file:
+            json.dump(self.report(), file, indent=2)
+            file.write("\n")
+
+
+class NullProfiler:
+    enabled = False
+    trace_memory = False
+    _span = contextlib.nullcontext()
+
+    def span(self, name: str) -> contextlib.nullcontext:
+        return self._span
+
+    def count(self, name: str, increment: int = 1) -> None:
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+_current: contextvars.ContextVar = contextvars.ContextVar("cicd_profiler", default=NULL_PROFILER)
+
+
+def current():
+    """
+    :return: The active profiler, or NULL_PROFILER when profiling is disabled.
+    """
+    return _current.get()
+
+
+def profiled(name: str) -> Callable:
+    """
+    :param name: The span name.
+    :return: A decorator recording every call of the decorated function as a span of the active profiler.
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with _current.get().span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextlib.contextmanager
+def activate(profiler: Profiler):
+    """
+    Makes a profiler the active one for the duration of the block, starting tracemalloc when it traces memory.
+
+    :param profiler: The profiler to activate.
+    """
+    token = _current.set(profiler)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _current.reset(token)
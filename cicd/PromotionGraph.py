@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from cicd.GitOpsDataClasses import AwsAccount, GitOps
+
+# next_environment values that end the promotion chain.
+TERMINAL_ENVIRONMENTS = frozenset(("", "None"))
+
+
+class PromotionGraphError(ValueError):
+    def __init__(self, problems: List[str]):
+        self.problems = problems
+        super().__init__("; ".join(problems))
+
+
+@dataclass(frozen=True)
+class PromotionGraph:
+    """
+    Promotion order of the environments of a GitOps config, joined with their AWS accounts.
+
+    Built once per config (see GitOps.promotion_graph); every lookup is a dictionary access. The mappings are plain
+    dictionaries so the graph stays picklable along with its GitOps; treat them as read-only.
+    """
+
+    order: Tuple[str, ...]
+    next_environments: Mapping[str, Optional[str]]
+    previous_environments: Mapping[str, Tuple[str, ...]]
+    accounts: Mapping[str, AwsAccount]
+    phases: Mapping[str, str]
+
+    @classmethod
+    def from_gitops(cls, gitops: GitOps) -> 'PromotionGraph':
+        """
+        :param gitops: The parsed GitOps config.
+        :return: The promotion graph of its environments.
+        :raises PromotionGraphError: Listing every dangling next_environment or promotion phase, every environment
+        claimed by two promotion phases, and the environments of a promotion cycle.
+        """
+        problems: List[str] = []
+        next_environments: Dict[str, Optional[str]] = {}
+        previous_environments: Dict[str, List[str]] = {name: [] for name in gitops.environments}
+        for name, environment in gitops.environments.items():
+            following = None if environment.next_environment in TERMINAL_ENVIRONMENTS else environment.next_environment
+            if following is not None and following not in previous_environments:
+                problems.append(f"environments.{name}.next_environment: unknown environment '{following}'")
+                following = None
+            next_environments[name] = following
+            if following is not None:
+                previous_environments[following].append(name)
+
+        accounts: Dict[str, AwsAccount] = {}
+        phases: Dict[str, str] = {}
+        for phase in sorted(gitops.environment_promotion_phases):
+            account = gitops.environment_promotion_phases[phase]
+            if account.environment not in previous_environments:
+                problems.append(f"environment_promotion_phases.{phase}.environment: "
+                                f"unknown environment '{account.environment}'")
+            elif account.environment in phases:
+                problems.append(f"environment_promotion_phases.{phase}.environment: '{account.environment}' is "
+                                f"already promoted by {phases[account.environment]}")
+            else:
+                accounts[account.environment] = account
+                phases[account.environment] = phase
+
+        order = cls._topological_order(next_environments, previous_environments)
+        if len(order) < len(next_environments):
+            ordered = set(order)
+            cycle = [name for name in next_environments if name not in ordered]
+            problems.append(f"environments: promotion cycle between {', '.join(cycle)}")
+        if problems:
+            raise PromotionGraphError(problems)
+
+        return cls(order=tuple(order),
+                   next_environments=next_environments,
+                   previous_environments={name: tuple(previous) for name, previous in previous_environments.items()},
+                   accounts=accounts,
+                   phases=phases)
+
+    @staticmethod
+    def _topological_order(next_environments: Dict[str, Optional[str]],
+                           previous_environments: Dict[str, List[str]]) -> List[str]:
+        # Kahn's algorithm; ties keep the order of the environments in the config.
+        remaining = {name: len(previous) for name, previous in previous_environments.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            following = next_environments[name]
+            if following is not None:
+                remaining[following] -= 1
+                if remaining[following] == 0:
+                    ready.append(following)
+        return order
+
+    def next(self, environment: str) -> Optional[str]:
+        return self.next_environments[environment]
+
+    def previous(self, environment: str) -> Tuple[str, ...]:
+        return self.previous_environments[environment]
+
+    def account(self, environment: str) -> Optional[AwsAccount]:
+        return self.accounts.get(environment)
+
+    def chain(self, environment: str) -> Tuple[str, ...]:
+        """
+        :param environment: The environment to start from.
+        :return: The environment followed by every environment it is promoted to, in order.
+        """
+        chain = [environment]
+        following = self.next_environments[environment]
+        while following is not None:
+            chain.append(following)
+            following = self.next_environments[following]
+        return tuple(chain)
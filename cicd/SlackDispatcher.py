@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import email.utils
+import json
+import math
+import ssl
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from cicd.GitOpsDataClasses import SlackChannel, SlackConfig
+
+SLACK_API_URL = "https://slack.com/api"
+POST_MESSAGE = "chat.postMessage"
+
+
+@dataclass(frozen=True)
+class Notification:
+    environment: str
+    kind: str  # "cd" or "ci", see SLACK_CHANNEL_KINDS
+    text: str
+
+
+@dataclass
+class Delivery:
+    """
+    Outcome of one chat.postMessage call, carrying one or more batched notifications to a channel.
+    """
+
+    channel: SlackChannel
+    messages: int
+    ok: bool = False
+    error: Optional[str] = None
+    attempts: int = 0
+
+
+def recipients(slack: SlackConfig, environment: str, kind: str) -> Tuple[SlackChannel, ...]:
+    """
+    :param slack: The Slack config of a service.
+    :param environment: The environment name.
+    :param kind: Either "cd" or "ci".
+    :return: The channels to notify, without duplicate channel IDs. Channels listed under several names, e.g. in the
+    default and the environment's own entry, are kept once, with their first name.
+    """
+    unique: Dict[str, SlackChannel] = {}
+    for channel in slack.resolve(environment, kind):
+        unique.setdefault(channel.channel_id, channel)
+    return tuple(unique.values())
+
+
+def workspace_api_url(slack: SlackConfig) -> str:
+    """
+    :param slack: The Slack config of a service.
+    :return: The Web API of its workspace, e.g. https://acme.slack.com/api for url https://acme.slack.com, or
+    SLACK_API_URL when the config has no url. Workspace domains serve the same API as slack.com.
+    """
+    return f"{slack.url.rstrip('/')}/api" if slack.url else SLACK_API_URL
+
+
+def retry_delay(retry_after: Optional[str], default: float) -> float:
+    """
+    :param retry_after: A Retry-After header, in seconds or as an HTTP date, if any.
+    :param default: The delay when the header is missing or cannot be parsed.
+    :return: The seconds to wait before retrying, never negative.
+    """
+    if retry_after is None:
+        return default
+    try:
+        delay = float(retry_after)
+    except ValueError:
+        try:
+            date = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return default
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        delay = (date - datetime.now(timezone.utc)).total_seconds()
+    return max(0.0, delay) if math.isfinite(delay) else default
+
+
+class RequestNotSent(OSError):
+    """
+    A request failed before any of it was sent, e.g. the connection could not be opened, so it can be retried
+    without the risk of posting a message twice.
+    """
+
+
+class _HttpResponse:
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class _ConnectionPool:
+    """
+    Minimal HTTP/1.1 client keeping up to `size` keep-alive connections to one host. Requests wait for an idle
+    connection, so the pool size also bounds the number of requests in flight. Idle connections the server has closed
+    are dropped before a request is written to them; a request that fails once written is not retried, as it may have
+    been processed.
+    """
+
+    def __init__(self, base_url: str, size: int, timeout: float):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.path = parts.path.rstrip("/")
+        self.host_header = parts.netloc
+        self.timeout = timeout
+        self.opened = 0
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(size)
+
+    async def request(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> _HttpResponse:
+        head = [f"{method} {self.path}/{path} HTTP/1.1", f"Host: {self.host_header}",
+                f"Content-Length: {len(body)}", "Connection: keep-alive"]
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        payload = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+        async with self._slots:
+            connection = self._take_idle()
+            if connection is None:
+                try:
+                    connection = await asyncio.wait_for(asyncio.open_connection(self.host, self.port, ssl=self.ssl),
+                                                        self.timeout)
+                except (OSError, asyncio.TimeoutError) as e:
+                    raise RequestNotSent(f"cannot connect to {self.host_header}: {type(e).__name__}: {e}") from e
+                self.opened += 1
+            reader, writer = connection
+            try:
+                writer.write(payload)
+                response, keep_alive = await asyncio.wait_for(self._read_response(reader), self.timeout)
+            except BaseException:
+                writer.close()
+                raise
+            if keep_alive:
+                self._idle.put_nowait(connection)
+            else:
+                writer.close()
+            return response
+
+    def _take_idle(self) -> Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]:
+        while not self._idle.empty():
+            reader, writer = self._idle.get_nowait()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()  # closed by the server while it was idle, e.g. after its keep-alive timeout
+        return None
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> Tuple[_HttpResponse, bool]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed before the response")
+        version, status = status_line.decode("latin-1").split(" ", 2)[:2]
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = bytearray()
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # trailers
+                    break
+                body += await reader.readexactly(size)
+                await reader.readexactly(2)
+        else:
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        return _HttpResponse(int(status), headers, bytes(body)), keep_alive
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            _, writer = self._idle.get_nowait()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+
+class SlackDispatcher:
+    """
+    Delivers notifications to the Slack channels of a service with chat.postMessage.
+
+    Recipients are resolved from SlackConfig.resolve and deduplicated by channel ID. Notifications going to the same
+    channel are batched into one message of up to batch_size lines. Messages are sent over a pool of keep-alive
+    connections with at most `concurrency` requests in flight. A 429 response pauses every request until its
+    Retry-After has passed, then the message is retried; 5xx responses and connections that cannot be opened are
+    retried with exponential backoff, up to max_retries times. A request that fails after it was sent, e.g. on a read
+    timeout, is reported and not retried, since Slack may have posted the message already.
+
+    Messages are posted to the Web API of the workspace at SlackConfig.url, unless api_url is given.
+
+        async with SlackDispatcher(gitops.slack, token) as dispatcher:
+            deliveries = await dispatcher.dispatch([Notification("prod", "cd", "devops 1.2.3 deployed")])
+    """
+
+    def __init__(self, slack: SlackConfig, token: str, api_url: Optional[str] = None, concurrency: int = 4,
+                 batch_size: int = 20, max_retries: int = 5, backoff: float = 0.5, timeout: float = 10.0):
+        self.slack = slack
+        self.token = token
+        self.api_url = api_url or workspace_api_url(slack)
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._pool: Optional[_ConnectionPool] = None
+        self._resume_at = 0.0
+
+    def batches(self, notifications: Iterable[Notification]) -> List[Tuple[SlackChannel, List[str]]]:
+        """
+        :param notifications: The notifications to deliver.
+        :return: The messages to post: each channel with up to batch_size notification texts, in order.
+        """
+        per_channel: Dict[str, Tuple[SlackChannel, List[str]]] = {}
+        for notification in notifications:
+            for channel in recipients(self.slack, notification.environment, notification.kind):
+                per_channel.setdefault(channel.channel_id, (channel, []))[1].append(notification.text)
+        return [(channel, texts[start:start + self.batch_size])
+                for channel, texts in per_channel.values()
+                for start in range(0, len(texts), self.batch_size)]
+
+    async def dispatch(self, notifications: Iterable[Notification]) -> List[Delivery]:
+        """
+        :param notifications: The notifications to deliver.
+        :return: One Delivery per message posted, in the order of batches(). Failures are reported, not raised.
+        """
+        if self._pool is None:
+            self._pool = _ConnectionPool(self.api_url, self.concurrency, self.timeout)
+        return list(await asyncio.gather(*(self._post(channel, texts)
+                                           for channel, texts in self.batches(notifications))))
+
+    async def _post(self, channel: SlackChannel, texts: List[str]) -> Delivery:
+        delivery = Delivery(channel, len(texts))
+        body = json.dumps({"channel": channel.channel_id, "text": "\n".join(texts)}).encode()
+        headers = {"Authorization": f"Bearer {self.token}", "Content-Type": "application/json; charset=utf-8"}
+        while True:
+            delay = self._resume_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            delivery.attempts += 1
+            backoff = self.backoff * 2 ** (delivery.attempts - 1)
+            try:
+                response = await self._pool.request("POST", POST_MESSAGE, headers, body)
+            except RequestNotSent as e:
+                delivery.error = str(e)
+                retry_after = backoff
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                # chat.postMessage is not idempotent: the message may have been posted, so it is not sent again.
+                delivery.error = f"{type(e).__name__}: {e}"
+                return delivery
+            else:
+                if response.status == 429:
+                    delivery.error = "rate limited"
+                    retry_after = retry_delay(response.headers.get("retry-after"), backoff)
+                    self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+                elif response.status >= 500:
+                    delivery.error = f"HTTP {response.status}"
+                    retry_after = backoff
+                else:
+                    return self._finish(delivery, response)
+            if delivery.attempts > self.max_retries:
+                return delivery
+            await asyncio.sleep(retry_after)
+
+    @staticmethod
+    def _finish(delivery: Delivery, response: _HttpResponse) -> Delivery:
+        try:
+            result = json.loads(response.body)
+        except ValueError:
+            result = {}
+        delivery.ok = response.status == 200 and result.get("ok") is True
+        delivery.error = None if delivery.ok else result.get("error") or f"HTTP {response.status}"
+        return delivery
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def __aenter__(self) -> 'SlackDispatcher':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+def dispatch(slack: SlackConfig, token: str, notifications: Iterable[Notification], **options) -> List[Delivery]:
+    """
+    Synchronous entry point: delivers the notifications with a SlackDispatcher in a new event loop.
+
+    :param slack: The Slack config of a service.
+    :param token: The Slack bot token.
+    :param notifications: The notifications to deliver.
+    :param options: SlackDispatcher options, e.g. concurrency or api_url.
+    :return: One Delivery per message posted.
+    """
+    async def run() -> List[Delivery]:
+        async with SlackDispatcher(slack, token, **options) as dispatcher:
+            return await dispatcher.dispatch(notifications)
+
+    return asyncio.run(run())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import contextlib
+import hashlib
+import marshal
+import mmap
+import os
+import struct
+import tempfile
+import typing
+from collections.abc import Mapping
+from dataclasses import fields, is_dataclass
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, Tuple, Union
+
+from cicd.Abstracts import Abstract
+from cicd.GitOpsDataClasses import GitOps, SlackChannel, SlackChannelPool
+
+# Snapshot: header (magic, format version, marshal version, schema hash, payload length) + marshal payload.
+SNAPSHOT_MAGIC = b"GOPS"
+SNAPSHOT_HEADER = struct.Struct("<4sHH8sI")
+# Bundle: header (magic, format version, record count, index offset) + snapshots + marshal index.
+BUNDLE_MAGIC = b"GOPB"
+BUNDLE_HEADER = struct.Struct("<4sHIQ")
+FORMAT_VERSION = 1
+MARSHAL_VERSION = 4
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and (issubclass(annotation, Abstract) or is_dataclass(annotation))
+
+
+@lru_cache(maxsize=None)
+def _codec(cls: type) -> Tuple[Callable, Callable]:
+    """
+    Compiles the encoder and decoder of a model, in the manner of cicd.Codecs. Dataclasses are encoded as tuples of
+    their field values in field order and containers as tuples of (key, value) pairs, so no field name is stored.
+    Decoding calls the constructors directly: snapshots are only written from parsed objects, so they are not
+    validated again.
+
+    :param cls: A dataclass or Abstract container class.
+    :return: The encode(obj) and decode(encoded, pool) functions.
+    """
+    namespace: dict = {"_cls": cls}
+
+    def nested(model: type) -> Tuple[str, str]:
+        encode, decode = _codec(model)
+        namespace[f"_encode_{model.__name__}"] = encode
+        namespace[f"_decode_{model.__name__}"] = decode
+        return f"_encode_{model.__name__}", f"_decode_{model.__name__}"
+
+    if issubclass(cls, Abstract):
+        encode, decode = nested(cls.value_type)
+        encoded = f"tuple([(_key, {encode}(_value)) for _key, _value in obj.items()])"
+        decoded = f"_cls({{_key: {decode}(_value, pool) for _key, _value in encoded}})"
+    elif cls is SlackChannel:
+        encoded = "(obj.channel_id, obj.channel_name)"
+        decoded = "pool.intern(encoded[0], encoded[1])"
+    else:
+        hints = typing.get_type_hints(cls)
+        encoded_fields = []
+        decoded_fields = []
+        for index, model_field in enumerate(fields(cls)):
+            annotation = hints[model_field.name]
+            item = (typing.get_args(annotation) or (Any,))[0] if typing.get_origin(annotation) is list else None
+            source = f"obj.{model_field.name}"
+            if _is_model(annotation):
+                encode, decode = nested(annotation)
+                encoded_fields.append(f"{encode}({source})")
+                decoded_fields.append(f"{decode}(encoded[{index}], pool)")
+            elif _is_model(item):
+                encode, decode = nested(item)
+                encoded_fields.append(f"tuple([{encode}(_item) for _item in {source}])")
+                decoded_fields.append(f"[{decode}(_item, pool) for _item in encoded[{index}]]")
+            else:
+                # Scalars and lists of scalars are stored as they are; marshal returns fresh lists.
+                encoded_fields.append(source)
+                decoded_fields.append(f"encoded[{index}]")
+        encoded = f"({', '.join(encoded_fields)},)"
+        decoded = f"_cls({', '.join(decoded_fields)})"
+
+    source = f"def encode(obj):\n    return {encoded}\n\ndef decode(encoded, pool):\n    return {decoded}\n"
+    exec(compile(source, f"<snapshot codec {cls.__qualname__}>", "exec"), namespace)
+    return namespace["encode"], namespace["decode"]
+
+
+@lru_cache(maxsize=None)
+def schema_hash() -> bytes:
+    """
+    :return: 8 bytes identifying the field layout of every model, so snapshots of an older layout are rejected.
+    """
+    described = set()
+    pending = [GitOps]
+    lines = []
+    while pending:
+        cls = pending.pop()
+        if cls in described:
+            continue
+        described.add(cls)
+        if issubclass(cls, Abstract):
+            lines.append(f"{cls.__name__}[{cls.value_type.__name__}]")
+            pending.append(cls.value_type)
+            continue
+        hints = typing.get_type_hints(cls)
+        lines.append(f"{cls.__name__}({','.join(f'{field.name}:{hints[field.name]}' for field in fields(cls))})")
+        for annotation in hints.values():
+            pending.extend(candidate for candidate in (annotation, *typing.get_args(annotation))
+                           if _is_model(candidate))
+    return hashlib.sha256("\n".join(sorted(lines)).encode()).digest()[:8]
+
+
+def to_bytes(gitops: GitOps) -> bytes:
+    """
+    :param gitops: The parsed GitOps config.
+    :return: Its versioned binary snapshot.
+    """
+    encode, _ = _codec(GitOps)
+    payload = marshal.dumps(encode(gitops), MARSHAL_VERSION)
+    return SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, FORMAT_VERSION, MARSHAL_VERSION, schema_hash(), len(payload)) + payload
+
+
+def from_bytes(buffer: Buffer, pool: SlackChannelPool = None) -> GitOps:
+    """
+    Loads a snapshot without validating it again. The buffer can be a memoryview over a memory-mapped file, in which
+    case the payload is decoded in place.
+
+    :param buffer: The snapshot, as returned by to_bytes.
+    :param pool: Optional pool to intern the Slack channels into. Defaults to one pool per snapshot.
+    :return: The GitOps config.
+    :raises SnapshotError: When the buffer is not a snapshot of this format version and model layout.
+    """
+    view = memoryview(buffer)
+    if len(view) < SNAPSHOT_HEADER.size:
+        raise SnapshotError("Truncated GitOps snapshot")
+    magic, version, marshal_version, schema, length = SNAPSHOT_HEADER.unpack_from(view)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("Not a GitOps snapshot")
+    if version != FORMAT_VERSION or marshal_version > marshal.version:
+        raise SnapshotError(f"Unsupported GitOps snapshot version {version}.{marshal_version}")
+    if schema != schema_hash():
+        raise SnapshotError("GitOps snapshot was written for a different model layout")
+    if len(view) < SNAPSHOT_HEADER.size + length:
+        raise SnapshotError("Truncated GitOps snapshot")
+    encoded = marshal.loads(view[SNAPSHOT_HEADER.size:SNAPSHOT_HEADER.size + length])
+    _, decode = _codec(GitOps)
+    return decode(encoded, SlackChannelPool() if pool is None else pool)
+
+
+def write_bundle(path: str, configs: Iterable[GitOps], key: Callable[[GitOps], str] = None) -> int:
+    """
+    Writes many configs to one bundle file with an offset index for random access.
+
+    :param path: The bundle file to write.
+    :param configs: The configs to store.
+    :param key: Returns the index key of a config. Defaults to its service name.
+    :return: The number of configs written.
+    :raises ValueError: When two configs have the same key; the bundle file is then left as it was.
+    """
+    key = key or (lambda gitops: gitops.service)
+    index = []
+    keys = set()
+    # A unique temporary file next to the bundle, so concurrent writers do not share it and os.replace stays on one
+    # file system. mkstemp creates it readable by its owner only; a bundle gets the usual permissions.
+    descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            os.fchmod(file.fileno(), 0o644)
+            file.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, FORMAT_VERSION, 0, 0))
+            for gitops in configs:
+                name = key(gitops)
+                if name in keys:
+                    raise ValueError(f"Duplicate bundle key '{name}': every config of a bundle needs a distinct key")
+                keys.add(name)
+                snapshot = to_bytes(gitops)
+                index.append((name, file.tell(), len(snapshot)))
+                file.write(snapshot)
+            index_offset = file.tell()
+            file.write(marshal.dumps(tuple(index), MARSHAL_VERSION))
+            file.seek(0)
+            file.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, FORMAT_VERSION, len(index), index_offset))
+        os.replace(temporary_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temporary_path)
+        raise
+    return len(index)
+
+
+class FleetBundle(Mapping):
+    """
+    Read-only, memory-mapped view of a bundle written by write_bundle. Only the index is loaded when opening it;
+    each config is decoded from the mapped file when it is looked up.
+
+        with FleetBundle("fleet.bundle") as bundle:
+            gitops = bundle["billing"]
+    """
+
+    def __init__(self, path: str, pool: SlackChannelPool = None):
+        self.pool = SlackChannelPool() if pool is None else pool
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        magic, version, count, index_offset = BUNDLE_HEADER.unpack_from(self._view)
+        if magic != BUNDLE_MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise SnapshotError(f"Not a version {FORMAT_VERSION} GitOps bundle: {path}")
+        self._index = {name: (offset, length) for name, offset, length in marshal.loads(self._view[index_offset:])}
+        if len(self._index) != count:
+            self.close()
+            raise SnapshotError(f"Corrupt GitOps bundle index: {path}")
+
+    def __getitem__(self, name: str) -> GitOps:
+        offset, length = self._index[name]
+        return from_bytes(self._view[offset:offset + length], self.pool)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'FleetBundle':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
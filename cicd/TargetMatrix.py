@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from cicd.GitOpsDataClasses import GitOps, Manifest
+from cicd.Profiling import current
+
+
+@dataclass(frozen=True, slots=True)
+class DeploymentTarget:
+    """
+    One deployment of a service: an environment in one of its regions.
+    """
+
+    service: str
+    environment: str
+    aws_region: str
+    cluster: str
+    primary: bool  # aws_region is the environment's own region, not one of its additional_aws_regions
+
+    def to_dict(self) -> dict:
+        return {
+            "service": self.service,
+            "environment": self.environment,
+            "aws_region": self.aws_region,
+            "cluster": self.cluster,
+            "primary": self.primary
+        }
+
+
+class TargetMatrix:
+    """
+    Expands the environments of a GitOps config into deployment targets: each environment in its aws_region, then in
+    each of its additional_aws_regions, without duplicate regions.
+
+    The manifest of a target is built on first request and kept: the primary target's manifest is the environment's
+    Manifest, the others copy it with their aws_region. See GitOps.target_matrix for the matrix of the enabled
+    environments.
+
+        matrix = gitops.target_matrix
+        for target in matrix.targets:
+            deploy(matrix.manifest(target))
+    """
+
+    def __init__(self, gitops: GitOps, environments: Optional[Sequence[str]] = None, enabled_only: bool = True):
+        """
+        :param gitops: The parsed GitOps config.
+        :param environments: Only expand these environments, skipping the ones the config does not have. Defaults to
+        every environment.
+        :param enabled_only: When True (the default), environments that are not enabled are skipped.
+        """
+        self.gitops = gitops
+        names = gitops.environments.keys() if environments is None else environments
+        targets: List[DeploymentTarget] = []
+        for name in names:
+            environment = gitops.environments.get(name)
+            if environment is None or (enabled_only and not environment.enabled):
+                continue
+            for region in dict.fromkeys((environment.aws_region, *environment.additional_aws_regions)):
+                targets.append(DeploymentTarget(gitops.service, name, region, environment.cluster,
+                                                region == environment.aws_region))
+        self.targets: Tuple[DeploymentTarget, ...] = tuple(targets)
+        self._environment_manifests: Dict[str, Manifest] = {}
+        self._manifests: Dict[DeploymentTarget, Manifest] = {}
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def __iter__(self):
+        return iter(self.targets)
+
+    def manifest(self, target: DeploymentTarget) -> Manifest:
+        """
+        :param target: One of the targets.
+        :return: The manifest of the target's environment with the target's aws_region, built once per target.
+        """
+        manifest = self._manifests.get(target)
+        if manifest is None:
+            manifest = self._environment_manifests.get(target.environment)
+            if manifest is None:
+                manifest = Manifest.from_gitops(self.gitops, target.environment)
+                self._environment_manifests[target.environment] = manifest
+            if not target.primary:
+                manifest = replace(manifest, aws_region=target.aws_region)
+            self._manifests[target] = manifest
+        return manifest
+
+    def manifests(self) -> Dict[DeploymentTarget, Manifest]:
+        """
+        :return: The manifest of every target, in the order of the targets.
+        """
+        return {target: self.manifest(target) for target in self.targets}
+
+    def to_matrix(self) -> dict:
+        """
+        :return: A GitHub Actions strategy.matrix with one include entry per target.
+        """
+        return {"include": [target.to_dict() for target in self.targets]}
+
+
+def fleet_matrix(configs: Iterable[GitOps], environments: Optional[Sequence[str]] = None,
+                 enabled_only: bool = True) -> dict:
+    """
+    :param configs: The GitOps configs, consumed lazily.
+    :param environments: Only expand these environments; see TargetMatrix.
+    :param enabled_only: When True (the default), environments that are not enabled are skipped.
+    :return: A GitHub Actions strategy.matrix with one include entry per target of every config, in order.
+    """
+    include = []
+    with current().span("matrix.expand"):
+        for gitops in configs:
+            matrix = gitops.target_matrix if environments is None and enabled_only else \
+                TargetMatrix(gitops, environments, enabled_only)
+            include.extend(target.to_dict() for target in matrix.targets)
+    current().count("matrix.targets", len(include))
+    return {"include": include}
+
+
+def matrix_json(matrix: dict) -> str:
+    """
+    :param matrix: A matrix from TargetMatrix.to_matrix or fleet_matrix.
+    :return: Its compact JSON, e.g. for `fromJSON(needs.plan.outputs.matrix)`.
+    """
+    return json.dumps(matrix, separators=(',', ':'))
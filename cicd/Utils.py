@@ -8,34 +8,48 @@ from typing import Any, List, TypeVar, Type, cast, Callable
 T = TypeVar("T")
 
 
+def _type_error(expected: str, x: Any) -> TypeError:
+    return TypeError(f"Expected {expected} but got {type(x).__name__}")
+
+
 def from_int(x: Any) -> int:
-    assert isinstance(x, int) and not isinstance(x, bool)
+    if not isinstance(x, int) or isinstance(x, bool):
+        raise _type_error("int", x)
     return x
 
 
 def from_str(x: Any) -> str:
-    assert isinstance(x, str)
+    if not isinstance(x, str):
+        raise _type_error("str", x)
     return x
 
 
 def from_bool(x: Any) -> bool:
-    assert isinstance(x, bool)
+    if not isinstance(x, bool):
+        raise _type_error("bool", x)
+    return x
+
+
+def expect_dict(x: Any) -> dict:
+    if not isinstance(x, dict):
+        raise _type_error("dictionary", x)
     return x
 
 
 def to_class(c: Type[T], x: Any) -> dict:
-    assert isinstance(x, c)
+    if not isinstance(x, c):
+        raise _type_error(c.__name__, x)
     return cast(Any, x).to_dict()
 
 
 def from_list(f: Callable[[Any], T], x: Any) -> List[T]:
-    assert isinstance(x, list)
+    if not isinstance(x, list):
+        raise _type_error("list", x)
     return [f(y) for y in x]
 
 
 def parse_dict_to_obj(parse_map: dict, obj: Any):
-    if not isinstance(obj, dict):
-        raise TypeError(f"Expected dictionary but got {type(obj).__name__}")
+    expect_dict(obj)
     result = {key: parse_func(obj.get(key)) for key, parse_func in parse_map.items()}
     return result
 
@@ -62,20 +76,16 @@ def format_value(value: any, separators=(',', ':'), sort_keys=True):
         return f'"{value}"' if value else '""'
 
 
+_FLOAT = re.compile(r'^\d+\.\d+$')
+
+
 def is_float(value: any) -> bool:
     """
     :param value: The value to be checked if it is a float.
-    :return: True if the value is a float, False otherwise.
+    :return: True if the value is a string of digits with a decimal point, e.g. "1.5", False otherwise.
 
     """
-    try:
-        if re.match(r'^\d+\.\d+$', value):
-            result = float(value)
-            return isinstance(result, float)
-        return False
-    except Exception as ex:
-        print(ex)
-        return False
+    return isinstance(value, str) and _FLOAT.match(value) is not None
 
 
 def is_json_object(value: any) -> bool:
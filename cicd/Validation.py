@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import typing
+from dataclasses import MISSING, dataclass, fields
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+from cicd.Abstracts import Abstract
+from cicd.Codecs import DEFAULT, SCALAR_TYPES, serialized_key
+
+# A path is a linked chain of (parent, key) pairs, only rendered to a string when a violation is reported.
+Path = Optional[Tuple[Any, Any]]
+
+
+@dataclass(frozen=True)
+class Violation:
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path or '<root>'}: {self.message}"
+
+
+class ValidationFailed(ValueError):
+    def __init__(self, violations: List[Violation]):
+        self.violations = violations
+        super().__init__("\n".join(str(violation) for violation in violations))
+
+
+class _FailFast(Exception):
+    pass
+
+
+def render_path(path: Path) -> str:
+    parts = []
+    while path is not None:
+        path, key = path
+        parts.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    return "".join(reversed(parts)).lstrip(".")
+
+
+class _Validator:
+    def __init__(self, fail_fast: bool):
+        self.fail_fast = fail_fast
+        self.violations: List[Violation] = []
+
+    def report(self, path: Path, message: str) -> None:
+        self.violations.append(Violation(render_path(path), message))
+        if self.fail_fast:
+            raise _FailFast()
+
+
+class _Any:
+    def check(self, validator: _Validator, value: Any, path: Path) -> None:
+        pass
+
+
+class _Scalar:
+    def __init__(self, expected: type):
+        self.expected = expected
+        self.message = f"expected {expected.__name__} but got "
+
+    def check(self, validator: _Validator, value: Any, path: Path) -> None:
+        # Exact class checks: bool is a subclass of int but never a valid int here, as in from_int.
+        if value.__class__ is not self.expected:
+            validator.report(path, self.message + type(value).__name__)
+
+
+class _List:
+    def __init__(self, item):
+        self.item = item
+
+    def check(self, validator: _Validator, value: Any, path: Path) -> None:
+        if not isinstance(value, list):
+            validator.report(path, f"expected list but got {type(value).__name__}")
+            return
+        check = self.item.check
+        for index, item in enumerate(value):
+            check(validator, item, (path, index))
+
+
+class _Container:
+    def __init__(self, value):
+        self.value = value
+
+    def check(self, validator: _Validator, value: Any, path: Path) -> None:
+        if not isinstance(value, dict):
+            validator.report(path, f"expected mapping but got {type(value).__name__}")
+            return
+        check = self.value.check
+        for key, item in value.items():
+            if not isinstance(key, str):
+                validator.report(path, f"expected str key but got {type(key).__name__} {key!r}")
+            check(validator, item, (path, key))
+
+
+class _Model:
+    def __init__(self, cls: type):
+        self.cls = cls
+        self.fields: list = []
+
+    def check(self, validator: _Validator, value: Any, path: Path) -> None:
+        if not isinstance(value, dict):
+            validator.report(path, f"expected mapping but got {type(value).__name__}")
+            return
+        for key, required, node in self.fields:
+            if key in value:
+                node.check(validator, value[key], (path, key))
+            elif required:
+                validator.report((path, key), "missing required key")
+
+
+@lru_cache(maxsize=None)
+def _node_for(annotation: Any):
+    if annotation is Any:
+        return _Any()
+    if annotation in SCALAR_TYPES:
+        return _Scalar(annotation)
+    if typing.get_origin(annotation) is list:
+        (item,) = typing.get_args(annotation) or (Any,)
+        return _List(_node_for(item))
+    if isinstance(annotation, type) and issubclass(annotation, Abstract):
+        return _Container(_node_for(annotation.value_type))
+    model = _Model(annotation)
+    hints = typing.get_type_hints(annotation)
+    model.fields = [(serialized_key(model_field), model_field.metadata.get(DEFAULT, MISSING) is MISSING,
+                     _node_for(hints[model_field.name]))
+                    for model_field in fields(annotation)]
+    return model
+
+
+def validate(data: Any, model: type = None, fail_fast: bool = False) -> List[Violation]:
+    """
+    Checks raw config data against a model in a single pass and reports every violation with its path,
+    e.g. environments.prod.with_gate or slack.channels.dev.cd[1].id.
+
+    Unlike from_dict, it does not stop at the first bad field and does not depend on assert statements, so it also
+    works under python -O.
+
+    :param data: The raw dictionary, as loaded from YAML or JSON.
+    :param model: The model class to validate against. Defaults to GitOps.
+    :param fail_fast: Stop at the first violation.
+    :return: The violations found, in schema order: the fields of each model in declaration order, and the items of
+    lists and mappings in document order. Empty when the data is valid.
+    """
+    if model is None:
+        from cicd.GitOpsDataClasses import GitOps
+
+        model = GitOps
+    validator = _Validator(fail_fast)
+    try:
+        _node_for(model).check(validator, data, None)
+    except _FailFast:
+        pass
+    return validator.violations
+
+
+def ensure_valid(data: Any, model: type = None, fail_fast: bool = False) -> Any:
+    """
+    :param data: The raw dictionary, as loaded from YAML or JSON.
+    :param model: The model class to validate against. Defaults to GitOps.
+    :param fail_fast: Stop at the first violation.
+    :return: The data, unchanged, when it is valid.
+    :raises ValidationFailed: When there is at least one violation.
+    """
+    violations = validate(data, model, fail_fast)
+    if violations:
+        raise ValidationFailed(violations)
+    return data
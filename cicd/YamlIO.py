@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+from typing import Any, IO, Iterable, Union
+
+import yaml
+
+# The libyaml bindings are several times faster than the pure-Python implementation; fall back when PyYAML was built
+# without them.
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+HAS_LIBYAML = SafeLoader is not yaml.SafeLoader
+
+
+def load_yaml(stream: Union[str, bytes, IO]) -> Any:
+    """
+    Parses a single YAML document with the fastest available safe loader.
+
+    :param stream: YAML text, bytes or an open file.
+    :return: The parsed document.
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def load_document(content: Union[str, bytes], path: str = "") -> Any:
+    """
+    Parses a YAML or JSON document. JSON, recognized by a .json path or a leading "{" or "[", is parsed with the json
+    module, which is several times faster than a YAML loader. Anything else, including flow-style YAML that is not
+    valid JSON, goes through load_yaml.
+
+    :param content: The document text or bytes.
+    :param path: The file the content was read from, if any.
+    :return: The parsed document.
+    """
+    if path.endswith(".json") or content.lstrip()[:1] in ("{", "[", b"{", b"["):
+        try:
+            return json.loads(content)
+        except ValueError:
+            if path.endswith(".json"):
+                raise
+    return load_yaml(content)
+
+
+def dump_yaml(data: Any, stream: IO = None, **kwargs) -> Any:
+    """
+    Serializes data to YAML with the fastest available safe dumper.
+
+    :param data: The data to serialize.
+    :param stream: Optional open file. When omitted the YAML text is returned.
+    :param kwargs: Extra options forwarded to yaml.dump.
+    :return: The YAML text when no stream is given, otherwise None.
+    """
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
+
+def dump_yaml_all(documents: Iterable[Any], stream: IO, **kwargs) -> None:
+    """
+    Serializes documents to a multi-document YAML stream with the fastest available safe dumper. The documents are
+    consumed lazily and each one is flushed to the stream when it ends, so memory stays bounded by one document.
+
+    :param documents: The documents to serialize, e.g. a generator.
+    :param stream: The open file to write to.
+    :param kwargs: Extra options forwarded to yaml.dump_all.
+    """
+    yaml.dump_all(documents, stream, Dumper=SafeDumper, **kwargs)
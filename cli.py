@@ -1,32 +1,563 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+"""
+CICD Python Shared Library command line.
 
+    cli.py parse gitops.yaml -o normalized.yaml
+    cli.py manifest --env prod gitops.yaml --format json
+    cli.py validate services/*/gitops.yaml
+    cat gitops.yaml | cli.py get environments.prod.cluster
+    cli.py render services/ --env prod | kubectl apply -f -
+    cli.py render --bundle --skip-invalid fleet.jsonl -f jsonl -o manifests.jsonl
+    export-fleet | cli.py render --bundle --bundle-format jsonl --env prod
+    cli.py export --env prod gitops.yaml --to github-output
+    cli.py matrix services/ --github-output matrix
+    cli.py query --from services/ --save fleet.index cluster=prod-eks
+    cli.py query --index fleet.index aws_account_id=838106405942 --paths
+    cli.py changes services/ --range origin/main..HEAD
+    cli.py serve services/ &
+    cli.py client manifest --env prod services/billing/gitops.yaml
+
+Every command reads a YAML or JSON file, or stdin when the file is "-" or omitted. Only argparse is imported at
+startup; PyYAML, the models and the rest of the library are imported by the command that needs them, so a call that
+fails on its arguments, or --help, stays cheap when the tool runs many times per workflow.
+"""
+
+import argparse
 import os
+import sys
+
+from cicd import __version__
+
+STDIN = '-'
+
+
+class CliError(Exception):
+    pass
+
+
+class DocumentError(ValueError):
+    """
+    A file is not valid YAML or JSON.
+    """
+
+    def __init__(self, path: str, error: Exception):
+        self.path = path
+        # PyYAML messages span several lines, with the position of the error on its own line.
+        self.reason = " ".join(str(error).split())
+        super().__init__(f"{path}: not valid YAML or JSON: {self.reason}")
+
+
+def read_document(path: str) -> object:
+    """
+    :param path: A YAML or JSON file, or "-" for stdin.
+    :return: The parsed document.
+    :raises DocumentError: When the file is not valid YAML or JSON.
+    """
+    import yaml
+
+    from cicd.Profiling import current
+    from cicd.YamlIO import load_document
+
+    if path == STDIN:
+        content = sys.stdin.buffer.read()
+    else:
+        with open(path, 'rb') as file:
+            content = file.read()
+    with current().span("document.load"):
+        try:
+            return load_document(content, path)
+        except (yaml.YAMLError, ValueError) as e:
+            raise DocumentError(path, e) from e
+
+
+def read_gitops(path: str, lazy: bool = False):
+    from cicd.GitOpsDataClasses import GitOps
+    from cicd.Profiling import current
+
+    data = read_document(path)
+    with current().span("gitops.from_dict"):
+        return GitOps.from_dict(data, lazy=lazy)
+
+
+def write_document(data: object, args: argparse.Namespace) -> None:
+    """
+    Writes data to args.output, or stdout, in args.format. With args.if_changed, an output file already rendered from
+    the same data is left untouched.
+    """
+    if not args.output:
+        dump_document(data, sys.stdout, args.format)
+        return
+    if args.if_changed:
+        from cicd.Fingerprint import RenderCache, fingerprint
+        from cicd.Profiling import current
+
+        with current().span("render.fingerprint"):
+            key = RenderCache.key(fingerprint(data), args.format)
+        with RenderCache.for_output(args.output) as cache:
+            if not cache.write(args.output, key, lambda stream: dump_document(data, stream, args.format)):
+                current().count("render.skipped")
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as stream:
+        dump_document(data, stream, args.format)
+
+
+def dump_document(data: object, stream: object, output_format: str) -> None:
+    from cicd.Profiling import current
+
+    if output_format == 'json':
+        import json
+
+        with current().span("json.dump"):
+            json.dump(data, stream, separators=(',', ':'))
+            stream.write("\n")
+    else:
+        from cicd.YamlIO import dump_yaml
+
+        with current().span("yaml.dump"):
+            dump_yaml(data, stream)
+
+
+def parse(args: argparse.Namespace) -> int:
+    gitops = read_gitops(args.file)
+    write_document(gitops.to_dict(), args)
+    return 0
+
+
+def manifest(args: argparse.Namespace) -> int:
+    from cicd.GitOpsDataClasses import Manifest
+    from cicd.Profiling import current
+
+    # Only the environments section is needed, so the other sections are never parsed.
+    gitops = read_gitops(args.file, lazy=True)
+    with current().span("manifest.from_gitops"):
+        if args.all:
+            data = {name: item.to_dict() for name, item in Manifest.all_from_gitops(gitops).items()}
+        elif args.environment in gitops.environments:
+            data = Manifest.from_gitops(gitops, args.environment).to_dict()
+        else:
+            raise CliError(f"unknown environment '{args.environment}', expected one of "
+                           f"{', '.join(gitops.environments)}")
+    write_document(data, args)
+    return 0
+
+
+def get(args: argparse.Namespace) -> int:
+    try:
+        value = read_gitops(args.file, lazy=True).lookup(args.key)
+    except KeyError:
+        raise CliError(f"no value at '{args.key}'") from None
+    if isinstance(value, str):
+        print(value)
+    else:
+        import json
+
+        print(json.dumps(value, separators=(',', ':')))
+    return 0
+
+
+def export(args: argparse.Namespace) -> int:
+    from cicd.Exporter import export_path, flatten, format_exports, write_exports
+    from cicd.GitOpsDataClasses import Manifest
+    from cicd.Profiling import current
+
+    gitops = read_gitops(args.file, lazy=args.environment is not None)
+    if args.environment is None:
+        obj = gitops
+    elif args.environment in gitops.environments:
+        obj = Manifest.from_gitops(gitops, args.environment)
+    else:
+        raise CliError(f"unknown environment '{args.environment}', expected one of {', '.join(gitops.environments)}")
+    with current().span("export.flatten"):
+        pairs = flatten(obj, args.prefix)
+    # Outside of GitHub Actions $GITHUB_OUTPUT and $GITHUB_ENV are unset, so the default target falls back to stdout.
+    path = None if args.to == STDIN else export_path(args.to)
+    with current().span("export.write"):
+        if path is None:
+            sys.stdout.write(format_exports(pairs, args.format))
+        else:
+            write_exports(pairs, path, args.format)
+    return 0
+
+
+def expand_paths(paths: list) -> list:
+    """
+    :param paths: Files, directories searched recursively for gitops.yaml files, glob patterns, or "-" for stdin.
+    :return: The files, in order.
+    """
+    expanded = []
+    for path in paths:
+        if path != STDIN and (os.path.isdir(path) or any(char in path for char in "*?[")):
+            from cicd.Fleet import discover_gitops_files
+
+            expanded.extend(discover_gitops_files(path))
+        else:
+            expanded.append(path)
+    return expanded
+
+
+def read_bundles(paths: list, skip_invalid: bool = False, bundle_format: str = None):
+    """
+    :param paths: Multi-document YAML or JSON Lines files of GitOps configs, or "-" for stdin.
+    :param skip_invalid: Skip malformed documents, reporting their offsets on stderr, instead of failing.
+    :param bundle_format: "yaml" or "jsonl". Defaults to "jsonl" for .jsonl and .ndjson files, else "yaml", which
+    includes stdin.
+    :return: The configs, parsed one document at a time.
+    """
+    from cicd.DocumentStream import iter_gitops
+
+    for path in paths:
+        def report(malformed, path=path):
+            print(f"{path}: skipped {malformed}", file=sys.stderr)
+
+        source = sys.stdin.buffer if path == STDIN else path
+        # Sections of lazy configs are only validated on access, so they are parsed eagerly when skipping.
+        yield from iter_gitops(source, bundle_format, skip_invalid=skip_invalid, on_error=report,
+                               lazy=not skip_invalid)
+
+
+def render(args: argparse.Namespace) -> int:
+    from cicd.ManifestRenderer import render_manifests
 
-import yaml
+    # A generator, so only one config is parsed and held at a time.
+    if args.bundle:
+        configs = read_bundles(args.files, args.skip_invalid, args.bundle_format)
+    else:
+        configs = (read_gitops(path, lazy=True) for path in expand_paths(args.files))
+    options = dict(output_format=args.format, environments=args.environments, enabled_only=not args.include_disabled)
+    if not args.output:
+        render_manifests(configs, sys.stdout, **options)
+        return 0
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as stream:
+        render_manifests(configs, stream, **options)
+    return 0
 
-from cicd.GitOpsDataClasses import gitops_from_dict, gitops_to_dict, Manifest
 
+def matrix(args: argparse.Namespace) -> int:
+    from cicd.TargetMatrix import fleet_matrix, matrix_json
 
-def main() -> None:
-    fixtures = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'fixtures')
-    fixtures_outputs = os.path.join(fixtures, 'outputs')
-    gitops_yaml_file = os.path.join(fixtures, 'gitops.yaml')
-    with open(gitops_yaml_file, 'r') as file:
+    configs = (read_gitops(path, lazy=True) for path in expand_paths(args.files))
+    text = matrix_json(fleet_matrix(configs, args.environments, enabled_only=not args.include_disabled))
+    if args.github_output:
+        from cicd.Exporter import export_path, format_exports, write_exports
+
+        path = export_path('github-output')
+        if path is not None:
+            write_exports([(args.github_output, text)], path)
+            return 0
+        text = format_exports([(args.github_output, text)]).rstrip("\n")
+    print(text)
+    return 0
+
+
+def query(args: argparse.Namespace) -> int:
+    from cicd.FleetIndex import FleetIndex
+    from cicd.Profiling import current
+
+    criteria = {}
+    for criterion in args.criteria:
+        name, separator, value = criterion.partition('=')
+        if not separator:
+            raise CliError(f"expected FIELD=VALUE but got '{criterion}'")
+        criteria[name] = value
+    if args.index and args.sources:
+        raise CliError("pass either --index or --from, not both")
+    if args.index:
+        with current().span("index.load"):
+            index = FleetIndex.load(args.index)
+    elif args.sources:
+        with current().span("index.build"):
+            index = FleetIndex.from_paths(expand_paths(args.sources))
+    else:
+        raise CliError("pass --index with a saved index or --from with the configs to index")
+    if args.save:
+        index.save(args.save)
+    if not criteria and args.save:
+        return 0
+    with current().span("index.query"):
+        matches = index.match(**criteria)
+    for number in matches:
+        print(index.source(number) if args.paths else index.services[number])
+    return 0
+
+
+def validate(args: argparse.Namespace) -> int:
+    from cicd.Profiling import current
+    from cicd.Validation import Violation, validate as validate_config
+
+    invalid = 0
+    for path in args.files:
         try:
-            gitops_dict = yaml.safe_load(file)
-        except Exception as e:
-            raise e
-
-    gitops = gitops_from_dict(gitops_dict)
-    with open(os.path.join(fixtures_outputs, 'gitops.yaml'), "w") as file:
-        yaml.dump(gitops_to_dict(gitops), file)
-
-    manifest = Manifest.from_gitops(gitops)
-    manifest_dict = manifest.to_dict()
-    with open(os.path.join(fixtures_outputs, 'manifest.yaml'), "w") as file:
-        yaml.dump(manifest_dict, file)
-    print()
+            data = read_document(path)
+        except DocumentError as e:
+            # A file that does not parse is one violation of its root; the remaining files are still validated.
+            violations = [Violation("", f"not valid YAML or JSON: {e.reason}")]
+        else:
+            with current().span("validate"):
+                violations = validate_config(data, fail_fast=args.fail_fast)
+        for violation in violations:
+            print(f"{path}: {violation}")
+        invalid += bool(violations)
+    return 1 if invalid else 0
+
+
+def fleet(args: argparse.Namespace) -> int:
+    import json
+
+    from cicd.Fleet import FleetSummary, discover_gitops_files, run_fleet
+    from cicd.Profiling import current
+
+    profiler = current()
+    with profiler.span("fleet.discover"):
+        paths = discover_gitops_files(args.target)
+    summary = FleetSummary(workers=args.workers or os.cpu_count() or 1)
+    results = run_fleet(paths, workers=summary.workers, environment_name=args.environment, summary=summary,
+                        cache_directory=args.cache_dir)
+    with profiler.span("fleet.run"):
+        for result in results:
+            profiler.count("fleet.configs")
+            print(json.dumps(result.to_dict(), separators=(',', ':')), flush=True)
+
+    report = summary.to_dict()
+    print(f"{report['total']} configs ({report['failed']} failed) in {report['elapsed_s']}s "
+          f"with {report['workers']} workers: {report['files_per_s']} configs/s", file=sys.stderr)
+    for failure in report['failures']:
+        print(f"  FAILED {failure['path']}: {failure['error']}", file=sys.stderr)
+    return 1 if summary.failures else 0
+
+
+def changes(args: argparse.Namespace) -> int:
+    import json
+
+    from cicd.Profiling import current
+
+    if args.range is None:
+        if len(args.files) != 1:
+            raise CliError("pass --range to check several configs; paths on stdin apply to a single config")
+        gitops = read_gitops(args.files[0], lazy=True)
+        with current().span("path_monitor.with_changes"):
+            path_monitor = gitops.path_monitor.with_changes(sys.stdin)
+        print(json.dumps(path_monitor.to_dict(), separators=(',', ':'), sort_keys=True))
+        return 0
+
+    from cicd.ChangeDetection import ChangeDetector, CommitRange, GitError
+
+    commit_range = CommitRange.parse(args.range)
+    configs = {path: read_gitops(path, lazy=True) for path in expand_paths(args.files)}
+    try:
+        monitors = ChangeDetector(args.repo).detect({path: (gitops, commit_range) for path, gitops in configs.items()})
+    except GitError as e:
+        raise CliError(str(e)) from e
+    for path, path_monitor in monitors.items():
+        print(json.dumps({"file": path, "service": configs[path].service, "path_monitor": path_monitor.to_dict()},
+                         separators=(',', ':'), sort_keys=True))
+    return 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    from cicd.Daemon import DaemonServer
+
+    server = DaemonServer(args.socket, poll_interval=args.poll_interval)
+    for path in expand_paths(args.files):
+        server.store.get(path)
+    print(f"cicd daemon {os.getpid()} serving {len(server.store.configs)} configs on {args.socket}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def client(args: argparse.Namespace) -> int:
+    from cicd.Daemon import DaemonError, query as query_daemon
+
+    request = {"op": args.operation}
+    if args.operation in ('parse', 'manifest', 'get'):
+        if args.file == STDIN:
+            raise CliError("the daemon cannot read stdin; pass the config file path")
+        request["path"] = args.file
+    if args.operation == 'manifest':
+        request.update(environment=args.environment, all=args.all)
+    elif args.operation == 'get':
+        request["key"] = args.key
+    try:
+        result = query_daemon(args.socket, fallback=not args.no_fallback, **request)
+    except DaemonError as e:
+        raise CliError(str(e)) from e
+    if args.operation == 'get' and isinstance(result, str):
+        print(result)
+    elif args.operation in ('parse', 'manifest'):
+        write_document(result, args)
+    else:
+        import json
+
+        print(json.dumps(result, separators=(',', ':')))
+    return 0
+
+
+def add_output_arguments(parser: argparse.ArgumentParser, default_format: str = 'yaml') -> None:
+    parser.add_argument('-o', '--output', default=None, help="Write to this file instead of stdout")
+    parser.add_argument('-f', '--format', choices=('yaml', 'json'), default=default_format,
+                        help=f"Output format (default: {default_format})")
+    parser.add_argument('--if-changed', action='store_true',
+                        help="Skip writing --output when it was rendered from the same content before")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='cli.py', description="CICD Python Shared Library")
+    parser.add_argument('--version', action='version', version=f"%(prog)s {__version__}")
+    parser.add_argument('--profile', metavar='PATH', help="Write stage timings and counters as JSON to PATH")
+    parser.add_argument('--trace-memory', action='store_true', help="Add tracemalloc peak memory to the profile")
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND', required=True)
+    file_help = "gitops.yaml or gitops.json file, or - for stdin (default)"
+
+    parse_parser = subparsers.add_parser('parse', help="Parse a gitops config and write it back normalized")
+    parse_parser.add_argument('file', nargs='?', default=STDIN, help=file_help)
+    add_output_arguments(parse_parser)
+    parse_parser.set_defaults(handler=parse)
+
+    manifest_parser = subparsers.add_parser('manifest', help="Write the manifest of one environment")
+    manifest_parser.add_argument('file', nargs='?', default=STDIN, help=file_help)
+    manifest_parser.add_argument('-e', '--env', dest='environment', default='dev', help="Environment (default: dev)")
+    manifest_parser.add_argument('--all', action='store_true', help="Every enabled environment, keyed by name")
+    add_output_arguments(manifest_parser)
+    manifest_parser.set_defaults(handler=manifest)
+
+    render_parser = subparsers.add_parser('render', help="Stream the manifests of many configs as YAML or JSON Lines")
+    render_parser.add_argument('files', nargs='*', default=[STDIN],
+                               help="gitops files, directories searched for gitops.yaml files, globs, or - for stdin")
+    render_parser.add_argument('-e', '--env', dest='environments', action='append', default=None,
+                               help="Only render this environment; repeatable (default: every environment)")
+    render_parser.add_argument('--include-disabled', action='store_true', help="Also render disabled environments")
+    render_parser.add_argument('-o', '--output', default=None, help="Write to this file instead of stdout")
+    render_parser.add_argument('-f', '--format', choices=('yaml', 'jsonl'), default='yaml',
+                               help="Multi-document YAML (default) or one JSON object per line")
+    render_parser.add_argument('--bundle', action='store_true',
+                               help="Each file is a multi-document YAML or JSON Lines (.jsonl) bundle of configs")
+    render_parser.add_argument('--skip-invalid', action='store_true',
+                               help="With --bundle, skip malformed documents and report them on stderr")
+    render_parser.add_argument('--bundle-format', choices=('yaml', 'jsonl'), default=None,
+                               help="With --bundle, the format of the bundles (default: jsonl for .jsonl and .ndjson "
+                                    "files, else yaml, including stdin)")
+    render_parser.set_defaults(handler=render)
+
+    matrix_parser = subparsers.add_parser('matrix', help="Write the deployment targets as a GitHub Actions matrix")
+    matrix_parser.add_argument('files', nargs='*', default=[STDIN],
+                               help="gitops files, directories searched for gitops.yaml files, globs, or - for stdin")
+    matrix_parser.add_argument('-e', '--env', dest='environments', action='append', default=None,
+                               help="Only this environment; repeatable (default: every environment)")
+    matrix_parser.add_argument('--include-disabled', action='store_true', help="Also expand disabled environments")
+    matrix_parser.add_argument('--github-output', metavar='KEY', default=None,
+                               help="Append KEY=<matrix> to $GITHUB_OUTPUT (stdout when unset)")
+    matrix_parser.set_defaults(handler=matrix)
+
+    query_parser = subparsers.add_parser('query', help="List the services matching FIELD=VALUE criteria across a fleet")
+    query_parser.add_argument('criteria', nargs='*', metavar='FIELD=VALUE',
+                              help="cluster, aws_region, aws_account_id, ecr_repository_name, helm_chart_repo, "
+                                   "app_of_apps or slack_channel_id; every criterion must match")
+    query_parser.add_argument('--index', default=None, help="Query an index saved with --save")
+    query_parser.add_argument('--from', dest='sources', action='append', default=None,
+                              help="Index these configs, directories or globs; repeatable")
+    query_parser.add_argument('--save', default=None, help="Save the index to this file")
+    query_parser.add_argument('--paths', action='store_true', help="Print config paths instead of service names")
+    query_parser.set_defaults(handler=query)
+
+    validate_parser = subparsers.add_parser('validate', help="Report every schema violation of gitops configs")
+    validate_parser.add_argument('files', nargs='*', default=[STDIN], help="gitops.yaml or gitops.json files")
+    validate_parser.add_argument('--fail-fast', action='store_true', help="Stop at the first violation of each file")
+    validate_parser.set_defaults(handler=validate)
+
+    get_parser = subparsers.add_parser('get', help="Print one value, e.g. environments.prod.cluster")
+    get_parser.add_argument('key', help="Dotted path of the value, e.g. slack.channels.dev.cd[0].id")
+    get_parser.add_argument('file', nargs='?', default=STDIN, help=file_help)
+    get_parser.set_defaults(handler=get)
+
+    export_parser = subparsers.add_parser('export', help="Write a manifest or config as KEY=value lines")
+    export_parser.add_argument('file', nargs='?', default=STDIN, help=file_help)
+    export_parser.add_argument('-e', '--env', dest='environment', default=None,
+                               help="Export the manifest of this environment (default: the whole config)")
+    export_parser.add_argument('-t', '--to', default='github-output',
+                               help="github-output or github-env to append to $GITHUB_OUTPUT or $GITHUB_ENV "
+                                    "(default: github-output, stdout when unset), a file to append to, or - for stdout")
+    export_parser.add_argument('-f', '--format', choices=('github', 'dotenv'), default='github',
+                               help="GitHub Actions KEY=value with multiline blocks (default), or quoted dotenv")
+    export_parser.add_argument('--prefix', default='', help="Prefix of every key, e.g. the service name")
+    export_parser.set_defaults(handler=export)
+
+    fleet_parser = subparsers.add_parser('fleet', help="Parse many gitops configs in parallel")
+    fleet_parser.add_argument('target', help="Directory searched recursively for gitops.yaml files, or a glob")
+    fleet_parser.add_argument('-w', '--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    fleet_parser.add_argument('-e', '--environment', default='dev', help="Environment to build manifests for")
+    fleet_parser.add_argument('--cache-dir', default=None,
+                              help="Cache parsed configs by content hash in this directory")
+    fleet_parser.set_defaults(handler=fleet)
+
+    serve_parser = subparsers.add_parser('serve', help="Keep parsed configs in memory and answer queries on a socket")
+    serve_parser.add_argument('files', nargs='*', help="Configs, directories or globs to parse up front")
+    serve_parser.add_argument('--socket', default=None, help="Unix socket path (default: $CICD_DAEMON_SOCKET)")
+    serve_parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds between file change checks")
+    serve_parser.set_defaults(handler=serve)
+
+    client_parser = subparsers.add_parser('client', help="Query the daemon, parsing in process when none is running")
+    client_parser.add_argument('--socket', default=None, help="Unix socket path (default: $CICD_DAEMON_SOCKET)")
+    client_parser.add_argument('--no-fallback', action='store_true', help="Fail when no daemon is running")
+    operations = client_parser.add_subparsers(dest='operation', metavar='OPERATION', required=True)
+    client_parse_parser = operations.add_parser('parse', help="The normalized config")
+    client_parse_parser.add_argument('file', help="gitops.yaml or gitops.json file")
+    add_output_arguments(client_parse_parser, default_format='json')
+    client_manifest_parser = operations.add_parser('manifest', help="The manifest of one environment")
+    client_manifest_parser.add_argument('file', help="gitops.yaml or gitops.json file")
+    client_manifest_parser.add_argument('-e', '--env', dest='environment', default='dev', help="Environment")
+    client_manifest_parser.add_argument('--all', action='store_true', help="Every enabled environment")
+    add_output_arguments(client_manifest_parser, default_format='json')
+    client_get_parser = operations.add_parser('get', help="One value, e.g. environments.prod.cluster")
+    client_get_parser.add_argument('key', help="Dotted path of the value")
+    client_get_parser.add_argument('file', help="gitops.yaml or gitops.json file")
+    operations.add_parser('ping', help="The pid of the daemon and its number of configs")
+    operations.add_parser('stats', help="Configs, parses and cache hits of the daemon")
+    operations.add_parser('shutdown', help="Stop the daemon")
+    client_parser.set_defaults(handler=client)
+
+    changes_parser = subparsers.add_parser('changes',
+                                           help="Set path_monitor hasModifications from changed paths on stdin")
+    changes_parser.add_argument('files', nargs='+', metavar='file',
+                                help="gitops.yaml or gitops.json file; with --range, any number of files, "
+                                     "directories or globs")
+    changes_parser.add_argument('--range', default=None, metavar='BASE..HEAD',
+                                help="Read the changed paths of this commit range from git instead of stdin, "
+                                     "printing one JSON line per config")
+    changes_parser.add_argument('--repo', default='.', help="The git repository for --range (default: .)")
+    changes_parser.set_defaults(handler=changes)
+    return parser
+
+
+def main(argv=None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'socket', False) is None:
+        from cicd.Daemon import default_socket_path
+
+        args.socket = default_socket_path()
+    profiler = None
+    try:
+        if args.profile:
+            from cicd.Profiling import Profiler, activate
+
+            profiler = Profiler(trace_memory=args.trace_memory)
+            with activate(profiler):
+                code = args.handler(args)
+        else:
+            code = args.handler(args)
+    except (CliError, OSError, TypeError, ValueError) as e:
+        parser.exit(1, f"{parser.prog} {args.command}: error: {e}\n")
+    finally:
+        if profiler:
+            profiler.write(args.profile)
+    sys.exit(code)
 
 
 if __name__ == '__main__':
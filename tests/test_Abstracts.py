@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import pickle
 import unittest
+from dataclasses import FrozenInstanceError, fields
 from unittest import TestCase
 
-from cicd.GitOpsDataClasses import GitOps
+from cicd.GitOpsDataClasses import GitOps, Environments, AwsAccount, SlackChannel, PathConfiguration
 from tests.Fixtures import TEST_DATA
 
 
@@ -18,5 +20,50 @@ class TestGitOps(TestCase):
         self.assertEqual(result, expected)
 
 
+class TestMappingContainers(TestCase):
+    def setUp(self):
+        self.gitops = GitOps.from_dict(TEST_DATA)
+
+    def test_mapping_protocol(self):
+        environments = self.gitops.environments
+        self.assertEqual(list(environments), ["dev", "demo", "prod"])
+        self.assertEqual(len(environments), 3)
+        self.assertIn("demo", environments)
+        self.assertNotIn("qa", environments)
+        self.assertEqual(environments["prod"].cluster, "prod-cluster")
+        self.assertIs(environments.dev, environments["dev"])
+        self.assertEqual(self.gitops.path_monitor.keys(), {"application", "helm_charts"})
+
+    def test_read_only(self):
+        environments = self.gitops.environments
+        with self.assertRaises(TypeError):
+            environments["qa"] = environments["dev"]
+        with self.assertRaises(AttributeError):
+            environments.qa = environments["dev"]
+        with self.assertRaises(AttributeError):
+            _ = environments.qa
+
+    def test_constructor_copies_entries(self):
+        entries = dict(self.gitops.environments)
+        environments = Environments(entries)
+        entries.clear()
+        self.assertEqual(len(environments), 3)
+        self.assertEqual(environments, self.gitops.environments)
+        self.assertNotEqual(environments, Environments({}))
+
+    def test_slotted_frozen_leaves(self):
+        leaves = (self.gitops.environment_promotion_phases["01-dev"], self.gitops.environments["dev"],
+                  self.gitops.path_monitor["application"], self.gitops.slack.channels["dev"].cd[0])
+        self.assertEqual([type(leaf) for leaf in leaves][::2], [AwsAccount, PathConfiguration])
+        self.assertIsInstance(leaves[3], SlackChannel)
+        for leaf in leaves:
+            self.assertFalse(hasattr(leaf, "__dict__"))
+            with self.assertRaises(FrozenInstanceError):
+                setattr(leaf, fields(leaf)[0].name, None)
+
+    def test_pickle(self):
+        self.assertEqual(pickle.loads(pickle.dumps(self.gitops)), self.gitops)
+
+
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()  # pragma: no cover
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import copy
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest import TestCase
+
+from cicd.ChangeDetection import ChangeDetector, CommitRange, GitError
+from cicd.GitOpsDataClasses import GitOps, PathMonitor
+from tests.Fixtures import TEST_DATA
+
+
+def gitops_for(service: str) -> GitOps:
+    data = copy.deepcopy(TEST_DATA)
+    data["service"] = service
+    data["path_monitor"] = {
+        "application": {"paths": [f"{service}/src/.*"]},
+        "helm": {"paths": [f"{service}/chart/.*", "charts/common/.*"]},
+        "tests": {"paths": [f"{service}/tests/test_[a-z]+\\.py"]},
+    }
+    return GitOps.from_dict(data)
+
+
+def modified_groups(path_monitor: PathMonitor) -> set:
+    return {group for group, configuration in path_monitor.items() if configuration.has_modifications}
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class TestChangeDetector(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.repository = self.directory.name
+        self.git("init", "-q")
+        self.commits = [self.commit({"billing/src/app.py": "1", "ledger/src/app.py": "1", "charts/common/v": "1"})]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def git(self, *arguments: str) -> str:
+        environment = dict(os.environ, GIT_AUTHOR_NAME="ci", GIT_AUTHOR_EMAIL="ci@example.com",
+                           GIT_COMMITTER_NAME="ci", GIT_COMMITTER_EMAIL="ci@example.com", GIT_CONFIG_NOSYSTEM="1",
+                           HOME=self.repository)
+        return subprocess.run(["git", *arguments], cwd=self.repository, env=environment, check=True,
+                              capture_output=True, text=True).stdout.strip()
+
+    def commit(self, files: dict) -> str:
+        for path, content in files.items():
+            full_path = os.path.join(self.repository, path)
+            if content is None:
+                os.remove(full_path)
+                continue
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, 'w') as file:
+                file.write(content)
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", f"change {len(files)} files")
+        return self.git("rev-parse", "HEAD")
+
+    def test_changed_paths_of_many_ranges_in_two_processes(self):
+        second = self.commit({"billing/src/app.py": "2", "billing/tests/test_app.py": "1"})
+        third = self.commit({"charts/common/v": "2", "ledger/src/new name.py": "1", "billing/src/app.py": None})
+        detector = ChangeDetector(self.repository)
+        first_range = CommitRange(self.commits[0], second)
+        second_range = CommitRange.parse(third)
+        whole_range = CommitRange.parse(f"{self.commits[0]}..HEAD")
+        empty_range = CommitRange("HEAD", third)
+        changes = detector.changed_paths([first_range, second_range, whole_range, empty_range, first_range])
+        self.assertEqual(detector.processes, 2)
+        self.assertEqual(changes[first_range], ("billing/src/app.py", "billing/tests/test_app.py"))
+        self.assertEqual(set(changes[second_range]),
+                         {"billing/src/app.py", "charts/common/v", "ledger/src/new name.py"})
+        self.assertEqual(set(changes[whole_range]), set(changes[first_range]) | set(changes[second_range]))
+        self.assertEqual(changes[empty_range], ())
+
+    def test_single_revision_of_a_root_commit_is_diffed_against_the_empty_tree(self):
+        second = self.commit({"billing/src/app.py": "2"})
+        detector = ChangeDetector(self.repository)
+        root_range = CommitRange.parse(self.commits[0])
+        second_range = CommitRange.parse(second)
+        changes = detector.changed_paths([second_range, root_range])
+        self.assertEqual(detector.processes, 2)
+        self.assertEqual(changes[root_range], ("billing/src/app.py", "charts/common/v", "ledger/src/app.py"))
+        self.assertEqual(changes[second_range], ("billing/src/app.py",))
+        with self.assertRaises(GitError):
+            detector.changed_paths([CommitRange.parse("no-such-revision")])
+
+    def test_detect_routes_paths_to_every_service(self):
+        second = self.commit({"billing/src/app.py": "2", "billing/tests/test_app.py": "1"})
+        third = self.commit({"charts/common/v": "2"})
+        services = {
+            "billing": (gitops_for("billing"), CommitRange(self.commits[0], third)),
+            "ledger": (gitops_for("ledger"), CommitRange(self.commits[0], third)),
+            "billing-previous": (gitops_for("billing").path_monitor, CommitRange(second, third)),
+        }
+        detector = ChangeDetector(self.repository)
+        monitors = detector.detect(services)
+        self.assertEqual(detector.processes, 2)
+        self.assertEqual(modified_groups(monitors["billing"]), {"application", "helm", "tests"})
+        self.assertEqual(modified_groups(monitors["ledger"]), {"helm"})
+        self.assertEqual(modified_groups(monitors["billing-previous"]), {"helm"})
+
+    def test_unknown_revisions_and_repositories(self):
+        with self.assertRaisesRegex(GitError, "Unknown revision 'missing'"):
+            ChangeDetector(self.repository).changed_paths([CommitRange("missing", "HEAD")])
+        with self.assertRaisesRegex(GitError, "Unknown revision 'missing'"):
+            ChangeDetector(self.repository).changed_paths([CommitRange.parse("missing")])
+        with self.assertRaises(GitError):
+            ChangeDetector(os.path.join(self.repository, "missing")).resolve(["HEAD"])
+        with self.assertRaises(ValueError):
+            CommitRange.parse("main...HEAD")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
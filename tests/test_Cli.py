@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import TestCase, mock
+
+import yaml
+
+import cli
+from cicd.YamlIO import SafeLoader, dump_yaml, load_yaml
+from tests.Fixtures import TEST_DATA
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Cumulative import time of cli.py, from `python -X importtime`. Interpreter startup is not included.
+STARTUP_BUDGET_MS = 50
+DEFERRED_MODULES = ("yaml", "json", "cicd.GitOpsDataClasses", "cicd.Validation", "cicd.Profiling", "cicd.Fleet")
+
+
+def load_yaml_all(text: str) -> list:
+    return list(yaml.load_all(text, Loader=SafeLoader))
+
+
+def run(*argv: str, stdin: str = None) -> tuple:
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    stdin = io.TextIOWrapper(io.BytesIO((stdin or "").encode()))
+    with mock.patch("sys.stdin", stdin), contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            cli.main(list(argv))
+            code = 0
+        except SystemExit as e:
+            code = e.code
+    return code, stdout.getvalue(), stderr.getvalue()
+
+
+class TestCommands(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.yaml_file = os.path.join(self.directory.name, "gitops.yaml")
+        self.json_file = os.path.join(self.directory.name, "gitops.json")
+        with open(self.yaml_file, 'w') as file:
+            dump_yaml(TEST_DATA, file)
+        with open(self.json_file, 'w') as file:
+            json.dump(TEST_DATA, file)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_parse_from_file_and_stdin(self):
+        code, stdout, _ = run("parse", self.yaml_file)
+        self.assertEqual(code, 0)
+        self.assertEqual(load_yaml(stdout), TEST_DATA)
+        code, stdout, _ = run("parse", "--format", "json", stdin=json.dumps(TEST_DATA))
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(stdout), TEST_DATA)
+
+    def test_parse_to_output_file(self):
+        output = os.path.join(self.directory.name, "outputs", "gitops.yaml")
+        self.assertEqual(run("parse", self.json_file, "-o", output)[0], 0)
+        with open(output, 'r') as file:
+            self.assertEqual(load_yaml(file), TEST_DATA)
+
+    def test_output_is_written_only_when_changed(self):
+        output = os.path.join(self.directory.name, "outputs", "manifest.yaml")
+        self.assertEqual(run("manifest", "--env", "prod", self.yaml_file, "-o", output, "--if-changed")[0], 0)
+        os.utime(output, ns=(1, 1))
+        self.assertEqual(run("manifest", "--env", "prod", self.json_file, "-o", output, "--if-changed")[0], 0)
+        self.assertEqual(os.stat(output).st_mtime_ns, 1)
+        self.assertEqual(run("manifest", "--env", "dev", self.yaml_file, "-o", output, "--if-changed")[0], 0)
+        with open(output, 'r') as file:
+            self.assertEqual(load_yaml(file)["environment"], "dev")
+
+    def test_manifest(self):
+        code, stdout, _ = run("manifest", "--env", "prod", "-f", "json", self.yaml_file)
+        self.assertEqual(code, 0)
+        manifest = json.loads(stdout)
+        self.assertEqual(manifest["cluster"], TEST_DATA["environments"]["prod"]["cluster"])
+        self.assertEqual(manifest["service"], TEST_DATA["service"])
+        code, stdout, _ = run("manifest", "--all", "-f", "json", self.yaml_file)
+        self.assertEqual(json.loads(stdout)["prod"], manifest)
+        code, _, stderr = run("manifest", "--env", "qa", self.yaml_file)
+        self.assertEqual(code, 1)
+        self.assertIn("unknown environment 'qa'", stderr)
+
+    def test_get(self):
+        self.assertEqual(run("get", "service", self.yaml_file)[1], f"{TEST_DATA['service']}\n")
+        expected = TEST_DATA["slack"]["channels"]["dev"]["cd"][0]["id"]
+        self.assertEqual(run("get", "slack.channels.dev.cd[0].id", self.json_file)[1], f"{expected}\n")
+        self.assertEqual(json.loads(run("get", "environments.prod", stdin=json.dumps(TEST_DATA))[1]),
+                         TEST_DATA["environments"]["prod"])
+        self.assertEqual(run("get", "enable_tests", self.yaml_file)[1], f"{json.dumps(TEST_DATA['enable_tests'])}\n")
+        code, _, stderr = run("get", "environments.qa.cluster", self.yaml_file)
+        self.assertEqual(code, 1)
+        self.assertIn("no value at 'environments.qa.cluster'", stderr)
+
+    def test_render(self):
+        code, stdout, _ = run("render", self.yaml_file, self.json_file, "--env", "dev", "-f", "jsonl")
+        self.assertEqual(code, 0)
+        manifests = [json.loads(line) for line in stdout.splitlines()]
+        self.assertEqual([manifest["environment"] for manifest in manifests], ["dev", "dev"])
+        code, stdout, _ = run("render", self.directory.name, "--include-disabled")
+        self.assertEqual(len(list(load_yaml_all(stdout))), len(TEST_DATA["environments"]))
+
+    def test_render_bundles(self):
+        bundle = os.path.join(self.directory.name, "fleet.jsonl")
+        with open(bundle, 'w') as file:
+            file.write(json.dumps(TEST_DATA) + "\n{broken\n" + json.dumps(TEST_DATA) + "\n")
+        code, stdout, stderr = run("render", "--bundle", bundle, "--env", "dev", "-f", "jsonl")
+        self.assertEqual(code, 1)
+        self.assertIn("document 1 at byte", stderr)
+        code, stdout, stderr = run("render", "--bundle", "--skip-invalid", bundle, "--env", "dev", "-f", "jsonl")
+        self.assertEqual(code, 0)
+        self.assertEqual(len(stdout.splitlines()), 2)
+        self.assertIn(f"{bundle}: skipped document 1 at byte", stderr)
+
+    def test_render_bundles_from_stdin(self):
+        jsonl = json.dumps(TEST_DATA) + "\n" + json.dumps(TEST_DATA) + "\n"
+        code, stdout, _ = run("render", "--bundle", "--bundle-format", "jsonl", "--env", "dev", "-f", "jsonl",
+                              stdin=jsonl)
+        self.assertEqual(code, 0)
+        self.assertEqual([json.loads(line)["environment"] for line in stdout.splitlines()], ["dev", "dev"])
+        code, stdout, _ = run("render", "--bundle", "--env", "dev", "-f", "jsonl", stdin=dump_yaml(TEST_DATA))
+        self.assertEqual(code, 0)
+        self.assertEqual(len(stdout.splitlines()), 1)
+
+    def test_export(self):
+        code, stdout, _ = run("export", "--env", "prod", "--to", "-", self.yaml_file)
+        self.assertEqual(code, 0)
+        self.assertIn(f"CLUSTER={TEST_DATA['environments']['prod']['cluster']}\n", stdout)
+        output = os.path.join(self.directory.name, "github_output")
+        with mock.patch.dict(os.environ, {"GITHUB_OUTPUT": output}):
+            self.assertEqual(run("export", "--prefix", "app", self.json_file), (0, "", ""))
+        with open(output, 'r') as file:
+            self.assertIn(f"APP_SERVICE={TEST_DATA['service']}\n", file.read())
+        code, stdout, _ = run("export", "-f", "dotenv", "--to", "-", self.yaml_file)
+        self.assertIn(f'SERVICE="{TEST_DATA["service"]}"\n', stdout)
+
+    def test_matrix(self):
+        code, stdout, _ = run("matrix", self.yaml_file, self.json_file, "--env", "dev")
+        self.assertEqual(code, 0)
+        include = json.loads(stdout)["include"]
+        self.assertEqual(len(include), 2 * (1 + len(TEST_DATA["environments"]["dev"]["additional_aws_regions"])))
+        output = os.path.join(self.directory.name, "github_output")
+        with mock.patch.dict(os.environ, {"GITHUB_OUTPUT": output}):
+            self.assertEqual(run("matrix", self.yaml_file, "--github-output", "matrix"), (0, "", ""))
+        with open(output, 'r') as file:
+            key, value = file.read().rstrip("\n").split("=", 1)
+        self.assertEqual((key, len(json.loads(value)["include"])), ("matrix", 6))
+
+    def test_query(self):
+        index = os.path.join(self.directory.name, "fleet.index")
+        cluster = f"cluster={TEST_DATA['environments']['prod']['cluster']}"
+        code, stdout, _ = run("query", "--from", self.directory.name, "--save", index, cluster)
+        self.assertEqual((code, stdout), (0, f"{TEST_DATA['service']}\n"))
+        code, stdout, _ = run("query", "--index", index, "--paths", cluster, "aws_region=eu-west-1")
+        self.assertEqual((code, stdout), (0, f"{self.yaml_file}\n"))
+        self.assertEqual(run("query", "--index", index, "cluster=missing"), (0, "", ""))
+        code, _, stderr = run("query", "--index", index, "owner=team")
+        self.assertEqual(code, 1)
+        self.assertIn("Unknown index field 'owner'", stderr)
+
+    @unittest.skipIf(shutil.which("git") is None, "git is not installed")
+    def test_changes_from_a_commit_range(self):
+        def git(*arguments: str) -> str:
+            environment = dict(os.environ, GIT_AUTHOR_NAME="ci", GIT_AUTHOR_EMAIL="ci@example.com",
+                               GIT_COMMITTER_NAME="ci", GIT_COMMITTER_EMAIL="ci@example.com")
+            return subprocess.run(["git", "-C", self.directory.name, *arguments], env=environment, check=True,
+                                  capture_output=True, text=True).stdout.strip()
+
+        git("init", "-q")
+        git("add", "-A")
+        git("commit", "-q", "-m", "configs")
+        os.makedirs(os.path.join(self.directory.name, "path", "to", "helm"))
+        with open(os.path.join(self.directory.name, "path", "to", "helm", "values.yaml"), 'w') as file:
+            file.write("replicas: 2\n")
+        git("add", "-A")
+        git("commit", "-q", "-m", "chart")
+        code, stdout, _ = run("changes", self.yaml_file, self.json_file, "--range", "HEAD~1..HEAD",
+                              "--repo", self.directory.name)
+        self.assertEqual(code, 0)
+        lines = [json.loads(line) for line in stdout.splitlines()]
+        self.assertEqual([line["file"] for line in lines], [self.yaml_file, self.json_file])
+        self.assertEqual({group: value["hasModifications"] for group, value in lines[0]["path_monitor"].items()},
+                         {"application": False, "helm_charts": True})
+        code, _, stderr = run("changes", self.yaml_file, "--range", "missing..HEAD", "--repo", self.directory.name)
+        self.assertEqual(code, 1)
+        self.assertIn("Unknown revision 'missing'", stderr)
+
+    def test_client_falls_back_to_in_process_parsing(self):
+        socket_path = os.path.join(self.directory.name, "missing.sock")
+        code, stdout, _ = run("client", "--socket", socket_path, "get", "service", self.yaml_file)
+        self.assertEqual((code, stdout), (0, f"{TEST_DATA['service']}\n"))
+        code, stdout, _ = run("client", "--socket", socket_path, "manifest", "-e", "prod", self.yaml_file)
+        self.assertEqual(json.loads(stdout)["environment"], "prod")
+        code, _, stderr = run("client", "--socket", socket_path, "--no-fallback", "get", "service", self.yaml_file)
+        self.assertEqual(code, 1)
+        self.assertIn("no daemon running", stderr)
+
+    def test_client_control_operations_need_a_running_daemon(self):
+        socket_path = os.path.join(self.directory.name, "missing.sock")
+        for operation in ("ping", "stats", "shutdown"):
+            with self.subTest(operation):
+                code, stdout, stderr = run("client", "--socket", socket_path, operation)
+                self.assertEqual((code, stdout), (1, ""))
+                self.assertIn(f"cli.py client: error: no daemon running on {socket_path}", stderr)
+
+    def test_validate(self):
+        self.assertEqual(run("validate", self.yaml_file, self.json_file), (0, "", ""))
+        invalid = dict(TEST_DATA, enable_tests="yes")
+        code, stdout, _ = run("validate", stdin=json.dumps(invalid))
+        self.assertEqual(code, 1)
+        self.assertEqual(stdout, "-: enable_tests: expected bool but got str\n")
+
+    def test_validate_reports_malformed_files_and_goes_on(self):
+        malformed = os.path.join(self.directory.name, "malformed.yaml")
+        with open(malformed, 'w') as file:
+            file.write("service: [unclosed\n")
+        invalid = os.path.join(self.directory.name, "invalid.json")
+        with open(invalid, 'w') as file:
+            json.dump(dict(TEST_DATA, enable_tests="yes"), file)
+        code, stdout, stderr = run("validate", malformed, self.yaml_file, invalid)
+        self.assertEqual((code, stderr), (1, ""))
+        lines = stdout.splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith(f"{malformed}: <root>: not valid YAML or JSON: while parsing"))
+        self.assertEqual(lines[1], f"{invalid}: enable_tests: expected bool but got str")
+
+    def test_errors_exit_with_status_1(self):
+        code, _, stderr = run("parse", os.path.join(self.directory.name, "missing.yaml"))
+        self.assertEqual(code, 1)
+        self.assertIn("cli.py parse: error:", stderr)
+        self.assertEqual(run()[0], 2)
+        malformed = os.path.join(self.directory.name, "malformed.yaml")
+        with open(malformed, 'w') as file:
+            file.write("service: [unclosed\n")
+        code, _, stderr = run("parse", malformed)
+        self.assertEqual(code, 1)
+        self.assertIn(f"cli.py parse: error: {malformed}: not valid YAML or JSON: while parsing", stderr)
+        code, _, stderr = run("parse", "-", stdin="{not json")
+        self.assertEqual((code, stderr.count("\n")), (1, 1))
+
+
+class TestStartup(TestCase):
+    def test_heavy_modules_are_deferred(self):
+        script = f"import sys, cli; print([name for name in {DEFERRED_MODULES!r} if name in sys.modules])"
+        output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "[]")
+
+    def test_startup_time_budget(self):
+        timings = []
+        for _ in range(3):
+            output = subprocess.run([sys.executable, "-X", "importtime", "-c", "import cli"], cwd=ROOT,
+                                    capture_output=True, text=True, check=True)
+            line = [line for line in output.stderr.splitlines() if line.rstrip().endswith("| cli")][0]
+            timings.append(int(line.split("|")[1]) / 1000)
+        self.assertLess(min(timings), STARTUP_BUDGET_MS)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+from unittest import TestCase
+
+from benchmarks.Synthetic import make_gitops_dict
+from cicd.Codecs import codec_for
+from cicd.GitOpsDataClasses import GitOps, PathConfiguration, SlackChannel
+from tests.Fixtures import TEST_DATA
+
+
+class TestCodecs(TestCase):
+    def test_matches_hand_written_paths(self):
+        for data in (TEST_DATA, make_gitops_dict(environments=6, regions=3, path_groups=4, slack_channels=2)):
+            codec = codec_for(GitOps)
+            gitops = codec.from_dict(data)
+            self.assertEqual(gitops, GitOps.from_dict(data))
+            self.assertEqual(codec.to_dict(gitops), data)
+            self.assertEqual(codec.to_dict(gitops), gitops.to_dict())
+
+    def test_aliases_and_defaults(self):
+        channel = codec_for(SlackChannel).from_dict({"id": "C1", "name": "#ci"})
+        self.assertEqual(channel, SlackChannel("C1", "#ci"))
+        self.assertEqual(codec_for(SlackChannel).to_dict(channel), {"id": "C1", "name": "#ci"})
+        self.assertEqual(codec_for(PathConfiguration).from_dict({"paths": ["a/.*"]}),
+                         PathConfiguration(False, ["a/.*"]))
+
+    def test_type_errors(self):
+        codec = codec_for(PathConfiguration)
+        with self.assertRaisesRegex(TypeError, r"PathConfiguration.paths\[\]: expected str but got int"):
+            codec.from_dict({"paths": [1]})
+        with self.assertRaisesRegex(TypeError, "PathConfiguration.has_modifications: expected bool"):
+            codec.from_dict({"hasModifications": 1, "paths": []})
+        with self.assertRaisesRegex(TypeError, "GitOps: expected dict but got list"):
+            codec_for(GitOps).from_dict([])
+
+    def test_codecs_are_compiled_once(self):
+        self.assertIs(codec_for(GitOps), codec_for(GitOps))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import copy
+import gc
+import tracemalloc
+import unittest
+from collections import Counter
+from unittest import TestCase
+
+from benchmarks.Synthetic import make_fleet, make_gitops_dict
+from cicd.ColumnarFleet import ColumnarFleet
+from cicd.GitOpsDataClasses import GitOps, SlackChannelPool
+from tests.Fixtures import TEST_DATA
+
+
+def traced_memory(build) -> int:
+    """
+    :return: The bytes still allocated by build() while its result is alive, measured with tracemalloc.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        allocated = tracemalloc.get_traced_memory()[0] - before
+        del result
+        return allocated
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+class TestColumnarFleet(TestCase):
+    def setUp(self):
+        data = copy.deepcopy(TEST_DATA)
+        data["environments"]["demo"]["enabled"] = False
+        data["slack"]["channels"]["qa"] = {"cd": [], "ci": []}
+        self.configs = [GitOps.from_dict(data)] + [GitOps.from_dict(make_gitops_dict(number, environments=4,
+                                                                                     regions=2, slack_channels=2))
+                                                   for number in range(1, 30)]
+        self.fleet = ColumnarFleet.from_configs(self.configs)
+
+    def test_strings_are_interned_once(self):
+        environments = self.fleet.environments
+        self.assertEqual(len(environments), sum(len(gitops.environments) for gitops in self.configs))
+        self.assertEqual(len(self.fleet.strings), len(set(self.fleet.strings.strings)))
+        self.assertEqual(environments.values("environment")[:3], ["dev", "demo", "prod"])
+
+    def test_where_and_count_by_match_the_objects(self):
+        environments = self.fleet.environments
+        expected = Counter(environment.aws_region for gitops in self.configs
+                           for environment in gitops.environments.values()
+                           if environment.environment == "prod" and environment.enabled)
+        rows = environments.where(environment="prod", enabled=True)
+        self.assertEqual(environments.count_by("aws_region", rows=rows), dict(expected.most_common()))
+        self.assertEqual(len(environments.where(rows, aws_region="us-east-1")), expected["us-east-1"])
+        self.assertEqual(len(environments.where(environment="demo", enabled=False)), 1)
+        self.assertEqual(len(environments.where(cluster="missing")), 0)
+        self.assertEqual(len(environments.where()), len(environments))
+
+    def test_count_by_several_columns_and_lists(self):
+        environments = self.fleet.environments
+        counts = environments.count_by("environment", "enabled")
+        self.assertEqual(counts[("demo", False)], 1)
+        self.assertEqual(sum(counts.values()), len(environments))
+        regions = environments.count_by("additional_aws_regions", rows=environments.rows_of(0))
+        self.assertEqual(regions, {"us-west-2": 1, "us-east-1": 1, "eu-west-1": 1})
+        accounts = self.fleet.accounts
+        self.assertEqual(accounts.count_by("enabled", rows=accounts.rows_of(0)), {True: 2, False: 1})
+        self.assertEqual(len(accounts.where(aws_account_id=str(self.configs[0].environment_promotion_phases
+                                                               ["01-dev"].aws_account_id))), 1)
+        with self.assertRaisesRegex(ValueError, "Unknown column 'owner'"):
+            environments.count_by("owner")
+        with self.assertRaises(ValueError):
+            environments.where(additional_aws_regions="us-west-2")
+
+    def test_round_trip_to_models(self):
+        pool = SlackChannelPool()
+        for number, gitops in enumerate(self.configs):
+            self.assertEqual(self.fleet.application(number).to_dict(), {
+                key: value for key, value in gitops.to_dict().items() if isinstance(value, (str, bool))})
+            self.assertEqual(self.fleet.environments_of(number), gitops.environments)
+            self.assertEqual(self.fleet.environment_promotion_phases_of(number), gitops.environment_promotion_phases)
+            self.assertEqual(self.fleet.slack_channels_of(number, pool), gitops.slack.channels)
+        self.assertIn("qa", self.fleet.slack_channels_of(0))
+
+    def test_uses_a_fraction_of_the_memory_of_the_objects(self):
+        fleet = make_fleet(200, environments=3, path_groups=2, slack_channels=2)
+        objects = traced_memory(lambda: [GitOps.from_dict(config) for config in fleet])
+        columnar = traced_memory(lambda: ColumnarFleet.from_configs(GitOps.from_dict(config) for config in fleet))
+        self.assertLess(columnar, objects * 0.75)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import copy
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from unittest import TestCase
+
+from cicd.Daemon import (ConfigStore, DaemonClient, DaemonError, DaemonServer, DaemonUnavailable, answer, ping,
+                         query)
+from cicd.GitOpsDataClasses import GitOps
+from tests.Fixtures import TEST_DATA
+
+
+def write_config(path: str, data: dict, mtime_ns: int) -> None:
+    with open(path, 'w') as file:
+        json.dump(data, file)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestConfigStore(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "gitops.json")
+        self.data = copy.deepcopy(TEST_DATA)
+        write_config(self.path, self.data, 1_000_000_000)
+        self.store = ConfigStore()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_parses_again_only_changed_files(self):
+        gitops = self.store.get(self.path)
+        self.assertEqual(gitops, GitOps.from_dict(TEST_DATA))
+        self.assertIs(self.store.get(self.path), gitops)
+        self.assertEqual(self.store.refresh(), 0)
+        self.assertEqual((self.store.loads, self.store.hits), (1, 1))
+
+        self.data["environments"]["prod"]["cluster"] = "prod-eks-2"
+        write_config(self.path, self.data, 2_000_000_000)
+        self.assertEqual(self.store.refresh(), 1)
+        changed = self.store.get(self.path)
+        self.assertEqual(changed.environments["prod"].cluster, "prod-eks-2")
+        self.assertIs(changed.environments["dev"], gitops.environments["dev"])
+        self.assertIs(changed.slack, gitops.slack)
+
+    def test_forgets_removed_files(self):
+        self.store.get(self.path)
+        os.unlink(self.path)
+        self.store.refresh()
+        self.assertEqual(self.store.configs, {})
+
+
+class TestDaemon(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.directory.name, "daemon.sock")
+        self.path = os.path.join(self.directory.name, "gitops.json")
+        self.data = copy.deepcopy(TEST_DATA)
+        write_config(self.path, self.data, 1_000_000_000)
+        self.server = DaemonServer(self.socket_path, poll_interval=0.05)
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.directory.cleanup()
+
+    def test_queries(self):
+        with DaemonClient(self.socket_path) as client:
+            self.assertEqual(client.request(op="ping")["pid"], os.getpid())
+            self.assertEqual(client.request(op="get", path=self.path, key="environments.prod.cluster"),
+                             TEST_DATA["environments"]["prod"]["cluster"])
+            manifest = client.request(op="manifest", path=self.path, environment="demo")
+            self.assertEqual(manifest["cluster"], TEST_DATA["environments"]["demo"]["cluster"])
+            self.assertEqual(client.request(op="parse", path=self.path), TEST_DATA)
+            with self.assertRaisesRegex(DaemonError, "unknown environment 'qa'"):
+                client.request(op="manifest", path=self.path, environment="qa")
+            with self.assertRaisesRegex(DaemonError, "FileNotFoundError"):
+                client.request(op="parse", path=self.path + ".missing")
+            self.assertEqual(client.request(op="stats"), {"configs": 1, "loads": 1, "hits": 3})
+
+    def test_reports_malformed_configs_and_keeps_the_connection(self):
+        malformed = os.path.join(self.directory.name, "gitops.yaml")
+        with open(malformed, 'w') as file:
+            file.write("service: [unclosed\n")
+        with DaemonClient(self.socket_path) as client:
+            with self.assertRaisesRegex(DaemonError, "ValueError: .*not valid YAML or JSON"):
+                client.request(op="parse", path=malformed)
+            self.assertEqual(client.request(op="get", path=self.path, key="service"), TEST_DATA["service"])
+        # The in-process fallback would raise the ValueError itself.
+        with self.assertRaisesRegex(DaemonError, "not valid YAML or JSON"):
+            query(self.socket_path, op="parse", path=malformed)
+
+    def test_no_fallback_when_the_daemon_closes_the_connection(self):
+        closing_path = os.path.join(self.directory.name, "closing.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(closing_path)
+            listener.listen(1)
+
+            def accept_and_close():
+                connection, _ = listener.accept()
+                connection.recv(4096)
+                connection.close()
+
+            closer = threading.Thread(target=accept_and_close, daemon=True)
+            closer.start()
+            with self.assertRaisesRegex(DaemonError, "closed the connection") as context:
+                query(closing_path, op="get", path=self.path, key="service")
+            self.assertNotIsInstance(context.exception, DaemonUnavailable)
+            closer.join()
+
+    def test_serves_changed_files(self):
+        query(self.socket_path, op="get", path=self.path, key="service")
+        self.data["service"] = "renamed"
+        write_config(self.path, self.data, 2_000_000_000)
+        self.assertEqual(query(self.socket_path, fallback=False, op="get", path=self.path, key="service"), "renamed")
+
+    def test_refuses_a_second_daemon(self):
+        with self.assertRaises(DaemonError):
+            DaemonServer(self.socket_path)
+
+    def test_fallback_without_daemon(self):
+        missing = os.path.join(self.directory.name, "missing.sock")
+        self.assertIsNone(ping(missing))
+        self.assertEqual(query(missing, op="get", path=self.path, key="service"), TEST_DATA["service"])
+        with self.assertRaises(DaemonUnavailable):
+            query(missing, fallback=False, op="get", path=self.path, key="service")
+
+    def test_control_operations_need_a_running_daemon(self):
+        missing = os.path.join(self.directory.name, "missing.sock")
+        for operation in ("ping", "stats", "shutdown"):
+            with self.subTest(operation):
+                with self.assertRaisesRegex(DaemonUnavailable, "no daemon running"):
+                    query(missing, op=operation)
+        with self.assertRaisesRegex(DaemonError, "handled by the daemon server only"):
+            answer(ConfigStore(), {"op": "shutdown"})
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
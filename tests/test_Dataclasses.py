@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import copy
+import pickle
 import unittest
-from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, FrozenInstanceError
 from unittest import TestCase
 
-from cicd.GitOpsDataClasses import GitOps, AwsAccount, gitops_from_dict
+from cicd.GitOpsDataClasses import GitOps, AwsAccount, LazyGitOps, Manifest, gitops_from_dict
 from tests.Fixtures import TEST_DATA
 
 
@@ -39,5 +42,83 @@ class TestGitOps(TestCase):
         self.assertEqual(result, expected)
 
 
+class TestManifest(TestCase):
+    def setUp(self):
+        self.gitops = GitOps.from_dict(TEST_DATA)
+
+    def test_from_gitops_returns_instances(self):
+        dev = Manifest.from_gitops(self.gitops, 'dev')
+        prod = Manifest.from_gitops(self.gitops, 'prod')
+        self.assertIsInstance(dev, Manifest)
+        self.assertEqual(dev.cluster, "dev-cluster")
+        self.assertEqual(prod.cluster, "prod-cluster")
+        self.assertEqual(dev.service, "some-service")
+        with self.assertRaises(FrozenInstanceError):
+            dev.cluster = "other"
+
+    def test_to_dict(self):
+        result = Manifest.from_gitops(self.gitops, 'demo').to_dict()
+        expected = {key: value for key, value in TEST_DATA.items() if not isinstance(value, dict)}
+        expected.update({key: value for key, value in TEST_DATA["environments"]["demo"].items()
+                         if key != "additional_aws_regions"})
+        self.assertEqual(result, expected)
+
+    def test_all_from_gitops(self):
+        manifests = Manifest.all_from_gitops(self.gitops)
+        self.assertEqual(list(manifests), ["dev", "demo", "prod"])
+        self.assertEqual(manifests["demo"], Manifest.from_gitops(self.gitops, 'demo'))
+
+    def test_all_from_gitops_in_thread_pool(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(Manifest.all_from_gitops, [self.gitops] * 32))
+        self.assertTrue(all(result == results[0] for result in results))
+
+
+class TestLazyGitOps(TestCase):
+    def setUp(self):
+        self.data = copy.deepcopy(TEST_DATA)
+
+    def test_parses_sections_on_first_access(self):
+        gitops = GitOps.from_dict(self.data, lazy=True)
+        self.assertIsInstance(gitops, LazyGitOps)
+        self.assertEqual(gitops.service, TEST_DATA["service"])
+        self.assertNotIn("environments", vars(gitops))
+        environments = gitops.environments
+        self.assertIs(gitops.environments, environments)
+        self.assertNotIn("slack", vars(gitops))
+        self.assertEqual(Manifest.from_gitops(gitops, 'demo'),
+                         Manifest.from_gitops(GitOps.from_dict(TEST_DATA), 'demo'))
+
+    def test_matches_eager_mode(self):
+        eager = gitops_from_dict(TEST_DATA)
+        lazy = gitops_from_dict(self.data, lazy=True)
+        self.assertEqual(lazy, eager)
+        self.assertEqual(eager, lazy)
+        self.assertEqual(lazy.to_dict(), eager.to_dict())
+        self.assertTrue(GitOps.diff(eager, lazy).unchanged)
+        self.assertEqual(pickle.loads(pickle.dumps(lazy)), eager)
+
+    def test_keeps_only_the_sections_of_the_raw_dictionary(self):
+        gitops = GitOps.from_dict(self.data, lazy=True)
+        self.data["environments"] = {}
+        self.assertEqual(gitops.environments, GitOps.from_dict(TEST_DATA).environments)
+        with self.assertRaises(TypeError):
+            hash(gitops)
+
+    def test_malformed_section_raises_on_access(self):
+        self.data["path_monitor"] = ["not", "a", "mapping"]
+        gitops = GitOps.from_dict(self.data, lazy=True)
+        self.assertEqual(gitops.environments, GitOps.from_dict(TEST_DATA).environments)
+        with self.assertRaises(TypeError):
+            _ = gitops.path_monitor
+        with self.assertRaises(TypeError):
+            GitOps.from_dict(self.data)
+
+    def test_application_fields_are_checked_up_front(self):
+        self.data["is_mono_repo"] = "yes"
+        with self.assertRaises(TypeError):
+            GitOps.from_dict(self.data, lazy=True)
+
+
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()  # pragma: no cover
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import copy
+import unittest
+from unittest import TestCase
+
+from cicd.GitOpsDataClasses import GitOps
+from cicd.Validation import ValidationFailed
+from tests.Fixtures import TEST_DATA
+
+
+class TestDiff(TestCase):
+    def setUp(self):
+        self.gitops = GitOps.from_dict(TEST_DATA)
+        self.data = copy.deepcopy(TEST_DATA)
+
+    def test_rebuild_without_changes_returns_previous(self):
+        self.assertIs(self.gitops.rebuild(self.data), self.gitops)
+        self.assertTrue(GitOps.diff(self.gitops, self.gitops).unchanged)
+
+    def test_rebuild_reuses_unchanged_subtrees(self):
+        self.data["environments"]["demo"]["enabled"] = False
+        self.data["slack"]["channels"]["dev"]["cd"][0]["name"] = "#renamed"
+        new = self.gitops.rebuild(self.data)
+        self.assertEqual(new, GitOps.from_dict(self.data))
+        self.assertIs(new.environment_promotion_phases, self.gitops.environment_promotion_phases)
+        self.assertIs(new.path_monitor, self.gitops.path_monitor)
+        self.assertIs(new.environments["dev"], self.gitops.environments["dev"])
+        self.assertIsNot(new.environments["demo"], self.gitops.environments["demo"])
+        self.assertIs(new.slack.channels["prod"], self.gitops.slack.channels["prod"])
+        self.assertIs(new.slack.channels["dev"].ci, self.gitops.slack.channels["dev"].ci)
+
+        result = GitOps.diff(self.gitops, new)
+        self.assertEqual(result.changes, ("environments.demo.enabled", "slack.channels.dev.cd"))
+        self.assertEqual(result.sections, ("environments", "slack"))
+        self.assertEqual(result.affected_environments, ("demo",))
+
+    def test_added_environment_and_application_changes(self):
+        self.data["environments"]["qa"] = dict(self.data["environments"]["dev"], environment="qa")
+        self.assertEqual(GitOps.diff(self.gitops, self.gitops.rebuild(self.data)).affected_environments, ("qa",))
+        self.data["service"] = "other-service"
+        result = GitOps.diff(self.gitops, self.gitops.rebuild(self.data))
+        self.assertEqual(result.changes, ("service", "environments.qa"))
+        self.assertEqual(result.affected_environments, ("dev", "demo", "prod", "qa"))
+
+    def test_changes_outside_manifest_fields(self):
+        self.data["environments"]["prod"]["additional_aws_regions"] = ["eu-west-1"]
+        self.data["path_monitor"]["application"]["hasModifications"] = False
+        result = GitOps.diff(self.gitops, GitOps.from_dict(self.data))
+        self.assertEqual(result.changes, ("environments.prod.additional_aws_regions",
+                                          "path_monitor.application.hasModifications"))
+        self.assertEqual(result.affected_environments, ())
+
+    def test_rebuild_validates(self):
+        self.data["environments"]["dev"]["enabled"] = "yes"
+        with self.assertRaisesRegex(ValidationFailed, "environments.dev.enabled"):
+            self.gitops.rebuild(self.data)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()  # pragma: no cover
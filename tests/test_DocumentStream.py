@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+
+from benchmarks.Synthetic import make_gitops_dict
+from cicd.DocumentStream import JSONL, StreamError, iter_documents, iter_gitops, stream_format
+from cicd.GitOpsDataClasses import GitOps, SlackChannelPool
+from cicd.YamlIO import dump_yaml_all
+from tests.Fixtures import TEST_DATA
+
+
+class TestDocumentStream(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.documents = [make_gitops_dict(number, environments=2, regions=1) for number in range(5)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'wb') as file:
+            file.write(content)
+        return path
+
+    def jsonl(self, documents: list) -> bytes:
+        return "".join(json.dumps(document) + "\n" for document in documents).encode()
+
+    def yaml(self, documents: list) -> bytes:
+        stream = io.StringIO()
+        dump_yaml_all(documents, stream, explicit_start=True)
+        return stream.getvalue().encode()
+
+    def test_stream_format(self):
+        self.assertEqual(stream_format("fleet.jsonl"), JSONL)
+        self.assertEqual(stream_format("fleet.ndjson"), JSONL)
+        self.assertEqual(stream_format("fleet.yaml"), "yaml")
+        with self.assertRaises(ValueError):
+            list(iter_documents(self.write("fleet.yaml", b"a: 1\n"), "xml"))
+
+    def test_jsonl_and_yaml_streams_parse_every_document(self):
+        expected = [GitOps.from_dict(document) for document in self.documents]
+        jsonl = self.write("fleet.jsonl", self.jsonl(self.documents))
+        yaml = self.write("fleet.yaml", self.yaml(self.documents))
+        self.assertEqual(list(iter_gitops(jsonl)), expected)
+        self.assertEqual(list(iter_gitops(yaml)), expected)
+        with open(yaml, 'rb') as file:
+            self.assertEqual(list(iter_gitops(file)), expected)
+        with open(jsonl, 'rb') as file:
+            self.assertEqual(list(iter_gitops(file, JSONL)), expected)
+
+    def test_yaml_stream_boundaries(self):
+        content = (b"# a comment\na: 1\n---\nb: |\n  text\n--- {c: 3}\n...\n---\n# only a comment\n---\n"
+                   b"---not-a-marker: 4\n")
+        self.assertEqual(list(iter_documents(self.write("fleet.yaml", content))),
+                         [{"a": 1}, {"b": "text\n"}, {"c": 3}, {"---not-a-marker": 4}])
+
+    def test_empty_files(self):
+        self.assertEqual(list(iter_documents(self.write("empty.jsonl", b""))), [])
+        self.assertEqual(list(iter_documents(self.write("empty.yaml", b""))), [])
+        self.assertEqual(list(iter_documents(self.write("blank.jsonl", b"\n\n"))), [])
+
+    def test_malformed_documents_raise_with_their_offset(self):
+        content = self.jsonl(self.documents[:2]) + b"{not json\n"
+        with self.assertRaises(StreamError) as context:
+            list(iter_gitops(self.write("fleet.jsonl", content)))
+        malformed = context.exception.malformed
+        self.assertEqual((malformed.index, malformed.offset, malformed.line),
+                         (2, len(self.jsonl(self.documents[:2])), 3))
+        self.assertIn("byte", str(context.exception))
+
+    def test_malformed_documents_are_skipped_and_reported(self):
+        invalid = dict(TEST_DATA, environments="not a mapping")
+        for name, serialize in (("fleet.jsonl", self.jsonl), ("fleet.yaml", self.yaml)):
+            with self.subTest(name):
+                head = serialize(self.documents[:2])
+                content = head + serialize([invalid]) + (b"{broken\n" if name.endswith("jsonl") else b"---\n[a\n")
+                content += serialize(self.documents[2:])
+                reported = []
+                configs = list(iter_gitops(self.write(name, content), skip_invalid=True, on_error=reported.append))
+                self.assertEqual([gitops.service for gitops in configs],
+                                 [document["service"] for document in self.documents])
+                self.assertEqual([malformed.index for malformed in reported], [2, 3])
+                self.assertEqual(reported[0].offset, len(head))
+                self.assertTrue(content[reported[1].offset:].startswith(b"{broken" if name.endswith("jsonl")
+                                                                         else b"---\n[a"))
+                self.assertEqual(reported[1].line, content[:reported[1].offset].count(b"\n") + 1)
+
+    def test_shared_slack_channel_pool(self):
+        pool = SlackChannelPool()
+        configs = list(iter_gitops(self.write("fleet.jsonl", self.jsonl([TEST_DATA, TEST_DATA])),
+                                   slack_channel_pool=pool))
+        self.assertIs(configs[0].slack.channels["dev"].cd[0], configs[1].slack.channels["dev"].cd[0])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from unittest import TestCase, mock
+
+from cicd.Exporter import export_key, export_path, flatten, format_exports, write_exports
+from cicd.GitOpsDataClasses import GitOps, Manifest
+from cicd.Utils import is_float
+from tests.Fixtures import TEST_DATA
+
+
+def parse_github_file(text: str) -> dict:
+    """
+    Reads KEY=value lines and KEY<<DELIMITER blocks the way the GitHub Actions runner does.
+    """
+    values = {}
+    lines = iter(text.split("\n"))
+    for line in lines:
+        if "<<" in line and ("=" not in line or line.index("<<") < line.index("=")):
+            key, delimiter = line.split("<<", 1)
+            block = []
+            for block_line in lines:
+                if block_line == delimiter:
+                    break
+                block.append(block_line)
+            values[key] = "\n".join(block)
+        elif line:
+            key, value = line.split("=", 1)
+            values[key] = value
+    return values
+
+
+class TestExporter(TestCase):
+    def setUp(self):
+        self.gitops = GitOps.from_dict(TEST_DATA)
+
+    def test_export_key(self):
+        self.assertEqual(export_key("environments", "prod-eu", "cluster"), "ENVIRONMENTS_PROD_EU_CLUSTER")
+        self.assertEqual(export_key("", "app_of_apps"), "APP_OF_APPS")
+        self.assertEqual(export_key("billing.api", "service"), "BILLING_API_SERVICE")
+
+    def test_flatten_manifest(self):
+        manifest = Manifest.from_gitops(self.gitops, "prod")
+        values = dict(flatten(manifest))
+        self.assertEqual(values["CLUSTER"], TEST_DATA["environments"]["prod"]["cluster"])
+        self.assertEqual(len(values), len(manifest.to_dict()))
+        prefixed = flatten(manifest, prefix="svc")
+        self.assertTrue(all(key.startswith("SVC_") for key, _ in prefixed))
+
+    def test_github_format_round_trips(self):
+        pairs = flatten(self.gitops)
+        values = parse_github_file(format_exports(pairs))
+        self.assertEqual(values["ENVIRONMENTS_PROD_CLUSTER"], TEST_DATA["environments"]["prod"]["cluster"])
+        self.assertEqual(values["ENABLE_TESTS"], "true" if TEST_DATA["enable_tests"] else "false")
+        self.assertEqual(values["ENVIRONMENTS_DEV_ADDITIONAL_AWS_REGIONS"], '["us-west-2","us-east-1"]')
+        self.assertEqual(len(values), len(pairs))
+
+    def test_multiline_values_use_a_delimiter_not_in_any_value(self):
+        text = format_exports([("NOTES", "line 1\nEOF\nline 3"), ("NAME", "svc"), ("EMPTY", None)])
+        self.assertEqual(parse_github_file(text), {"NOTES": "line 1\nEOF\nline 3", "NAME": "svc", "EMPTY": ""})
+        delimiter = text.split("\n", 1)[0].split("<<", 1)[1]
+        self.assertNotIn(delimiter, "line 1\nEOF\nline 3")
+
+    def test_dotenv_format_quotes_and_escapes(self):
+        text = format_exports([("A", 'say "hi"\nbye'), ("B", False), ("C", 3), ("D", ["x"])], "dotenv")
+        self.assertEqual(text, 'A="say \\"hi\\"\\nbye"\nB=false\nC=3\nD="[\\"x\\"]"\n')
+        with self.assertRaises(ValueError):
+            format_exports([], "xml")
+
+    def test_write_exports_appends_in_one_write(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "github_output")
+            with open(path, 'w') as file:
+                file.write("EARLIER=1\n")
+            with mock.patch.dict(os.environ, {"GITHUB_OUTPUT": path}):
+                self.assertEqual(export_path("github-output"), path)
+                real_open = open
+                with mock.patch("builtins.open", side_effect=real_open) as opened:
+                    size = write_exports(flatten(self.gitops), export_path("github-output"))
+                self.assertEqual(opened.call_count, 1)
+            with open(path, 'r') as file:
+                content = file.read()
+        self.assertTrue(content.startswith("EARLIER=1\n"))
+        self.assertEqual(len(content.encode()), size + len("EARLIER=1\n"))
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(export_path("github-env"))
+        self.assertEqual(export_path("out.env"), "out.env")
+
+
+class TestIsFloat(TestCase):
+    def test_is_float(self):
+        self.assertTrue(is_float("1.5"))
+        self.assertFalse(is_float("1"))
+        self.assertFalse(is_float("1.5.2"))
+        self.assertFalse(is_float(1.5))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import copy
+import os
+import tempfile
+import unittest
+from unittest import TestCase, mock
+
+from cicd.Fingerprint import RENDER_STATE, RENDER_VERSION, RenderCache, canonical_bytes, fingerprint
+from cicd.GitOpsDataClasses import GitOps, Manifest
+from cicd.YamlIO import dump_yaml
+from tests.Fixtures import TEST_DATA
+
+
+def reversed_keys(data):
+    if isinstance(data, dict):
+        return {key: reversed_keys(data[key]) for key in reversed(list(data))}
+    if isinstance(data, list):
+        return [reversed_keys(item) for item in data]
+    return data
+
+
+class TestFingerprint(TestCase):
+    def test_independent_of_key_order(self):
+        self.assertEqual(canonical_bytes({"b": 1, "a": [2, {"d": 3, "c": 4}]}), b'{"a":[2,{"c":4,"d":3}],"b":1}')
+        original = GitOps.from_dict(TEST_DATA)
+        reordered = GitOps.from_dict(reversed_keys(TEST_DATA))
+        self.assertEqual(original.fingerprint, reordered.fingerprint)
+        self.assertEqual(Manifest.from_gitops(original, "prod").fingerprint,
+                         Manifest.from_gitops(reordered, "prod").fingerprint)
+
+    def test_changes_only_the_changed_sections(self):
+        original = GitOps.from_dict(TEST_DATA)
+        data = copy.deepcopy(TEST_DATA)
+        data["environments"]["prod"]["cluster"] = "prod-eks-2"
+        changed = GitOps.from_dict(data)
+        self.assertNotEqual(original.fingerprint, changed.fingerprint)
+        differing = {name for name, value in original.section_fingerprints.items()
+                     if changed.section_fingerprints[name] != value}
+        self.assertEqual(differing, {"environments"})
+        self.assertEqual(Manifest.from_gitops(original, "dev").fingerprint,
+                         Manifest.from_gitops(changed, "dev").fingerprint)
+        self.assertNotEqual(Manifest.from_gitops(original, "prod").fingerprint,
+                            Manifest.from_gitops(changed, "prod").fingerprint)
+
+    def test_lazy_and_eager_configs_agree(self):
+        self.assertEqual(GitOps.from_dict(TEST_DATA, lazy=True).fingerprint, GitOps.from_dict(TEST_DATA).fingerprint)
+        self.assertEqual(fingerprint(TEST_DATA["environments"]), GitOps.from_dict(TEST_DATA).section_fingerprints[
+            "environments"])
+
+
+class TestRenderCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.directory.name, "outputs", "manifest.yaml")
+        self.manifest = Manifest.from_gitops(GitOps.from_dict(TEST_DATA), "prod")
+        self.renders = 0
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def render(self, stream) -> None:
+        self.renders += 1
+        dump_yaml(self.manifest.to_dict(), stream)
+
+    def write(self, key: str) -> bool:
+        with RenderCache.for_output(self.output) as cache:
+            return cache.write(self.output, key, self.render)
+
+    def test_skips_unchanged_outputs(self):
+        key = RenderCache.key(self.manifest.fingerprint, "yaml")
+        self.assertTrue(self.write(key))
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, "outputs", RENDER_STATE)))
+        mtime = os.stat(self.output).st_mtime_ns
+        self.assertFalse(self.write(key))
+        self.assertEqual((self.renders, os.stat(self.output).st_mtime_ns), (1, mtime))
+        self.assertTrue(self.write(RenderCache.key(self.manifest.fingerprint, "json")))
+
+    def test_a_new_renderer_version_renders_again(self):
+        self.write(RenderCache.key(self.manifest.fingerprint, "yaml"))
+        with mock.patch("cicd.Fingerprint.RENDER_VERSION", RENDER_VERSION + 1):
+            self.assertTrue(self.write(RenderCache.key(self.manifest.fingerprint, "yaml")))
+        self.assertEqual(self.renders, 2)
+
+    def test_checks_the_content_when_the_file_was_touched(self):
+        key = RenderCache.key(self.manifest.fingerprint, "yaml")
+        self.write(key)
+        os.utime(self.output, ns=(1, 1))
+        self.assertFalse(self.write(key))
+        with open(self.output, 'r+') as file:
+            content = file.read()
+            file.seek(0)
+            file.write(content.replace("prod", "PROD"))
+        self.assertTrue(self.write(key))
+        os.remove(self.output)
+        self.assertTrue(self.write(key))
+        self.assertEqual(self.renders, 3)
+
+    def test_unreadable_state_renders_again(self):
+        key = RenderCache.key(self.manifest.fingerprint, "yaml")
+        self.write(key)
+        with open(os.path.join(self.directory.name, "outputs", RENDER_STATE), 'w') as file:
+            file.write("{not json")
+        self.assertTrue(self.write(key))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import TestCase
+
+from cicd.Fleet import FleetSummary, _caches, discover_gitops_files, load_service, run_fleet
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures')
+
+
+class TestFleet(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for service in ("billing", "checkout"):
+            os.makedirs(os.path.join(self.directory, service))
+            shutil.copy(os.path.join(FIXTURES, 'gitops.yaml'), os.path.join(self.directory, service, 'gitops.yaml'))
+        os.makedirs(os.path.join(self.directory, 'broken'))
+        with open(os.path.join(self.directory, 'broken', 'gitops.yaml'), 'w') as file:
+            file.write("name: broken\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_discover_directory_and_glob(self):
+        paths = discover_gitops_files(self.directory)
+        self.assertEqual([os.path.basename(os.path.dirname(path)) for path in paths], ["billing", "broken", "checkout"])
+        self.assertEqual(discover_gitops_files(os.path.join(self.directory, 'b*', 'gitops.yaml')), paths[:2])
+
+    def test_load_service(self):
+        result = load_service(os.path.join(FIXTURES, 'gitops.yaml'))
+        self.assertTrue(result.ok)
+        self.assertEqual(result.service, "devops")
+        self.assertEqual(result.manifest["cluster"], "dev-eks")
+
+    def test_load_service_reuses_one_cache_per_directory(self):
+        cache_directory = os.path.join(self.directory, 'cache')
+        path = os.path.join(self.directory, 'billing', 'gitops.yaml')
+        first = load_service(path, cache_directory=cache_directory)
+        second = load_service(path, cache_directory=cache_directory)
+        self.assertEqual(second.manifest, first.manifest)
+        cache = _caches.pop(cache_directory)
+        self.assertEqual((cache.misses, cache.hits), (1, 1))
+
+    def test_run_fleet_reports_failures(self):
+        paths = discover_gitops_files(self.directory)
+        for workers in (1, 2):
+            summary = FleetSummary(workers=workers)
+            results = list(run_fleet(paths, workers=workers, summary=summary))
+            self.assertEqual([result.path for result in results], paths)
+            self.assertEqual(summary.total, 3)
+            self.assertEqual([failure.path for failure in summary.failures], [paths[1]])
+            streamed = [result.to_dict() for result in results]
+            self.assertEqual(streamed[0]["manifest"]["cluster"], "dev-eks")
+            self.assertNotIn("manifest", streamed[1])
+            self.assertGreater(summary.elapsed, 0)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()  # pragma: no cover
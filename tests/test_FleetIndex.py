@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+
+from benchmarks.Synthetic import make_gitops_dict
+from cicd.FleetIndex import FleetIndex, FleetIndexError, index_terms
+from cicd.GitOpsDataClasses import GitOps
+from tests.Fixtures import TEST_DATA
+
+
+class TestFleetIndex(TestCase):
+    def setUp(self):
+        self.configs = [GitOps.from_dict(make_gitops_dict(number, environments=3, regions=2)) for number in range(20)]
+        self.index = FleetIndex.from_configs((f"services/{gitops.service}/gitops.yaml", gitops)
+                                             for gitops in self.configs)
+
+    def scan(self, predicate) -> list:
+        return [gitops.service for gitops in self.configs if predicate(gitops)]
+
+    def test_index_terms(self):
+        terms = set(index_terms(GitOps.from_dict(TEST_DATA)))
+        self.assertIn(("cluster", TEST_DATA["environments"]["prod"]["cluster"]), terms)
+        self.assertIn(("aws_region", "eu-west-1"), terms)
+        self.assertIn(("aws_account_id", str(TEST_DATA["environment_promotion_phases"]["03-prod"]["aws_account_id"])),
+                      terms)
+        self.assertIn(("slack_channel_id", TEST_DATA["slack"]["channels"]["dev"]["cd"][0]["id"]), terms)
+
+    def test_lookups_match_a_linear_scan(self):
+        gitops = self.configs[7]
+        cluster = gitops.environments["prod"].cluster
+        account = next(iter(gitops.environment_promotion_phases.values())).aws_account_id
+        self.assertEqual(self.index.query(cluster=cluster),
+                         self.scan(lambda g: any(e.cluster == cluster for e in g.environments.values())))
+        self.assertEqual(self.index.query(aws_account_id=account),
+                         self.scan(lambda g: any(a.aws_account_id == account
+                                                 for a in g.environment_promotion_phases.values())))
+        self.assertEqual(self.index.lookup("aws_account_id", account),
+                         self.index.lookup("aws_account_id", str(account)))
+        self.assertEqual(self.index.query(ecr_repository_name=gitops.ecr_repository_name), [gitops.service])
+        self.assertEqual(self.index.query(), [g.service for g in self.configs])
+        self.assertEqual(self.index.query(cluster="missing"), [])
+
+    def test_criteria_are_intersected(self):
+        gitops = self.configs[3]
+        matches = self.index.query(app_of_apps=gitops.app_of_apps, aws_region=gitops.environments["dev"].aws_region)
+        self.assertEqual(matches, self.scan(lambda g: g.app_of_apps == gitops.app_of_apps and any(
+            gitops.environments["dev"].aws_region in (e.aws_region, *e.additional_aws_regions)
+            for e in g.environments.values())))
+        self.assertIn(gitops.service, matches)
+        self.assertEqual(self.index.query(ecr_repository_name=gitops.ecr_repository_name,
+                                          helm_chart_repo="missing"), [])
+        with self.assertRaisesRegex(FleetIndexError, "Unknown index field 'owner'"):
+            self.index.query(owner="team")
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "fleet.index")
+            self.index.save(path)
+            loaded = FleetIndex.load(path)
+            for name in ("cluster", "aws_region", "slack_channel_id"):
+                self.assertEqual(loaded.values(name), self.index.values(name))
+            value = self.index.values("cluster")[0]
+            self.assertEqual(loaded.query(cluster=value), self.index.query(cluster=value))
+            self.assertEqual(loaded.source(0), f"services/{self.configs[0].service}/gitops.yaml")
+            with open(path, 'r+b') as file:
+                file.truncate(os.path.getsize(path) - 1)
+            with self.assertRaisesRegex(FleetIndexError, "truncated"):
+                FleetIndex.load(path)
+
+    def test_from_paths(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "gitops.json")
+            with open(path, 'w') as file:
+                json.dump(TEST_DATA, file)
+            index = FleetIndex.from_paths([path])
+        self.assertEqual(index.query(cluster=TEST_DATA["environments"]["dev"]["cluster"]), [TEST_DATA["service"]])
+        self.assertEqual(index.source(0), path)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
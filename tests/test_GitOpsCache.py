@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import TestCase, mock
+
+from cicd.GitOpsCache import CACHE_SUFFIX, GitOpsCache
+from cicd.GitOpsDataClasses import GitOps
+from tests.Fixtures import TEST_DATA
+
+
+class TestGitOpsCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = GitOpsCache(os.path.join(self.directory, 'cache'))
+        self.config = os.path.join(self.directory, 'gitops.json')
+        with open(self.config, 'w') as file:
+            json.dump(TEST_DATA, file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_hit_after_miss(self):
+        first = self.cache.load(self.config)
+        second = GitOpsCache(self.cache.directory).load(self.config)
+        self.assertEqual(first, GitOps.from_dict(TEST_DATA))
+        self.assertEqual(second, first)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+    def test_changed_content_misses(self):
+        self.cache.load(self.config)
+        with open(self.config, 'w') as file:
+            json.dump(dict(TEST_DATA, name="Changed"), file)
+        self.assertEqual(self.cache.load(self.config).name, "Changed")
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_corrupt_entry_is_reparsed(self):
+        self.cache.load(self.config)
+        with open(os.path.join(self.cache.directory, os.listdir(self.cache.directory)[0]), 'wb') as file:
+            file.write(b"not a pickle")
+        self.assertEqual(self.cache.load(self.config).name, TEST_DATA["name"])
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_incompatible_entries_are_reparsed(self):
+        self.cache.load(self.config)
+        entry = os.path.join(self.cache.directory, os.listdir(self.cache.directory)[0])
+        with open(entry, 'wb') as file:
+            file.write(b"\x80\x09")  # a pickle protocol this Python does not support
+        self.assertEqual(self.cache.load(self.config).name, TEST_DATA["name"])
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_key_depends_on_the_schema_of_the_models(self):
+        content = json.dumps(TEST_DATA).encode()
+        key = GitOpsCache.key(content)
+        with mock.patch("cicd.GitOpsCache.schema_hash", return_value=b"\0" * 8):
+            self.assertNotEqual(GitOpsCache.key(content), key)
+
+    def test_scans_the_directory_only_when_full(self):
+        with mock.patch.object(GitOpsCache, "_entries", wraps=self.cache._entries) as entries:
+            for name in "abcdef":
+                self.cache.loads(json.dumps(dict(TEST_DATA, name=name)).encode())
+            self.assertEqual(entries.call_count, 1)
+
+    def test_lru_eviction(self):
+        contents = {name: json.dumps(dict(TEST_DATA, name=name)).encode() for name in ("a", "b", "c")}
+        paths = {name: os.path.join(self.cache.directory, GitOpsCache.key(content) + CACHE_SUFFIX)
+                 for name, content in contents.items()}
+        self.cache.loads(contents["a"])
+        self.cache.loads(contents["b"])
+        os.utime(paths["a"], ns=(1, 1))
+        os.utime(paths["b"], ns=(2, 2))
+        self.cache.loads(contents["a"])  # the hit makes "a" the most recently used entry
+        self.cache.max_bytes = int(os.path.getsize(paths["a"]) * 2.5)
+        self.cache.loads(contents["c"])
+        self.assertEqual(sorted(name for name, path in paths.items() if os.path.exists(path)), ["a", "c"])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import unittest
+from unittest import TestCase
+
+import yaml
+
+from benchmarks.Synthetic import make_fleet
+from cicd.GitOpsDataClasses import Manifest, gitops_from_dict
+from cicd.ManifestRenderer import iter_manifests, render_manifests
+from cicd.YamlIO import SafeLoader
+
+
+class TestManifestRenderer(TestCase):
+    def setUp(self):
+        self.fleet = [gitops_from_dict(config) for config in make_fleet(4, environments=3)]
+
+    def expected(self, **kwargs) -> list:
+        return [manifest.to_dict() for manifest in iter_manifests(self.fleet, **kwargs)]
+
+    def test_yaml_stream(self):
+        stream = io.StringIO()
+        self.assertEqual(render_manifests(self.fleet, stream), len(self.expected()))
+        self.assertTrue(stream.getvalue().startswith("---\n"))
+        self.assertEqual(list(yaml.load_all(stream.getvalue(), Loader=SafeLoader)), self.expected())
+
+    def test_json_lines(self):
+        stream = io.StringIO()
+        count = render_manifests(self.fleet, stream, "jsonl", environments=["prod", "missing"], enabled_only=False)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(count, 4)
+        self.assertEqual([json.loads(line) for line in lines], self.expected(environments=["prod"], enabled_only=False))
+        self.assertEqual({json.loads(line)["environment"] for line in lines}, {"prod"})
+
+    def test_disabled_environments_are_skipped(self):
+        manifests = list(iter_manifests(self.fleet[:1]))
+        self.assertEqual(manifests, list(Manifest.all_from_gitops(self.fleet[0]).values()))
+        self.assertEqual(len(list(iter_manifests(self.fleet[:1], enabled_only=False))), 3)
+
+    def test_writes_incrementally(self):
+        for output_format, separator in (("yaml", "---\n"), ("jsonl", "\n")):
+            stream = io.StringIO()
+            written_before = []
+            render_manifests(self.observed(stream, separator, written_before), stream, output_format,
+                             enabled_only=False)
+            self.assertEqual(written_before, [0, 3, 6, 9])
+
+    def observed(self, stream: io.StringIO, separator: str, written_before: list):
+        for gitops in self.fleet:
+            written_before.append(stream.getvalue().count(separator))
+            yield gitops
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            render_manifests(self.fleet, io.StringIO(), "toml")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+import unittest
+from unittest import TestCase
+
+from cicd.GitOpsDataClasses import GitOps, PathConfiguration, PathMonitor
+from cicd.PathMatcher import PathMatcher, literal_prefix
+from tests.Fixtures import TEST_DATA
+
+PATTERNS = {
+    "application": [".github/workflows/cicd-roicalc.yaml", "roicalc/.*"],
+    "helm_charts": ["charts/roicalc/.*"],
+    "versions": [r"releases/v\d+\.\d+/notes\.md$", "^docs/(api|guides)/"],
+    "tests": ["tests?/.*_test.py"],
+}
+PATHS = [
+    ".github/workflows/cicd-roicalc.yaml", "xgithub/workflows/cicd-roicalc.yaml", ".github/workflows/other.yaml",
+    "roicalc/app.py", "roicalc", "charts/roicalc/values.yaml", "charts/other/values.yaml",
+    "releases/v1.2/notes.md", "releases/v1.2/notes.md.bak", "docs/api/index.md", "docs/blog/post.md",
+    "test/a_test.py", "tests/b_test.py", "tests/helper.py", "",
+]
+
+
+class TestPathMatcher(TestCase):
+    def setUp(self):
+        self.path_monitor = PathMonitor({group: PathConfiguration(False, patterns)
+                                         for group, patterns in PATTERNS.items()})
+        self.matcher = PathMatcher(self.path_monitor)
+
+    def test_literal_prefix(self):
+        self.assertEqual(literal_prefix("ab/.*"), (list("ab/"), ".*"))
+        self.assertEqual(literal_prefix(r"a\.b+"), (["a", "."], "b+"))
+        self.assertEqual(literal_prefix("^a|b"), ([], "^a|b"))
+
+    def test_matches_like_re_match(self):
+        for path in PATHS:
+            expected = {group for group, patterns in PATTERNS.items()
+                        if any(re.match(pattern, path) for pattern in patterns)}
+            self.assertEqual(self.matcher.groups_for(path), expected, path)
+
+    def test_apply_sets_has_modifications(self):
+        result = self.matcher.apply(iter(["roicalc/app.py\n", "docs/api/x.md\n"]))
+        self.assertEqual({group: configuration.has_modifications for group, configuration in result.items()},
+                         {"application": True, "helm_charts": False, "versions": True, "tests": False})
+        self.assertIs(result["helm_charts"], self.path_monitor["helm_charts"])
+        self.assertFalse(self.path_monitor["application"].has_modifications)
+
+    def test_stops_once_every_group_matched(self):
+        paths = iter(["roicalc/a", "charts/roicalc/b", "docs/guides/c", "test/d_test.py", "roicalc/e"])
+        self.assertEqual(self.matcher.matched_groups(paths), set(PATTERNS))
+        self.assertEqual(list(paths), ["roicalc/e"])
+
+    def test_path_monitor_with_changes(self):
+        path_monitor = GitOps.from_dict(TEST_DATA).path_monitor.with_changes(["path/to/helm/Chart.yaml"])
+        self.assertFalse(path_monitor["application"].has_modifications)
+        self.assertTrue(path_monitor["helm_charts"].has_modifications)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()  # pragma: no cover
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+from unittest import TestCase
+
+from cicd.Profiling import NULL_PROFILER, Profiler, activate, current, profiled
+
+
+@profiled("allocate")
+def allocate(size: int) -> int:
+    return len(bytearray(size))
+
+
+class TestProfiling(TestCase):
+    def test_disabled_by_default(self):
+        self.assertIs(current(), NULL_PROFILER)
+        with current().span("ignored"):
+            current().count("ignored")
+        self.assertEqual(allocate(10), 10)
+
+    def test_spans_and_counters(self):
+        profiler = Profiler()
+        with activate(profiler):
+            self.assertIs(current(), profiler)
+            for _ in range(3):
+                with current().span("stage"):
+                    current().count("items", 2)
+        self.assertIs(current(), NULL_PROFILER)
+        report = profiler.report()
+        self.assertEqual(report["spans"]["stage"]["count"], 3)
+        self.assertNotIn("peak_memory_bytes", report["spans"]["stage"])
+        self.assertEqual(report["counters"], {"items": 6})
+
+    def test_trace_memory_propagates_nested_peaks(self):
+        profiler = Profiler(trace_memory=True)
+        with activate(profiler):
+            with current().span("outer"):
+                allocate(1_000_000)
+                with current().span("inner"):
+                    pass
+        self.assertFalse(tracemalloc.is_tracing())
+        spans = profiler.report()["spans"]
+        self.assertGreaterEqual(spans["allocate"]["peak_memory_bytes"], 1_000_000)
+        self.assertGreaterEqual(spans["outer"]["peak_memory_bytes"], 1_000_000)
+        self.assertLess(spans["inner"]["peak_memory_bytes"], 1_000_000)
+
+    def test_trace_memory_keeps_the_peak_of_the_parent_before_a_child(self):
+        profiler = Profiler(trace_memory=True)
+        with activate(profiler):
+            with current().span("outer"):
+                buffer = bytearray(5_000_000)
+                del buffer
+                with current().span("inner"):
+                    pass
+        spans = profiler.report()["spans"]
+        self.assertGreaterEqual(spans["outer"]["peak_memory_bytes"], 5_000_000)
+        self.assertLess(spans["inner"]["peak_memory_bytes"], 1_000_000)
+
+    def test_write(self):
+        profiler = Profiler()
+        with activate(profiler):
+            allocate(1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.json")
+            profiler.write(path)
+            with open(path) as file:
+                self.assertEqual(json.load(file)["spans"]["allocate"]["count"], 1)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()  # pragma: no cover
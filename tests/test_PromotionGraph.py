@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import copy
+import pickle
+import unittest
+from unittest import TestCase
+
+from cicd.GitOpsDataClasses import GitOps
+from cicd.PromotionGraph import PromotionGraph, PromotionGraphError
+from tests.Fixtures import TEST_DATA
+
+
+class TestPromotionGraph(TestCase):
+    def setUp(self):
+        self.data = copy.deepcopy(TEST_DATA)
+
+    def test_lookups(self):
+        gitops = GitOps.from_dict(self.data)
+        graph = gitops.promotion_graph
+        self.assertIs(gitops.promotion_graph, graph)
+        self.assertEqual(graph.order, ("dev", "demo", "prod"))
+        self.assertEqual(graph.next("dev"), "demo")
+        self.assertIsNone(graph.next("prod"))
+        self.assertEqual(graph.previous("prod"), ("demo",))
+        self.assertEqual(graph.previous("dev"), ())
+        self.assertEqual(graph.account("demo").aws_account_id, 987654321)
+        self.assertEqual(graph.phases["prod"], "03-prod")
+        self.assertEqual(graph.chain("demo"), ("demo", "prod"))
+        self.assertEqual(pickle.loads(pickle.dumps(gitops)).promotion_graph, graph)
+
+    def test_topological_order_ignores_config_order(self):
+        environments = self.data["environments"]
+        self.data["environments"] = {name: environments[name] for name in ("prod", "dev", "demo")}
+        self.assertEqual(PromotionGraph.from_gitops(GitOps.from_dict(self.data)).order, ("dev", "demo", "prod"))
+
+    def test_reports_every_problem(self):
+        self.data["environments"]["prod"]["next_environment"] = "dev"
+        self.data["environments"]["qa"] = dict(self.data["environments"]["dev"], next_environment="staging")
+        self.data["environment_promotion_phases"]["04-dr"] = dict(
+            self.data["environment_promotion_phases"]["03-prod"], environment="dr")
+        self.data["environment_promotion_phases"]["05-prod"] = self.data["environment_promotion_phases"]["03-prod"]
+        with self.assertRaises(PromotionGraphError) as context:
+            PromotionGraph.from_gitops(GitOps.from_dict(self.data))
+        self.assertEqual(context.exception.problems, [
+            "environments.qa.next_environment: unknown environment 'staging'",
+            "environment_promotion_phases.04-dr.environment: unknown environment 'dr'",
+            "environment_promotion_phases.05-prod.environment: 'prod' is already promoted by 03-prod",
+            "environments: promotion cycle between dev, demo, prod",
+        ])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()  # pragma: no cover
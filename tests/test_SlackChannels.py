@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+from unittest import TestCase
+
+from cicd.GitOpsDataClasses import GitOps, SlackChannel, SlackChannelPool
+from cicd.YamlIO import load_yaml
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures')
+
+
+class TestSlackChannels(TestCase):
+    def setUp(self):
+        with open(os.path.join(FIXTURES, 'gitops.yaml'), 'rb') as file:
+            self.data = load_yaml(file)
+        self.gitops = GitOps.from_dict(self.data)
+
+    def test_channels_are_interned_within_a_config(self):
+        channels = self.gitops.slack.channels
+        self.assertIs(channels["dev"].cd[0], channels["default"].cd[0])
+        self.assertIs(channels["prod"].ci[0], channels["default"].ci[0])
+
+    def test_channels_are_interned_across_a_fleet(self):
+        pool = SlackChannelPool()
+        first = GitOps.from_dict(self.data, pool)
+        second = GitOps.from_dict(self.data, pool)
+        self.assertIs(first.slack.channels["demo"].cd[1], second.slack.channels["demo"].cd[1])
+        self.assertEqual(len(pool), 8)
+        self.assertEqual(first, self.gitops)
+
+    def test_resolve(self):
+        slack = self.gitops.slack
+        resolved = slack.resolve("dev", "cd")
+        self.assertEqual(resolved, (SlackChannel("C001C123456", "#deployment"),
+                                    SlackChannel("C001C123456", "#dev-alerts")))
+        self.assertIs(slack.resolve("dev", "cd"), resolved)
+        self.assertEqual(slack.resolve("qa", "ci"), (SlackChannel("C0015123456", "#ci"),))
+        with self.assertRaisesRegex(ValueError, "Unknown Slack channel kind 'cx'"):
+            slack.resolve("dev", "cx")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()  # pragma: no cover
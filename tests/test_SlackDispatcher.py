@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import email.utils
+import json
+import os
+import time
+import unittest
+from unittest import IsolatedAsyncioTestCase
+
+from cicd.GitOpsDataClasses import GitOps
+from cicd.SlackDispatcher import Notification, SlackDispatcher, dispatch, recipients, retry_delay
+from cicd.YamlIO import load_yaml
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures')
+
+
+class StubSlack:
+    """
+    Local HTTP/1.1 server answering chat.postMessage. Responses are taken from `script` in order (status, headers,
+    body), then default to {"ok": true}. With close_idle, every connection is closed after its first response without
+    a Connection: close header, as servers do when a keep-alive connection times out.
+    """
+
+    def __init__(self, script: list = None, delay: float = 0.0, close_idle: bool = False):
+        self.script = list(script or [])
+        self.delay = delay
+        self.close_idle = close_idle
+        self.posts = []
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/api"
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers["content-length"]))
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                await asyncio.sleep(self.delay)
+                self.in_flight -= 1
+                status, extra_headers, response = self.script.pop(0) if self.script else (200, {}, {"ok": True})
+                if status == 200:
+                    self.posts.append((request_line.decode().split()[1], headers["authorization"], json.loads(body)))
+                payload = json.dumps(response).encode()
+                head = [f"HTTP/1.1 {status} OK", f"Content-Length: {len(payload)}", "Content-Type: application/json"]
+                head.extend(f"{name}: {value}" for name, value in extra_headers.items())
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+                await writer.drain()
+                if self.close_idle:
+                    break
+        finally:
+            writer.close()
+
+
+class TestSlackDispatcher(IsolatedAsyncioTestCase):
+    def setUp(self):
+        with open(os.path.join(FIXTURES, 'gitops.yaml'), 'rb') as file:
+            self.slack = GitOps.from_dict(load_yaml(file)).slack
+
+    def test_recipients_are_unique_by_channel_id(self):
+        self.assertEqual(len(self.slack.resolve("dev", "cd")), 2)
+        self.assertEqual([channel.channel_id for channel in recipients(self.slack, "dev", "cd")], ["C001C123456"])
+
+    async def test_dispatch_batches_and_reuses_connections(self):
+        stub = StubSlack(delay=0.01)
+        api_url = await stub.start()
+        notifications = [Notification(environment, "cd", f"{environment} {number}")
+                         for number in range(5) for environment in ("dev", "demo", "prod")]
+        async with SlackDispatcher(self.slack, "xoxb-test", api_url, concurrency=2, batch_size=4) as dispatcher:
+            batches = dispatcher.batches(notifications)
+            deliveries = await dispatcher.dispatch(notifications)
+            await dispatcher.dispatch(notifications[:1])
+        await stub.stop()
+
+        self.assertTrue(all(delivery.ok for delivery in deliveries))
+        self.assertEqual(len(deliveries), len(batches))
+        self.assertEqual(sum(delivery.messages for delivery in deliveries),
+                         sum(len(recipients(self.slack, n.environment, "cd")) for n in notifications))
+        self.assertLessEqual(max(delivery.messages for delivery in deliveries), 4)
+        self.assertEqual(len(stub.posts), len(deliveries) + 1)
+        path, authorization, first = stub.posts[0]
+        self.assertEqual((path, authorization), ("/api/chat.postMessage", "Bearer xoxb-test"))
+        self.assertEqual(first["text"].splitlines()[0], "dev 0")
+        self.assertLessEqual(stub.max_in_flight, 2)
+        self.assertLessEqual(stub.connections, 2)
+
+    async def test_rate_limit_and_server_errors_are_retried(self):
+        stub = StubSlack([(429, {"Retry-After": "0"}, {"ok": False, "error": "ratelimited"}),
+                          (503, {}, {"ok": False}),
+                          (200, {}, {"ok": False, "error": "channel_not_found"})])
+        api_url = await stub.start()
+        async with SlackDispatcher(self.slack, "token", api_url, concurrency=1, backoff=0) as dispatcher:
+            first, = await dispatcher.dispatch([Notification("qa", "ci", "build failed")])
+            second, = await dispatcher.dispatch([Notification("qa", "ci", "build fixed")])
+        await stub.stop()
+        self.assertEqual((first.ok, first.error, first.attempts), (False, "channel_not_found", 3))
+        self.assertEqual((second.ok, second.error, second.attempts), (True, None, 1))
+
+    async def test_gives_up_after_max_retries(self):
+        stub = StubSlack([(500, {}, {})] * 3)
+        api_url = await stub.start()
+        async with SlackDispatcher(self.slack, "token", api_url, max_retries=2, backoff=0) as dispatcher:
+            delivery, = await dispatcher.dispatch([Notification("qa", "ci", "build failed")])
+        await stub.stop()
+        self.assertEqual((delivery.ok, delivery.error, delivery.attempts), (False, "HTTP 500", 3))
+
+    async def test_reconnects_when_keep_alive_connection_was_closed(self):
+        stub = StubSlack([(200, {"Connection": "close"}, {"ok": True})])
+        api_url = await stub.start()
+        async with SlackDispatcher(self.slack, "token", api_url, concurrency=1) as dispatcher:
+            await dispatcher.dispatch([Notification("qa", "ci", "one")])
+            delivery, = await dispatcher.dispatch([Notification("qa", "ci", "two")])
+        await stub.stop()
+        self.assertTrue(delivery.ok)
+        self.assertEqual(stub.connections, 2)
+
+    async def test_reconnects_when_the_server_closed_an_idle_connection(self):
+        stub = StubSlack(close_idle=True)
+        api_url = await stub.start()
+        async with SlackDispatcher(self.slack, "token", api_url, concurrency=1) as dispatcher:
+            await dispatcher.dispatch([Notification("qa", "ci", "one")])
+            await asyncio.sleep(0.05)  # the connection is idle when the server closes it
+            delivery, = await dispatcher.dispatch([Notification("qa", "ci", "two")])
+        await stub.stop()
+        self.assertEqual((delivery.ok, delivery.attempts), (True, 1))
+        self.assertEqual((stub.connections, len(stub.posts)), (2, 2))
+
+    async def test_requests_that_time_out_after_being_sent_are_not_retried(self):
+        stub = StubSlack(delay=0.2)
+        api_url = await stub.start()
+        async with SlackDispatcher(self.slack, "token", api_url, timeout=0.05, backoff=0) as dispatcher:
+            delivery, = await dispatcher.dispatch([Notification("qa", "ci", "slow")])
+        await asyncio.sleep(0.3)
+        await stub.stop()
+        self.assertEqual((delivery.ok, delivery.attempts), (False, 1))
+        self.assertIn("TimeoutError", delivery.error)
+        self.assertEqual(len(stub.posts), 1)
+
+    async def test_connection_failures_are_retried(self):
+        stub = StubSlack()
+        api_url = await stub.start()
+        await stub.stop()  # nothing listens on the port any more
+        async with SlackDispatcher(self.slack, "token", api_url, max_retries=1, backoff=0) as dispatcher:
+            delivery, = await dispatcher.dispatch([Notification("qa", "ci", "unreachable")])
+        self.assertEqual((delivery.ok, delivery.attempts), (False, 2))
+        self.assertIn("cannot connect", delivery.error)
+
+    async def test_invalid_retry_after_falls_back_to_the_backoff(self):
+        stub = StubSlack([(429, {"Retry-After": "soon"}, {"ok": False}),
+                          (429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, {"ok": False})])
+        api_url = await stub.start()
+        async with SlackDispatcher(self.slack, "token", api_url, backoff=0) as dispatcher:
+            delivery, = await dispatcher.dispatch([Notification("qa", "ci", "limited")])
+        await stub.stop()
+        self.assertEqual((delivery.ok, delivery.attempts), (True, 3))
+
+    def test_retry_delay(self):
+        self.assertEqual(retry_delay("2.5", 1.0), 2.5)
+        self.assertEqual(retry_delay(None, 1.0), 1.0)
+        self.assertEqual(retry_delay("soon", 1.0), 1.0)
+        self.assertEqual(retry_delay("inf", 1.0), 1.0)
+        self.assertEqual(retry_delay("Wed, 21 Oct 2015 07:28:00 GMT", 1.0), 0.0)
+        self.assertAlmostEqual(retry_delay(email.utils.formatdate(time.time() + 60, usegmt=True), 1.0), 60, delta=2)
+
+    def test_posts_to_the_workspace_of_the_config(self):
+        self.assertEqual(SlackDispatcher(self.slack, "token").api_url, f"{self.slack.url}/api")
+        self.assertEqual(SlackDispatcher(self.slack, "token", "http://localhost/api").api_url, "http://localhost/api")
+
+
+class TestDispatch(unittest.TestCase):
+    def test_synchronous_entry_point(self):
+        with open(os.path.join(FIXTURES, 'gitops.yaml'), 'rb') as file:
+            slack = GitOps.from_dict(load_yaml(file)).slack
+
+        async def run():
+            stub = StubSlack()
+            api_url = await stub.start()
+            try:
+                return await asyncio.to_thread(dispatch, slack, "token", [Notification("qa", "ci", "ok")],
+                                               api_url=api_url), stub.posts
+            finally:
+                await stub.stop()
+
+        deliveries, posts = asyncio.run(run())
+        self.assertEqual([delivery.ok for delivery in deliveries], [True])
+        self.assertEqual(posts[0][2], {"channel": deliveries[0].channel.channel_id, "text": "ok"})
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
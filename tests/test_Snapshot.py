@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+
+from benchmarks.Synthetic import make_fleet
+from cicd.GitOpsDataClasses import GitOps, SlackChannelPool, gitops_from_dict
+from cicd.Snapshot import FORMAT_VERSION, SNAPSHOT_HEADER, FleetBundle, SnapshotError, write_bundle
+from tests.Fixtures import TEST_DATA
+
+
+class TestSnapshot(TestCase):
+    def setUp(self):
+        self.gitops = GitOps.from_dict(TEST_DATA)
+
+    def test_round_trip(self):
+        snapshot = self.gitops.to_bytes()
+        loaded = GitOps.from_bytes(snapshot)
+        self.assertEqual(loaded, self.gitops)
+        self.assertEqual(loaded.to_dict(), self.gitops.to_dict())
+        self.assertIsInstance(loaded.environments["dev"].additional_aws_regions, list)
+        self.assertEqual(GitOps.from_bytes(memoryview(snapshot)), self.gitops)
+
+    def test_synthetic_fleet_round_trip(self):
+        for config in make_fleet(5, environments=6, regions=3, phases=4, path_groups=5, slack_channels=3):
+            gitops = gitops_from_dict(config)
+            self.assertEqual(GitOps.from_bytes(gitops.to_bytes()).to_dict(), config)
+
+    def test_is_smaller_than_json(self):
+        self.assertLess(len(self.gitops.to_bytes()), len(json.dumps(TEST_DATA, separators=(",", ":"))))
+
+    def test_interns_slack_channels(self):
+        pool = SlackChannelPool()
+        first = GitOps.from_bytes(self.gitops.to_bytes(), pool)
+        second = GitOps.from_bytes(self.gitops.to_bytes(), pool)
+        self.assertIs(first.slack.channels["dev"].cd[0], second.slack.channels["dev"].cd[0])
+
+    def test_rejects_foreign_and_incompatible_snapshots(self):
+        snapshot = bytearray(self.gitops.to_bytes())
+        with self.assertRaisesRegex(SnapshotError, "Truncated"):
+            GitOps.from_bytes(snapshot[:SNAPSHOT_HEADER.size + 10])
+        with self.assertRaisesRegex(SnapshotError, "Not a GitOps snapshot"):
+            GitOps.from_bytes(b"{}" + bytes(snapshot))
+        snapshot[4:6] = (FORMAT_VERSION + 1).to_bytes(2, "little")
+        with self.assertRaisesRegex(SnapshotError, "version"):
+            GitOps.from_bytes(snapshot)
+        snapshot[4:6] = FORMAT_VERSION.to_bytes(2, "little")
+        snapshot[8] ^= 0xFF
+        with self.assertRaisesRegex(SnapshotError, "model layout"):
+            GitOps.from_bytes(snapshot)
+
+
+class TestFleetBundle(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "fleet.bundle")
+        self.fleet = [gitops_from_dict(config) for config in make_fleet(20)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_random_access(self):
+        self.assertEqual(write_bundle(self.path, self.fleet), 20)
+        self.assertEqual(os.listdir(self.directory.name), ["fleet.bundle"])
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+        with FleetBundle(self.path) as bundle:
+            self.assertEqual(len(bundle), 20)
+            self.assertEqual(list(bundle), [gitops.service for gitops in self.fleet])
+            self.assertEqual(bundle[self.fleet[13].service], self.fleet[13])
+            self.assertEqual(bundle[self.fleet[0].service], self.fleet[0])
+            with self.assertRaises(KeyError):
+                bundle["missing"]
+
+    def test_rejects_duplicate_keys(self):
+        with self.assertRaisesRegex(ValueError, f"Duplicate bundle key '{self.fleet[3].service}'"):
+            write_bundle(self.path, [*self.fleet, self.fleet[3]])
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as file:
+            file.write(self.fleet[0].to_bytes())
+        with self.assertRaises(SnapshotError):
+            FleetBundle(self.path)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
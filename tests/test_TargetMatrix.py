@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import copy
+import json
+import unittest
+from unittest import TestCase
+
+from benchmarks.Synthetic import make_gitops_dict
+from cicd.GitOpsDataClasses import GitOps, Manifest
+from cicd.TargetMatrix import DeploymentTarget, TargetMatrix, fleet_matrix, matrix_json
+from cicd.Validation import validate
+from tests.Fixtures import TEST_DATA
+
+
+class TestTargetMatrix(TestCase):
+    def setUp(self):
+        self.gitops = GitOps.from_dict(TEST_DATA)
+
+    def test_expands_environments_by_region(self):
+        targets = [(target.environment, target.aws_region, target.primary) for target in self.gitops.target_matrix]
+        self.assertEqual(targets, [("dev", "us-west-1", True), ("dev", "us-west-2", False),
+                                   ("dev", "us-east-1", False), ("demo", "us-west-2", True),
+                                   ("demo", "eu-west-1", False), ("prod", "us-east-1", True)])
+        self.assertIs(self.gitops.target_matrix, self.gitops.target_matrix)
+
+    def test_filters_environments_and_duplicate_regions(self):
+        data = copy.deepcopy(TEST_DATA)
+        data["environments"]["prod"]["additional_aws_regions"] = ["us-east-1", "eu-west-1", "eu-west-1"]
+        data["environments"]["demo"]["enabled"] = False
+        gitops = GitOps.from_dict(data)
+        self.assertEqual([target.aws_region for target in TargetMatrix(gitops, ["prod", "qa"])],
+                         ["us-east-1", "eu-west-1"])
+        self.assertEqual(len(TargetMatrix(gitops, ["demo"])), 0)
+        self.assertEqual(len(TargetMatrix(gitops, ["demo"], enabled_only=False)), 2)
+
+    def test_manifests_are_built_once_per_target(self):
+        matrix = self.gitops.target_matrix
+        manifests = matrix.manifests()
+        self.assertEqual(len(manifests), len(matrix))
+        primary, secondary = matrix.targets[:2]
+        self.assertEqual(manifests[primary], Manifest.from_gitops(self.gitops, "dev"))
+        self.assertEqual(manifests[secondary].aws_region, "us-west-2")
+        self.assertEqual(manifests[secondary].cluster, manifests[primary].cluster)
+        self.assertIs(matrix.manifest(secondary), manifests[secondary])
+
+    def test_matrix_json(self):
+        matrix = self.gitops.target_matrix.to_matrix()
+        text = matrix_json(matrix)
+        self.assertNotIn(" ", text)
+        self.assertEqual(json.loads(text)["include"][0],
+                         {"service": TEST_DATA["service"], "environment": "dev", "aws_region": "us-west-1",
+                          "cluster": "dev-cluster", "primary": True})
+
+    def test_fleet_matrix(self):
+        configs = [GitOps.from_dict(make_gitops_dict(index, environments=4, regions=3)) for index in range(50)]
+        matrix = fleet_matrix(configs)
+        self.assertEqual(len(matrix["include"]), 50 * 4 * 3)
+        self.assertEqual(len({(entry["service"], entry["environment"], entry["aws_region"])
+                              for entry in matrix["include"]}), len(matrix["include"]))
+        self.assertEqual(len(fleet_matrix(configs, ["prod"])["include"]), 50 * 3)
+        self.assertEqual(DeploymentTarget(**matrix["include"][0]), configs[0].target_matrix.targets[0])
+
+    def test_additional_aws_regions_are_strings(self):
+        data = copy.deepcopy(TEST_DATA)
+        data["environments"]["dev"]["additional_aws_regions"] = ["us-west-2", 1]
+        with self.assertRaises(TypeError):
+            GitOps.from_dict(data)
+        self.assertEqual([str(violation) for violation in validate(data)],
+                         ["environments.dev.additional_aws_regions[1]: expected str but got int"])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
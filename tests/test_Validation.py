@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import copy
+import unittest
+from unittest import TestCase
+
+from cicd.GitOpsDataClasses import AwsAccount
+from cicd.Utils import from_bool
+from cicd.Validation import ValidationFailed, Violation, ensure_valid, validate
+from tests.Fixtures import TEST_DATA
+
+
+class TestValidation(TestCase):
+    def setUp(self):
+        self.data = copy.deepcopy(TEST_DATA)
+
+    def test_valid_config(self):
+        self.assertEqual(validate(self.data), [])
+        self.assertIs(ensure_valid(self.data), self.data)
+
+    def test_reports_every_violation_with_path(self):
+        self.data["environments"]["prod"]["with_gate"] = "yes"
+        self.data["environment_promotion_phases"]["01-dev"]["aws_account_id"] = True
+        del self.data["slack"]["channels"]["dev"]["cd"][0]["id"]
+        self.data["path_monitor"]["application"]["paths"].append(3)
+        del self.data["path_monitor"]["helm_charts"]["hasModifications"]  # optional, defaults to False
+        self.assertEqual(validate(self.data), [
+            Violation("environment_promotion_phases.01-dev.aws_account_id", "expected int but got bool"),
+            Violation("environments.prod.with_gate", "expected bool but got str"),
+            Violation("path_monitor.application.paths[1]", "expected str but got int"),
+            Violation("slack.channels.dev.cd[0].id", "missing required key"),
+        ])
+
+    def test_fail_fast(self):
+        self.data["name"] = None
+        self.data["service"] = None
+        violations = validate(self.data, fail_fast=True)
+        self.assertEqual([str(violation) for violation in violations], ["name: expected str but got NoneType"])
+        with self.assertRaisesRegex(ValidationFailed, "name: expected str"):
+            ensure_valid(self.data)
+
+    def test_other_models_and_root(self):
+        self.assertEqual([str(violation) for violation in validate([], AwsAccount)],
+                         ["<root>: expected mapping but got list"])
+
+    def test_utils_raise_type_error(self):
+        with self.assertRaisesRegex(TypeError, "Expected bool but got int"):
+            from_bool(1)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()  # pragma: no cover